@@ -7,7 +7,10 @@ from airport_service.models import (
     AirplaneType,
     Airplane,
     Flight,
+    FlightCrew,
+    FlightSchedule,
     Order,
+    SeatHold,
     Ticket,
 )
 
@@ -17,6 +20,28 @@ class TicketInLine(admin.TabularInline):
     extra = 1
 
 
+class FlightCrewInLine(admin.TabularInline):
+    model = FlightCrew
+    extra = 1
+
+
+@admin.register(Flight)
+class FlightAdmin(admin.ModelAdmin):
+    inlines = (FlightCrewInLine,)
+
+
+@admin.register(FlightSchedule)
+class FlightScheduleAdmin(admin.ModelAdmin):
+    list_display = (
+        "route",
+        "airplane",
+        "days_of_week",
+        "departure",
+        "valid_from",
+        "valid_until",
+    )
+
+
 @admin.register(Order)
 class Order(admin.ModelAdmin):
     inlines = (TicketInLine,)
@@ -27,5 +52,5 @@ admin.site.register(Airport)
 admin.site.register(Route)
 admin.site.register(AirplaneType)
 admin.site.register(Airplane)
-admin.site.register(Flight)
 admin.site.register(Ticket)
+admin.site.register(SeatHold)
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from django.db.models import Count, F, Sum
+
+from airport_service.models import Flight
+
+
+def month_days(month: date) -> list[date]:
+    """Days of the month of the given date"""
+    first = month.replace(day=1)
+    following = (first + timedelta(days=31)).replace(day=1)
+    return [
+        first + timedelta(days=offset)
+        for offset in range((following - first).days)
+    ]
+
+
+def route_calendar(route_id: int, month: date) -> list[dict]:
+    """
+    Flights and seats available per local day of the month on the route.
+
+    One grouped query over the stored local dates and seats_sold counters,
+    days without flights are listed with zeros.
+    """
+    days = month_days(month)
+    found = {
+        row["departure_local_date"]: row
+        for row in Flight.objects.filter(
+            route_id=route_id,
+            departure_local_date__gte=days[0],
+            departure_local_date__lte=days[-1],
+        )
+        .order_by()
+        .values("departure_local_date")
+        .annotate(
+            flights=Count("id"),
+            seats_available=Sum(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - F("seats_sold")
+            ),
+        )
+    }
+    return [
+        {
+            "date": day,
+            "flights": found[day]["flights"] if day in found else 0,
+            "seats_available": (
+                found[day]["seats_available"] if day in found else 0
+            ),
+        }
+        for day in days
+    ]
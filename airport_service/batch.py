@@ -0,0 +1,210 @@
+from collections.abc import Mapping
+
+from django.db import transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from airport_service import caching, reference
+from airport_service.serializers import BulkListSerializer
+
+IDS_PARAMETER = OpenApiParameter(
+    "ids",
+    type=OpenApiTypes.STR,
+    description=(
+        "Comma separated ids to retrieve in one request (ex. ?ids=3,1,2). "
+        "Returns the detail representations in request order as `results` "
+        "and the ids not found as `missing`, without pagination."
+    ),
+)
+
+
+# `?ids=` on the list action answers like `retrieve` for every id with a
+# fixed number of queries. The view acts as "retrieve" meanwhile, so its
+# get_queryset, serializer and permissions are the detail ones.
+class BatchRetrieveMixin:
+    batch_query_param = "ids"
+    max_batch_size = 100
+    batch = False
+
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+        self.batch = (
+            self.action == "list"
+            and self.batch_query_param in request.query_params
+        )
+        if self.batch:
+            self.action = "retrieve"
+        return request
+
+    def batch_ids(self) -> list[int]:
+        value = self.request.query_params[self.batch_query_param]
+        try:
+            ids = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError:
+            raise ValidationError(
+                {
+                    self.batch_query_param: (
+                        "Expected a comma separated list of integers."
+                    )
+                }
+            )
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise ValidationError(
+                {self.batch_query_param: "At least one id is required."}
+            )
+        if len(ids) > self.max_batch_size:
+            raise ValidationError(
+                {
+                    self.batch_query_param: (
+                        f"At most {self.max_batch_size} ids per request."
+                    )
+                }
+            )
+        return ids
+
+    def batch_retrieve(self, request):
+        ids = self.batch_ids()
+        found = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        serializer = self.get_serializer(
+            [found[pk] for pk in ids if pk in found], many=True
+        )
+        return Response(
+            {
+                "results": serializer.data,
+                "missing": [pk for pk in ids if pk not in found],
+            }
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.batch:
+            return self.batch_retrieve(request)
+        return super().list(request, *args, **kwargs)
+
+
+# `bulk/` takes a list payload: POST creates the objects, PATCH updates the
+# ones given by their "id" and DELETE removes a list of ids. A batch is
+# validated as a whole and written in one transaction with bulk_create or
+# bulk_update. Those don't send model signals, bulk_saved() does their job.
+class BulkWriteMixin:
+    max_bulk_size = 1000
+
+    def bulk_serializer(self, *args, **kwargs) -> BulkListSerializer:
+        kwargs.setdefault("context", self.get_serializer_context())
+        return BulkListSerializer(
+            *args,
+            child=self.get_serializer_class()(),
+            allow_empty=False,
+            max_length=self.max_bulk_size,
+            **kwargs,
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "bulk":
+            return self.bulk_serializer(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def bulk_instances(self, data) -> list:
+        if not isinstance(data, list):
+            return []
+        ids = [
+            item.get("id") if isinstance(item, Mapping) else None
+            for item in data
+        ]
+        found = self.get_queryset().in_bulk(
+            [pk for pk in ids if type(pk) is int]
+        )
+        errors = []
+        seen = set()
+        for pk in ids:
+            if pk not in found:
+                errors.append({"id": [f'Invalid pk "{pk}" - not found.']})
+            elif pk in seen:
+                errors.append({"id": ["Duplicate id."]})
+            else:
+                errors.append({})
+            seen.add(pk)
+        if any(errors):
+            raise ValidationError(errors)
+        return [found[pk] for pk in ids]
+
+    def bulk_changed(self, instances: list, *fields: str) -> list:
+        """Updated instances whose `fields` differ from before the batch"""
+        previous = getattr(self, "bulk_previous", {})
+        attnames = [
+            self.queryset.model._meta.get_field(field).attname
+            for field in fields
+        ]
+        return [
+            instance
+            for instance in instances
+            if any(
+                previous.get(instance.pk, {}).get(attname)
+                != getattr(instance, attname)
+                for attname in attnames
+            )
+        ]
+
+    def bulk_saved(self, instances: list, created: bool) -> None:
+        caching.bump_generation()
+        if self.queryset.model in reference.MODELS:
+            caching.bump_references()
+
+    @action(
+        methods=["POST", "PATCH", "DELETE"],
+        detail=False,
+        pagination_class=None,
+    )
+    def bulk(self, request):
+        """
+        Create (POST) or update (PATCH, with ids) a list of objects,
+        or delete (DELETE) a list of ids, all or nothing
+        """
+        if request.method == "DELETE":
+            return self.bulk_delete(request)
+
+        created = request.method == "POST"
+        if created:
+            serializer = self.get_serializer(data=request.data)
+        else:
+            instances = self.bulk_instances(request.data)
+            self.bulk_previous = {
+                instance.pk: {
+                    field.attname: getattr(instance, field.attname)
+                    for field in instance._meta.concrete_fields
+                }
+                for instance in instances
+            }
+            serializer = self.get_serializer(
+                instances, data=request.data, partial=True
+            )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            instances = serializer.save()
+            self.bulk_saved(instances, created)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def bulk_delete(self, request):
+        ids = serializers.ListField(
+            child=serializers.IntegerField(),
+            allow_empty=False,
+            max_length=self.max_bulk_size,
+        ).run_validation(request.data)
+        ids = list(dict.fromkeys(ids))
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=ids)
+            found = set(queryset.values_list("pk", flat=True))
+            queryset.delete()
+        return Response(
+            {
+                "deleted": [pk for pk in ids if pk in found],
+                "missing": [pk for pk in ids if pk not in found],
+            }
+        )
@@ -0,0 +1,219 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from airport_service.models import DataVersion
+from airport_service.search import normalize
+
+GENERATION_KEY = "airport_service:flights:generation"
+REFERENCE_VERSION = "reference"
+
+# Data versions read by this thread during the current request, if any.
+_versions = threading.local()
+
+
+def flight_version_key(flight_id: int) -> str:
+    return f"airport_service:flight:{flight_id}:version"
+
+
+def _new_token() -> str:
+    return uuid.uuid4().hex
+
+
+def _version_timeout() -> int | None:
+    # Version tokens outlive the entries stamped with them, and expire
+    # afterwards so tokens of every flight sold don't fill the cache.
+    timeout = max(
+        getattr(settings, "FLIGHT_SEARCH_CACHE_TIMEOUT", 30),
+        getattr(settings, "ROUTE_CALENDAR_CACHE_TIMEOUT", 300),
+    )
+    return timeout or None
+
+
+def _twice(func) -> None:
+    # Invalidate right away for this process and once more after commit,
+    # so a concurrent reader can't re-cache rows this transaction replaces.
+    func()
+    transaction.on_commit(func)
+
+
+def bump_generation() -> None:
+    _twice(lambda: cache.set(GENERATION_KEY, _new_token(), timeout=None))
+
+
+def bump_references() -> None:
+    # In the database, so every worker process sees it, and committed
+    # along with the write, so no process sees it before the data. A new
+    # token rather than a counter, which a rollback would hand out twice.
+    DataVersion.objects.update_or_create(
+        name=REFERENCE_VERSION, defaults={"token": _new_token()}
+    )
+    _versions.__dict__.pop(REFERENCE_VERSION, None)
+
+
+def reference_version() -> str:
+    """
+    The reference data version, read once per request and thread, or on
+    every call outside requests.
+    """
+    version = getattr(_versions, REFERENCE_VERSION, None)
+    if version is None:
+        version = (
+            DataVersion.objects.filter(name=REFERENCE_VERSION)
+            .values_list("token", flat=True)
+            .first()
+            or ""
+        )
+        if getattr(_versions, "in_request", False):
+            setattr(_versions, REFERENCE_VERSION, version)
+    return version
+
+
+def start_request() -> None:
+    _versions.__dict__.clear()
+    _versions.in_request = True
+
+
+def finish_request() -> None:
+    _versions.__dict__.clear()
+
+
+def route_version_key(route_id: int) -> str:
+    return f"airport_service:route:{route_id}:version"
+
+
+def _bump_versions(keys) -> None:
+    keys = list(keys)
+    _twice(
+        lambda: cache.set_many(
+            {key: _new_token() for key in keys},
+            timeout=_version_timeout(),
+        )
+    )
+
+
+def bump_flights(flight_ids) -> None:
+    _bump_versions(flight_version_key(flight_id) for flight_id in flight_ids)
+
+
+def bump_routes(route_ids) -> None:
+    _bump_versions(route_version_key(route_id) for route_id in route_ids)
+
+
+class FlightListCache:
+    """
+    Cache of flight list responses keyed on the normalized query.
+
+    An entry is dropped when any flight/route/reference data changes (the
+    global generation) or when tickets of one of the listed flights are
+    sold or released (per-flight version tokens). The timeout bounds how
+    stale availability numbers can get when writes bypass the signals.
+    """
+
+    normalized_params = {
+        "source": normalize,
+        "destination": normalize,
+    }
+
+    @property
+    def timeout(self) -> int:
+        return getattr(settings, "FLIGHT_SEARCH_CACHE_TIMEOUT", 30)
+
+    def key(self, request, generation: str) -> str:
+        params = []
+        for name in sorted(request.query_params):
+            normalizer = self.normalized_params.get(name, str.strip)
+            values = request.query_params.getlist(name)
+            params.append((name, [normalizer(value) for value in values]))
+        digest = hashlib.sha256(
+            repr((request.get_host(), request.path, params)).encode()
+        ).hexdigest()
+        return f"airport_service:flight-list:{generation}:{digest}"
+
+    def lookup(self, request) -> tuple[str | None, dict | None]:
+        """Return the cache key of the request and the cached data, if any"""
+        if not self.timeout:
+            return None, None
+        generation = cache.get_or_set(
+            GENERATION_KEY, _new_token, timeout=None
+        )
+        key = self.key(request, generation)
+        entry = cache.get(key)
+        if entry is None:
+            return key, None
+        versions = cache.get_many(
+            [flight_version_key(flight_id) for flight_id in entry["versions"]]
+        )
+        for flight_id, version in entry["versions"].items():
+            if versions.get(flight_version_key(flight_id)) != version:
+                return key, None
+        return key, entry["data"]
+
+    def store(self, key: str | None, data, flight_ids) -> None:
+        if key is None:
+            return
+        flight_ids = list(flight_ids)
+        versions = cache.get_many(
+            [flight_version_key(flight_id) for flight_id in flight_ids]
+        )
+        cache.set(
+            key,
+            {
+                "data": data,
+                "versions": {
+                    flight_id: versions.get(flight_version_key(flight_id))
+                    for flight_id in flight_ids
+                },
+            },
+            timeout=self.timeout,
+        )
+
+
+flight_list_cache = FlightListCache()
+
+
+class RouteCalendarCache:
+    """
+    Cache of route calendars keyed on the route, month and versions.
+
+    The key doubles as the ETag of the response. It changes with the
+    global generation or when tickets of the route are sold or released,
+    so clients revalidate cheaply and other routes' sales don't touch it.
+    """
+
+    @property
+    def timeout(self) -> int:
+        return getattr(settings, "ROUTE_CALENDAR_CACHE_TIMEOUT", 300)
+
+    def etag(self, route_id: int, month: str) -> str:
+        generation = cache.get_or_set(
+            GENERATION_KEY, _new_token, timeout=None
+        )
+        version = cache.get_or_set(
+            route_version_key(route_id),
+            _new_token,
+            timeout=_version_timeout(),
+        )
+        return hashlib.sha256(
+            repr((route_id, month, generation, version)).encode()
+        ).hexdigest()[:32]
+
+    @staticmethod
+    def key(etag: str) -> str:
+        return f"airport_service:route-calendar:{etag}"
+
+    def get(self, etag: str):
+        if not self.timeout:
+            return None
+        return cache.get(self.key(etag))
+
+    def store(self, etag: str, data) -> None:
+        if self.timeout:
+            cache.set(self.key(etag), data, timeout=self.timeout)
+
+
+route_calendar_cache = RouteCalendarCache()
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+from functools import reduce
+import operator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from airport_service.models import SeatHold
+
+
+class SeatConflict(Exception):
+    def __init__(self, seats) -> None:
+        self.seats = sorted(seats)
+        super().__init__(f"Seats are not available: {self.seats}")
+
+
+class BaseHoldStore:
+    """
+    Time-limited seat reservations of a user on a flight.
+
+    Seats are (row, seat) tuples. `hold` must fail with SeatConflict
+    without taking anything when one of the seats is held by someone else.
+    """
+
+    def hold(self, flight_id: int, user_id: int, seats, minutes: int):
+        raise NotImplementedError
+
+    def holders(self, flight_id: int, seats) -> dict[tuple[int, int], int]:
+        """Map of actively held seats to the id of the holding user"""
+        raise NotImplementedError
+
+    def held(self, flight_id: int, user_id: int) -> set[tuple[int, int]]:
+        """Seats the user actively holds on the flight"""
+        raise NotImplementedError
+
+    def release(self, flight_id: int, user_id: int, seats=None) -> None:
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """Drop expired holds in bulk, return how many were dropped"""
+        return 0
+
+
+def _seats_q(seats) -> Q:
+    return reduce(
+        operator.or_, (Q(row=row, seat=seat) for row, seat in seats)
+    )
+
+
+class DatabaseHoldStore(BaseHoldStore):
+    """Holds in the SeatHold table, guarded by its unique constraint"""
+
+    def hold(self, flight_id, user_id, seats, minutes) -> datetime:
+        seats = list(seats)
+        now = timezone.now()
+        expires_at = now + timedelta(minutes=minutes)
+        holds = SeatHold.objects.filter(flight_id=flight_id).filter(
+            _seats_q(seats)
+        )
+        try:
+            with transaction.atomic():
+                # Expired holds and the user's own ones are simply replaced.
+                holds.filter(
+                    Q(expires_at__lte=now) | Q(user_id=user_id)
+                ).delete()
+                SeatHold.objects.bulk_create(
+                    [
+                        SeatHold(
+                            flight_id=flight_id,
+                            user_id=user_id,
+                            row=row,
+                            seat=seat,
+                            expires_at=expires_at,
+                        )
+                        for row, seat in seats
+                    ]
+                )
+        except IntegrityError:
+            raise SeatConflict(self.holders(flight_id, seats))
+        return expires_at
+
+    def holders(self, flight_id, seats) -> dict[tuple[int, int], int]:
+        seats = list(seats)
+        if not seats:
+            return {}
+        return {
+            (row, seat): user_id
+            for row, seat, user_id in SeatHold.objects.filter(
+                _seats_q(seats),
+                flight_id=flight_id,
+                expires_at__gt=timezone.now(),
+            ).values_list("row", "seat", "user_id")
+        }
+
+    def held(self, flight_id, user_id) -> set[tuple[int, int]]:
+        return set(
+            SeatHold.objects.filter(
+                flight_id=flight_id,
+                user_id=user_id,
+                expires_at__gt=timezone.now(),
+            ).values_list("row", "seat")
+        )
+
+    def release(self, flight_id, user_id, seats=None) -> None:
+        holds = SeatHold.objects.filter(flight_id=flight_id, user_id=user_id)
+        seats = list(seats) if seats is not None else None
+        if seats is not None:
+            if not seats:
+                return
+            holds = holds.filter(_seats_q(seats))
+        holds.delete()
+
+    def sweep(self) -> int:
+        deleted, _ = SeatHold.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        return deleted
+
+
+class CacheHoldStore(BaseHoldStore):
+    """Holds as expiring cache keys, taken atomically with cache.add()"""
+
+    def key(self, flight_id: int, row: int, seat: int) -> str:
+        return f"airport_service:hold:{flight_id}:{row}:{seat}"
+
+    def user_key(self, flight_id: int, user_id: int) -> str:
+        return f"airport_service:holds:{flight_id}:{user_id}"
+
+    def hold(self, flight_id, user_id, seats, minutes) -> datetime:
+        seats = list(seats)
+        timeout = minutes * 60
+        taken = []
+        conflicts = []
+        for row, seat in seats:
+            key = self.key(flight_id, row, seat)
+            if cache.add(key, user_id, timeout=timeout):
+                taken.append(key)
+            elif cache.get(key) == user_id:
+                cache.set(key, user_id, timeout=timeout)
+            else:
+                conflicts.append((row, seat))
+        if conflicts:
+            cache.delete_many(taken)
+            raise SeatConflict(conflicts)
+
+        user_key = self.user_key(flight_id, user_id)
+        held = set(cache.get(user_key, ())) | set(seats)
+        cache.set(user_key, held, timeout=timeout)
+        return timezone.now() + timedelta(minutes=minutes)
+
+    def holders(self, flight_id, seats) -> dict[tuple[int, int], int]:
+        keys = {
+            self.key(flight_id, row, seat): (row, seat) for row, seat in seats
+        }
+        return {
+            keys[key]: user_id
+            for key, user_id in cache.get_many(list(keys)).items()
+        }
+
+    def held(self, flight_id, user_id) -> set[tuple[int, int]]:
+        seats = cache.get(self.user_key(flight_id, user_id), ())
+        return {
+            seat
+            for seat, holder in self.holders(flight_id, seats).items()
+            if holder == user_id
+        }
+
+    def release(self, flight_id, user_id, seats=None) -> None:
+        user_key = self.user_key(flight_id, user_id)
+        held = set(cache.get(user_key, ()))
+        seats = held if seats is None else set(seats)
+        cache.delete_many(
+            [
+                self.key(flight_id, row, seat)
+                for (row, seat), holder in self.holders(
+                    flight_id, seats
+                ).items()
+                if holder == user_id
+            ]
+        )
+        if held - seats:
+            cache.set(user_key, held - seats, timeout=hold_minutes() * 60)
+        else:
+            cache.delete(user_key)
+
+
+def get_store() -> BaseHoldStore:
+    return import_string(
+        getattr(
+            settings,
+            "SEAT_HOLD_STORE",
+            "airport_service.holds.DatabaseHoldStore",
+        )
+    )()
+
+
+def hold_minutes() -> int:
+    return getattr(settings, "SEAT_HOLD_MINUTES", 10)
+
+
+def max_seats() -> int:
+    return getattr(settings, "SEAT_HOLD_MAX_SEATS", 10)
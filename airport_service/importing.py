@@ -0,0 +1,512 @@
+import csv
+import json
+import math
+import time
+from collections import Counter
+from datetime import datetime
+from itertools import groupby, islice
+from typing import Iterable, Iterator, NamedTuple
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from airport_service import (
+    caching,
+    local_dates,
+    reference,
+    reporting,
+    roster,
+    search,
+)
+from airport_service.itineraries import flight_index
+from airport_service.models import Crew, FlightCrew, validate_timezone
+from airport_service.serializers import (
+    AirplaneSerializer,
+    AirplaneTypeSerializer,
+    AirportSerializer,
+    BulkListSerializer,
+    CrewSerializer,
+    FlightSerializer,
+    RouteSerializer,
+    crew_conflict_message,
+    prefetch_related_fields,
+)
+
+CHUNK_SIZE = 2000
+READ_SIZE = 1 << 16
+# Skipped between the objects of a JSON array or of JSON lines.
+SEPARATORS = frozenset("[], \t\r\n")
+
+AIRPORT = "airport_service.airport"
+ROUTE = "airport_service.route"
+FLIGHT = "airport_service.flight"
+
+# Models that can be imported, in the order they depend on each other.
+SERIALIZERS = {
+    "airport_service.crew": CrewSerializer,
+    AIRPORT: AirportSerializer,
+    "airport_service.airplanetype": AirplaneTypeSerializer,
+    "airport_service.airplane": AirplaneSerializer,
+    ROUTE: RouteSerializer,
+    FLIGHT: FlightSerializer,
+}
+
+# Fields identifying rows without their pk. Rows whose key is already
+# taken are skipped, so re-running a load doesn't insert them twice, and
+# relations may be given by key instead of pk.
+NATURAL_KEYS = {
+    AIRPORT: ("name",),
+    "airport_service.airplanetype": ("airplane_type",),
+    "airport_service.airplane": ("airplane_name",),
+    ROUTE: ("source", "destination"),
+    FLIGHT: ("route", "airplane", "departure_time"),
+}
+
+EARTH_RADIUS_KM = 6371
+
+
+def key_value(field, value):
+    """`value` of a natural key field as the database returns it"""
+    try:
+        value = field.to_python(value)
+    except ValidationError:
+        # Left for the serializers to report.
+        return value
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+class Row(NamedTuple):
+    label: str
+    pk: int | None
+    fields: dict
+
+
+class InvalidRows(Exception):
+    def __init__(self, errors: list[tuple[int, dict]]) -> None:
+        super().__init__(f"{len(errors)} invalid row(s).")
+        self.errors = errors
+
+
+def model_label(name: str) -> str:
+    label = name.lower()
+    if "." not in label:
+        label = f"airport_service.{label}"
+    if label not in SERIALIZERS:
+        raise ValueError(
+            f"Unknown model {name!r}, expected one of: "
+            f"{', '.join(label.split('.')[1] for label in SERIALIZERS)}."
+        )
+    return label
+
+
+def read_json(
+    file, label: str | None = None, read_size: int = READ_SIZE
+) -> Iterator[Row]:
+    """
+    Rows of a JSON array or of JSON lines, read a block at a time.
+
+    Objects are either fixture entries ({"model", "pk", "fields"}, as
+    written by dumpdata) or plain field values of `label` rows, with an
+    optional "id".
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    at_end = False
+    while not at_end:
+        block = file.read(read_size)
+        at_end = not block
+        buffer += block
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in SEPARATORS:
+                position += 1
+            if position == len(buffer):
+                break
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                if at_end:
+                    raise ValueError(f"Invalid JSON: {error}")
+                # The object continues in the next block.
+                break
+            if "model" in item and "fields" in item:
+                yield Row(
+                    item["model"].lower(), item.get("pk"), item["fields"]
+                )
+            else:
+                yield Row(label, item.pop("id", None), item)
+        buffer = buffer[position:]
+
+
+def read_csv(file, label: str) -> Iterator[Row]:
+    """Rows of a CSV file with a header of field names, empty cells unset"""
+    for line in csv.DictReader(file):
+        fields = {name: value for name, value in line.items() if value != ""}
+        yield Row(label, fields.pop("id", None), fields)
+
+
+def great_circle_km(lat1, lon1, lat2, lon2) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    haversine = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(haversine))
+
+
+def openflights_airport_name(name: str, code: str | None) -> str:
+    # Airport names repeat (ex. "Municipal Airport"), their codes don't.
+    max_length = apps.get_model(AIRPORT)._meta.get_field("name").max_length
+    if not code:
+        return name[:max_length]
+    return f"{name[:max_length - len(code) - 3]} ({code})"
+
+
+def openflights_timezone(value: str | None) -> str:
+    # Blank, the server's zone, for the few unknown to this system.
+    try:
+        validate_timezone(value or "")
+    except ValidationError:
+        return ""
+    return value or ""
+
+
+def read_openflights(file, airports: dict) -> Iterator[Row]:
+    """
+    Rows of OpenFlights airports.dat or routes.dat files.
+
+    Airports are kept in `airports` by OpenFlights id and codes, routes
+    take their distance from those coordinates, so the airports file has
+    to be read first. Routes of unknown airports are left out.
+    """
+    max_length = apps.get_model(AIRPORT)._meta.get_field(
+        "closest_big_city"
+    ).max_length
+    for fields in csv.reader(file):
+        fields = [None if value == "\\N" else value for value in fields]
+        if len(fields) >= 12:
+            openflights_id, name, city, _, iata, icao, lat, lon = fields[:8]
+            airport = (
+                openflights_airport_name(name, iata or icao),
+                float(lat),
+                float(lon),
+            )
+            city = (city or name)[:max_length]
+            for key in (openflights_id, iata, icao):
+                if key:
+                    airports[key] = airport
+            yield Row(
+                AIRPORT,
+                None,
+                {
+                    "name": airport[0],
+                    "closest_big_city": city,
+                    "timezone": openflights_timezone(fields[11]),
+                },
+            )
+        elif len(fields) == 9:
+            source = airports.get(fields[3]) or airports.get(fields[2])
+            destination = airports.get(fields[5]) or airports.get(fields[4])
+            if source is None or destination is None:
+                continue
+            yield Row(
+                ROUTE,
+                None,
+                {
+                    "source": source[0],
+                    "destination": destination[0],
+                    "distance": max(
+                        1,
+                        round(
+                            great_circle_km(*source[1:], *destination[1:])
+                        ),
+                    ),
+                },
+            )
+
+
+class Importer:
+    """
+    Validates and inserts rows a chunk of one model at a time.
+
+    A chunk is validated with the batch serializers (a fixed number of
+    queries), written with bulk_create and committed on its own, so an
+    interrupted load can go on after the last committed row. Natural keys
+    are loaded once per model and kept up to date in memory.
+
+    Bulk inserts skip the signals, call `finish` once the load is done.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, log=None) -> None:
+        self.chunk_size = chunk_size
+        self.log = log or (lambda message: None)
+        self.keys = {}
+        self.rows = 0
+        self.created = Counter()
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.rows / max(time.monotonic() - self.started, 1e-6)
+
+    def natural_keys(self, label: str) -> dict:
+        if label not in self.keys:
+            model = apps.get_model(label)
+            columns = [
+                model._meta.get_field(name).attname
+                for name in NATURAL_KEYS[label]
+            ]
+            self.keys[label] = {
+                tuple(row[1:]): row[0]
+                for row in model.objects.order_by().values_list(
+                    "pk", *columns
+                )
+            }
+        return self.keys[label]
+
+    def resolve(self, label: str, value):
+        """The pk of a related object, given by pk or natural key"""
+        if isinstance(value, int) or (
+            isinstance(value, str) and value.isdigit()
+        ):
+            return int(value)
+        if label not in NATURAL_KEYS:
+            raise LookupError(f"Expected a pk, got {value!r}.")
+        names = NATURAL_KEYS[label]
+        if isinstance(value, str):
+            parts = value.split("|") if len(names) > 1 else [value]
+        else:
+            parts = list(value)
+        if len(parts) != len(names):
+            raise LookupError(
+                f"Expected {len(names)} key values, got {value!r}."
+            )
+        model = apps.get_model(label)
+        key = []
+        for name, part in zip(names, parts):
+            field = model._meta.get_field(name)
+            if field.is_relation:
+                part = self.resolve(
+                    field.related_model._meta.label_lower, part
+                )
+            key.append(key_value(field, part))
+        try:
+            return self.natural_keys(label)[tuple(key)]
+        except KeyError:
+            raise LookupError(
+                f"Unknown {model._meta.verbose_name} {value!r}."
+            )
+
+    def run(self, rows: Iterable[Row], skip: int = 0, on_chunk=None) -> int:
+        """
+        Import the rows after the first `skip` ones (of a resumed load),
+        calling `on_chunk` with the number of rows done after each commit.
+        """
+        done = skip
+        for label, group in groupby(
+            islice(rows, skip, None), key=lambda row: row.label
+        ):
+            while chunk := list(islice(group, self.chunk_size)):
+                self.import_chunk(label, chunk, first=done + 1)
+                done += len(chunk)
+                if on_chunk is not None:
+                    on_chunk(done)
+        return done
+
+    def finish(self) -> int:
+        """
+        Bring the seat maps, seats sold and rollups up to date with the
+        imported flights, returns the number of rows caught up with.
+
+        The flight index is refreshed on every committed chunk already.
+        """
+        if not self.created[FLIGHT]:
+            return 0
+        return reporting.catch_up()
+
+    @staticmethod
+    def crew_conflicts(validated: list, kept: list) -> list[tuple[int, dict]]:
+        """
+        Crew double-bookings and missing rest of the imported flights,
+        against stored assignments and the other rows of the chunk.
+        """
+        # New flights have no id yet, rows stand for them as -number.
+        duties = [
+            roster.Duty(
+                crew_id,
+                -number,
+                attrs["departure_time"],
+                attrs["arrival_time"],
+            )
+            for attrs, (number, _, crew) in zip(validated, kept)
+            for crew_id in dict.fromkeys(crew)
+        ]
+        errors = []
+        for duty, flight_ids in zip(duties, roster.batch_conflicts(duties)):
+            if not flight_ids:
+                continue
+            messages = []
+            stored = [pk for pk in flight_ids if pk > 0]
+            if stored:
+                messages.append(crew_conflict_message(duty.crew_id, stored))
+            numbers = [-pk for pk in flight_ids if pk < 0]
+            if numbers:
+                messages.append(
+                    f"Crew member {duty.crew_id} is on the rows "
+                    f"{', '.join(map(str, numbers))} at that time or "
+                    "without the minimum rest."
+                )
+            errors.append((-duty.flight_id, {"crew": messages}))
+        return errors
+
+    def import_chunk(self, label: str, rows: list[Row], first: int) -> None:
+        self.rows += len(rows)
+        if label not in SERIALIZERS:
+            self.skipped += len(rows)
+            self.log(f"{label}: {len(rows)} row(s) skipped, not importable")
+            return
+        model = apps.get_model(label)
+        relations = {
+            field.name: field.related_model._meta.label_lower
+            for field in model._meta.fields
+            if field.many_to_one
+        }
+        given_pks = [int(row.pk) for row in rows if row.pk is not None]
+        taken_pks = set()
+        if given_pks:
+            taken_pks.update(
+                model.objects.filter(pk__in=given_pks).values_list(
+                    "pk", flat=True
+                )
+            )
+        keys = self.natural_keys(label) if label in NATURAL_KEYS else None
+
+        data = []
+        kept = []
+        errors = []
+        seen = set()
+        skipped = 0
+        for number, row in enumerate(rows, first):
+            if row.pk is not None and int(row.pk) in taken_pks:
+                skipped += 1
+                continue
+            fields = dict(row.fields)
+            crew = fields.pop("crew", None) if label == FLIGHT else None
+            if isinstance(crew, str):
+                crew = crew.split(",")
+            try:
+                for name, value in fields.items():
+                    if name in relations and value is not None:
+                        fields[name] = self.resolve(relations[name], value)
+                name = "crew"
+                crew = [
+                    self.resolve(Crew._meta.label_lower, pk)
+                    for pk in crew or ()
+                ]
+            except LookupError as error:
+                errors.append((number, {name: [str(error)]}))
+                continue
+            if keys is not None:
+                key = tuple(
+                    key_value(model._meta.get_field(name), fields.get(name))
+                    for name in NATURAL_KEYS[label]
+                )
+                if key in keys or key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+            data.append(fields)
+            kept.append((number, row.pk, crew))
+
+        crew_ids = {pk for _, _, crew in kept for pk in crew}
+        if crew_ids:
+            crew_ids = set(
+                Crew.objects.filter(pk__in=crew_ids).values_list(
+                    "pk", flat=True
+                )
+            )
+            for number, _, crew in kept:
+                missing = [pk for pk in crew if pk not in crew_ids]
+                if missing:
+                    errors.append(
+                        (number, {"crew": [f"Unknown crew: {missing}."]})
+                    )
+
+        validated = []
+        if data:
+            if label == FLIGHT:
+                serializer = FlightSerializer(data=data, many=True)
+                prefetch_related_fields(serializer.child, data)
+            else:
+                serializer = BulkListSerializer(
+                    child=SERIALIZERS[label](), data=data
+                )
+            if not serializer.is_valid():
+                errors += [
+                    (number, item)
+                    for (number, _, _), item in zip(kept, serializer.errors)
+                    if item
+                ]
+            else:
+                validated = serializer.validated_data
+        if label == FLIGHT:
+            errors += self.crew_conflicts(validated, kept)
+        if errors:
+            raise InvalidRows(sorted(errors, key=lambda error: error[0]))
+
+        objects = []
+        for attrs, (_, pk, _) in zip(validated, kept):
+            instance = model(**attrs)
+            if pk is not None:
+                instance.pk = int(pk)
+            if label in search.SEARCH_FIELDS:
+                search.update_search_fields(instance)
+            objects.append(instance)
+        if label == FLIGHT:
+            local_dates.fill(objects)
+        with transaction.atomic():
+            model.objects.bulk_create(objects)
+            if label == FLIGHT:
+                FlightCrew.objects.bulk_create(
+                    FlightCrew(
+                        flight=flight,
+                        crew_id=crew_id,
+                        departure_time=flight.departure_time,
+                        arrival_time=flight.arrival_time,
+                    )
+                    for flight, (_, _, crew) in zip(objects, kept)
+                    for crew_id in dict.fromkeys(crew)
+                )
+                transaction.on_commit(flight_index.changed)
+            if any(pk is not None for _, pk, _ in kept):
+                # As loaddata does, or the next inserts reuse those pks.
+                with connection.cursor() as cursor:
+                    for sql in connection.ops.sequence_reset_sql(
+                        no_style(), [model]
+                    ):
+                        cursor.execute(sql)
+            if objects:
+                caching.bump_generation()
+                if model in reference.MODELS:
+                    caching.bump_references()
+
+        if keys is not None:
+            for instance in objects:
+                keys[
+                    tuple(
+                        getattr(instance, model._meta.get_field(name).attname)
+                        for name in NATURAL_KEYS[label]
+                    )
+                ] = instance.pk
+        self.created[label] += len(objects)
+        self.skipped += skipped
+        self.log(
+            f"{label}: {len(objects)} created, {skipped} skipped "
+            f"({self.rate:.0f} rows/s)"
+        )
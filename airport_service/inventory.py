@@ -0,0 +1,155 @@
+from collections import defaultdict
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import F
+
+from airport_service import caching, reporting
+from airport_service.models import Flight, Ticket
+from airport_service.seat_map import SeatMap
+
+
+def _locked_flight(flight_id: int) -> Flight | None:
+    return (
+        Flight.objects.select_for_update(of=("self",))
+        .select_related("airplane")
+        .only("seat_map", "airplane__rows", "airplane__seats_in_row")
+        .filter(pk=flight_id)
+        .first()
+    )
+
+
+@transaction.atomic
+def sell_seats(flight_id: int, seats) -> None:
+    seats = list(seats)
+    flight = _locked_flight(flight_id) if seats else None
+    if flight is None:
+        return
+    seat_map = flight.get_seat_map()
+    for row, seat in seats:
+        seat_map.take(row, seat)
+    Flight.objects.filter(pk=flight_id).update(
+        seats_sold=F("seats_sold") + len(seats),
+        seat_map=seat_map.to_bytes(),
+    )
+
+
+@transaction.atomic
+def release_seats(flight_id: int, seats) -> None:
+    seats = list(seats)
+    flight = _locked_flight(flight_id) if seats else None
+    if flight is None:
+        return
+    seat_map = flight.get_seat_map()
+    for row, seat in seats:
+        try:
+            seat_map.release(row, seat)
+        except IndexError:
+            pass
+    Flight.objects.filter(pk=flight_id).update(
+        seats_sold=F("seats_sold") - len(seats),
+        seat_map=seat_map.to_bytes(),
+    )
+
+
+def seats_by_flight(tickets) -> dict[int, list[tuple[int, int]]]:
+    seats = defaultdict(list)
+    for ticket in tickets:
+        seats[ticket.flight_id].append((ticket.row, ticket.seat))
+    return seats
+
+
+def tickets_created(tickets) -> None:
+    """Account for saved tickets, including ones written by bulk_create"""
+    seats = seats_by_flight(tickets)
+    for flight_id, flight_seats in seats.items():
+        sell_seats(flight_id, flight_seats)
+    routes = reporting.tickets_changed(
+        {flight_id: len(taken) for flight_id, taken in seats.items()}
+    )
+    caching.bump_flights(seats)
+    caching.bump_routes(routes)
+
+
+def tickets_deleted(tickets) -> None:
+    seats = seats_by_flight(tickets)
+    for flight_id, flight_seats in seats.items():
+        release_seats(flight_id, flight_seats)
+    routes = reporting.tickets_changed(
+        {flight_id: -len(taken) for flight_id, taken in seats.items()}
+    )
+    caching.bump_flights(seats)
+    caching.bump_routes(routes)
+
+
+def find_mismatches(
+    queryset=None, chunk_size: int = 500
+) -> list[tuple[int, int, int, bytes]]:
+    """Return (flight id, stored, actual, actual seat map) of stale flights."""
+    if queryset is None:
+        queryset = Flight.objects.all()
+    flights = (
+        queryset.order_by("id")
+        .select_related("airplane")
+        .only(
+            "seats_sold",
+            "seat_map",
+            "airplane__rows",
+            "airplane__seats_in_row",
+        )
+    )
+    mismatches = []
+    chunk = []
+    for flight in flights.iterator(chunk_size=chunk_size):
+        chunk.append(flight)
+        if len(chunk) == chunk_size:
+            mismatches.extend(_chunk_mismatches(chunk))
+            chunk = []
+    mismatches.extend(_chunk_mismatches(chunk))
+    return mismatches
+
+
+def _chunk_mismatches(
+    flights: list[Flight],
+) -> list[tuple[int, int, int, bytes]]:
+    if not flights:
+        return []
+    tickets = (
+        Ticket.objects.filter(flight_id__in=[flight.id for flight in flights])
+        .order_by("flight_id")
+        .values_list("flight_id", "row", "seat")
+    )
+    seats = {
+        flight_id: [(row, seat) for _, row, seat in group]
+        for flight_id, group in groupby(tickets, key=lambda ticket: ticket[0])
+    }
+    mismatches = []
+    for flight in flights:
+        sold = seats.get(flight.id, [])
+        seat_map = SeatMap(flight.airplane.rows, flight.airplane.seats_in_row)
+        for row, seat in sold:
+            try:
+                seat_map.take(row, seat)
+            except IndexError:
+                pass
+        if (
+            flight.seats_sold != len(sold)
+            or bytes(flight.seat_map) != seat_map.to_bytes()
+        ):
+            mismatches.append(
+                (flight.id, flight.seats_sold, len(sold), seat_map.to_bytes())
+            )
+    return mismatches
+
+
+def rebuild(queryset=None) -> list[tuple[int, int, int, bytes]]:
+    mismatches = find_mismatches(queryset)
+    Flight.objects.bulk_update(
+        [
+            Flight(id=flight_id, seats_sold=actual_sold, seat_map=seat_map)
+            for flight_id, _, actual_sold, seat_map in mismatches
+        ],
+        ["seats_sold", "seat_map"],
+        batch_size=500,
+    )
+    return mismatches
@@ -0,0 +1,274 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from airport_service.models import Flight
+
+INDEX_VERSION_KEY = "airport_service:flight_index:version"
+
+LEG_FIELDS = (
+    "departure_time",
+    "id",
+    "route_id",
+    "route__source_id",
+    "route__destination_id",
+    "arrival_time",
+    "route__distance",
+)
+
+
+class Leg(NamedTuple):
+    departure_time: datetime
+    flight_id: int
+    route_id: int
+    source_id: int
+    destination_id: int
+    arrival_time: datetime
+    distance: int
+
+
+class Itinerary(NamedTuple):
+    legs: tuple[Leg, ...]
+
+    @property
+    def stops(self) -> int:
+        return len(self.legs) - 1
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def distance(self) -> int:
+        return sum(leg.distance for leg in self.legs)
+
+
+SORT_KEYS = {
+    "arrival": lambda itinerary: (
+        itinerary.arrival_time,
+        itinerary.stops,
+        itinerary.distance,
+    ),
+    "distance": lambda itinerary: (
+        itinerary.distance,
+        itinerary.arrival_time,
+        itinerary.stops,
+    ),
+}
+
+
+class FlightIndex:
+    """
+    In-process adjacency index: departure airport -> legs sorted by time,
+    of the flights departing at or after the time it was built.
+
+    Writes in this process are applied incrementally. A version counter in
+    the default cache tells the index when another process changed
+    flights, in which case it is rebuilt with a single query. That only
+    reaches other worker processes with a shared cache backend, so the
+    index is also rebuilt after FLIGHT_INDEX_MAX_AGE seconds.
+
+    Updates replace the departure lists they touch instead of modifying
+    them, so searches hold the lock only to take the current mapping.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._departures: dict[int, list[Leg]] = {}
+        self._legs: dict[int, Leg] = {}
+        self._version = None
+        self._built_at = 0.0
+
+    @property
+    def max_age(self) -> int:
+        return getattr(settings, "FLIGHT_INDEX_MAX_AGE", 60)
+
+    @staticmethod
+    def _rows(flights):
+        return (
+            flights.filter(departure_time__gte=timezone.now())
+            .order_by()
+            .values_list(*LEG_FIELDS)
+        )
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def changed(self) -> None:
+        """Make every process rebuild, e.g. after bulk writes to flights"""
+        with self._lock:
+            self._version = None
+            self._bump_version()
+
+    def rebuild(self) -> None:
+        with self._lock:
+            version = cache.get_or_set(INDEX_VERSION_KEY, 0, timeout=None)
+            self._built_at = time.monotonic()
+            legs_by_id = {}
+            departures = {}
+            for row in self._rows(Flight.objects.all()).iterator(
+                chunk_size=2000
+            ):
+                leg = Leg(*row)
+                legs_by_id[leg.flight_id] = leg
+                departures.setdefault(leg.source_id, []).append(leg)
+            for legs in departures.values():
+                legs.sort()
+            self._legs, self._departures = legs_by_id, departures
+            self._version = version
+
+    def _ensure_fresh(self) -> None:
+        version = cache.get(INDEX_VERSION_KEY)
+        if (
+            self._version is None
+            or version != self._version
+            or time.monotonic() - self._built_at > self.max_age
+        ):
+            self.rebuild()
+
+    def _bump_version(self) -> None:
+        try:
+            version = cache.incr(INDEX_VERSION_KEY)
+        except ValueError:
+            cache.set(INDEX_VERSION_KEY, 1, timeout=None)
+            version = 1
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+        else:
+            # Another process changed flights meanwhile, rebuild lazily.
+            self._version = None
+
+    def _replace(self, flight_ids, new_legs=()) -> None:
+        """Swap in departure lists without `flight_ids`, with `new_legs`"""
+        departures = dict(self._departures)
+        copied = set()
+
+        def legs_of(airport_id: int) -> list[Leg]:
+            if airport_id not in copied:
+                copied.add(airport_id)
+                departures[airport_id] = list(
+                    departures.get(airport_id, ())
+                )
+            return departures[airport_id]
+
+        for flight_id in flight_ids:
+            leg = self._legs.pop(flight_id, None)
+            if leg is not None:
+                legs = legs_of(leg.source_id)
+                del legs[bisect_left(legs, leg)]
+        for leg in new_legs:
+            self._legs[leg.flight_id] = leg
+            insort(legs_of(leg.source_id), leg)
+        self._departures = departures
+
+    def update_flights(self, flight_ids) -> None:
+        flight_ids = list(flight_ids)
+        with self._lock:
+            if self._version is not None:
+                self._replace(
+                    flight_ids,
+                    [
+                        Leg(*row)
+                        for row in self._rows(
+                            Flight.objects.filter(id__in=flight_ids)
+                        )
+                    ],
+                )
+            self._bump_version()
+
+    def remove_flights(self, flight_ids) -> None:
+        with self._lock:
+            if self._version is not None:
+                self._replace(flight_ids)
+            self._bump_version()
+
+    def update_route(self, route_id: int) -> None:
+        with self._lock:
+            flight_ids = [
+                leg.flight_id
+                for leg in self._legs.values()
+                if leg.route_id == route_id
+            ]
+        self.update_flights(flight_ids)
+
+    @staticmethod
+    def _departures_between(
+        departures, airport_id: int, start: datetime, end: datetime
+    ):
+        legs = departures.get(airport_id, [])
+        index = bisect_left(legs, (start,))
+        while index < len(legs) and legs[index].departure_time < end:
+            yield legs[index]
+            index += 1
+
+    def search(
+        self,
+        source_id: int,
+        destination_id: int,
+        start: datetime,
+        end: datetime,
+        max_stops: int = 2,
+        min_connection: timedelta = timedelta(hours=1),
+        max_connection: timedelta = timedelta(hours=24),
+        sort: str = "arrival",
+        limit: int = 5,
+    ) -> list[Itinerary]:
+        """
+        Find top itineraries whose first leg departs in [start, end).
+
+        Extending a path only makes it arrive later, fly farther and stop
+        more, so its key is a lower bound of every itinerary through it:
+        paths which can't beat the `limit`-th best found are dropped.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            departures = self._departures
+
+        sort_key = SORT_KEYS[sort]
+        best = []
+        stack = [
+            (leg,)
+            for leg in self._departures_between(
+                departures, source_id, start, end
+            )
+        ]
+        while stack:
+            legs = stack.pop()
+            key = sort_key(Itinerary(legs))
+            if len(best) == limit and key >= best[-1][0]:
+                continue
+            last = legs[-1]
+            if last.destination_id == destination_id:
+                insort(
+                    best,
+                    (key, [leg.flight_id for leg in legs], Itinerary(legs)),
+                )
+                del best[limit:]
+                continue
+            if len(legs) > max_stops:
+                continue
+            visited = {leg.source_id for leg in legs}
+            for leg in self._departures_between(
+                departures,
+                last.destination_id,
+                last.arrival_time + min_connection,
+                last.arrival_time + max_connection,
+            ):
+                if leg.destination_id not in visited:
+                    stack.append(legs + (leg,))
+
+        return [itinerary for _, _, itinerary in best]
+
+
+flight_index = FlightIndex()
@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models.functions import TruncDate
+
+from airport_service import caching, reporting
+from airport_service.models import Airport, Flight, Route, local_date, zone
+
+BATCH_SIZE = 2000
+
+
+def fill(flights) -> None:
+    """Set the local departure date of unsaved flights, with one query"""
+    zones = dict(
+        Route.objects.filter(
+            id__in={flight.route_id for flight in flights}
+        ).values_list("id", "source__timezone")
+    )
+    for flight in flights:
+        flight.departure_local_date = local_date(
+            flight.departure_time, zones.get(flight.route_id, "")
+        )
+
+
+def _update(flights) -> int:
+    updated = 0
+    for name in (
+        Airport.objects.order_by()
+        .values_list("timezone", flat=True)
+        .distinct()
+    ):
+        updated += flights.filter(route__source__timezone=name).update(
+            departure_local_date=TruncDate("departure_time", tzinfo=zone(name))
+        )
+    return updated
+
+
+@transaction.atomic
+def sync(flights=None, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Recompute the local departure date of a queryset of flights, all of
+    them by default, with one UPDATE per time zone of the airports.
+
+    For writes which bypass Flight.save(): raw saves, a changed airport
+    time zone or route source. The rollups of the days the flights move
+    between are recomputed. Returns the number of flights updated.
+    """
+    if flights is None:
+        updated = _update(Flight.objects.all())
+        reporting.rebuild()
+    else:
+        # By id, the queryset may filter on the dates being replaced.
+        ids = list(flights.order_by("pk").values_list("pk", flat=True))
+        updated = 0
+        for index in range(0, len(ids), batch_size):
+            batch = Flight.objects.filter(pk__in=ids[index:index + batch_size])
+            days_and_routes = reporting.days_and_routes(batch)
+            updated += _update(batch)
+            reporting.refresh(
+                days_and_routes | reporting.days_and_routes(batch)
+            )
+    if updated:
+        caching.bump_generation()
+    return updated
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from airport_service import local_dates
+from airport_service.models import Flight
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored local departure date of flights from their "
+        "source airport's time zone, ex. after writes bypassing the models."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--airport",
+            type=int,
+            action="append",
+            dest="airports",
+            help="Limit to flights departing from the given airport id "
+            "(can be repeated).",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only flights without a local departure date.",
+        )
+
+    def handle(self, *args, **options):
+        flights = None
+        if options["airports"] or options["missing"]:
+            flights = Flight.objects.all()
+            if options["airports"]:
+                flights = flights.filter(
+                    route__source_id__in=options["airports"]
+                )
+            if options["missing"]:
+                flights = flights.filter(departure_local_date__isnull=True)
+
+        updated = local_dates.sync(flights)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} flight(s) updated."))
@@ -0,0 +1,268 @@
+import json
+import math
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.signals import request_started
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airport_service.models import (
+    Airplane,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport_service.urls import router
+from user.urls import urlpatterns as user_urlpatterns
+
+BENCHMARK_EMAIL = "benchmark@example.com"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+def hide_toolbar(request) -> bool:
+    return False
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(share * len(ordered)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles and query counts of every API "
+        "endpoint. Runs inside a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help="Only endpoints whose name contains the value.",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Disable the flight search cache.",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report to a file (stdout if not)."
+        )
+
+    def handle(self, *args, **options):
+        overrides = {
+            "ALLOWED_HOSTS": ["*"],
+            "DEBUG_TOOLBAR_CONFIG": {"SHOW_TOOLBAR_CALLBACK": hide_toolbar},
+        }
+        if options["no_cache"]:
+            overrides["FLIGHT_SEARCH_CACHE_TIMEOUT"] = 0
+
+        # Every request would otherwise clear the query log being measured.
+        request_started.disconnect(reset_queries)
+        try:
+            with override_settings(**overrides), transaction.atomic():
+                results, skipped = self.run(options)
+                transaction.set_rollback(True)
+        finally:
+            request_started.connect(reset_queries)
+
+        report = {
+            "iterations": options["iterations"],
+            "cache": not options["no_cache"],
+            "database": connection.vendor,
+            "rows": {
+                model.__name__: model.objects.count()
+                for model in (Airport, Route, Airplane, Flight, Order, Ticket)
+            },
+            "endpoints": results,
+            "skipped": skipped,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def run(self, options) -> tuple[dict, list]:
+        self.user = self.benchmark_user()
+        endpoints, skipped = self.endpoints()
+        results = {}
+        for name, method, url, data, user in endpoints:
+            if options["only"] and not any(
+                part in name for part in options["only"]
+            ):
+                continue
+            results[name] = self.measure(
+                method,
+                url,
+                data,
+                user,
+                options["iterations"],
+                options["warmup"],
+            )
+            self.stderr.write(
+                f"{name}: p50 {results[name]['latency_ms']['p50']} ms, "
+                f"{results[name]['queries']['max']} queries"
+            )
+        return results, skipped
+
+    def benchmark_user(self):
+        user, _ = get_user_model().objects.get_or_create(
+            email=BENCHMARK_EMAIL, defaults={"is_staff": True}
+        )
+        user.set_password(BENCHMARK_PASSWORD)
+        user.save()
+        return user
+
+    def sample_params(self, name: str) -> dict:
+        flight = Flight.objects.select_related("route").order_by("id").first()
+        if flight is None:
+            return {}
+        date = timezone.localtime(flight.departure_time).date().isoformat()
+        if name == "airport:flight-itineraries":
+            return {
+                "source": flight.route.source_id,
+                "destination": flight.route.destination_id,
+                "date": date,
+            }
+        if name == "airport:flight-day-manifest":
+            return {"date": date}
+        if name == "airport:route-pair-calendar":
+            return {
+                "source": flight.route.source_id,
+                "destination": flight.route.destination_id,
+                "month": date[:7],
+            }
+        if name == "airport:route-calendar":
+            return {"month": date[:7]}
+        return {}
+
+    def endpoints(self):
+        """(name, method, url, data, user) of every endpoint to measure"""
+        endpoints = []
+        skipped = []
+        for prefix, viewset, basename in router.registry:
+            model = viewset.queryset.model
+            sample = model.objects.order_by("pk").first()
+            user = self.user
+            if sample is not None and hasattr(sample, "user"):
+                # Per-user resources are only visible to their owner.
+                user = sample.user
+            name = f"airport:{basename}-list"
+            endpoints.append((name, "GET", reverse(name), {}, user))
+            has_detail = hasattr(viewset, "retrieve")
+            if has_detail and sample is None:
+                skipped.append(f"airport:{basename}-detail")
+            elif has_detail:
+                name = f"airport:{basename}-detail"
+                endpoints.append(
+                    (name, "GET", reverse(name, args=[sample.pk]), {}, user)
+                )
+
+            for extra_action in viewset.get_extra_actions():
+                name = f"airport:{basename}-{extra_action.url_name}"
+                if "get" not in extra_action.mapping:
+                    skipped.append(name)
+                elif extra_action.detail and sample is None:
+                    skipped.append(name)
+                else:
+                    args = [sample.pk] if extra_action.detail else []
+                    endpoints.append(
+                        (
+                            name,
+                            "GET",
+                            reverse(name, args=args),
+                            self.sample_params(name),
+                            user,
+                        )
+                    )
+
+        refresh = self.request(
+            "POST",
+            reverse("user:token_obtain_pair"),
+            {"email": BENCHMARK_EMAIL, "password": BENCHMARK_PASSWORD},
+            None,
+        ).data.get("refresh")
+        user_requests = {
+            "manage": ("GET", {}, self.user),
+            "token_obtain_pair": (
+                "POST",
+                {"email": BENCHMARK_EMAIL, "password": BENCHMARK_PASSWORD},
+                None,
+            ),
+            "token_refresh": ("POST", {"refresh": refresh}, None),
+        }
+        for pattern in user_urlpatterns:
+            name = f"user:{pattern.name}"
+            if pattern.name not in user_requests:
+                # Registering and logging out change state on every call.
+                skipped.append(name)
+                continue
+            method, data, user = user_requests[pattern.name]
+            endpoints.append((name, method, reverse(name), data, user))
+        return endpoints, skipped
+
+    def request(self, method: str, url: str, data: dict, user):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        if method == "GET":
+            return client.get(url, data)
+        return client.generic(
+            method, url, json.dumps(data), content_type="application/json"
+        )
+
+    def measure(self, method, url, data, user, iterations, warmup) -> dict:
+        latencies = []
+        queries = []
+        sizes = []
+        statuses = set()
+        for iteration in range(warmup + iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = self.request(method, url, data, user)
+                # Streamed responses run their queries while consumed.
+                body = (
+                    b"".join(response.streaming_content)
+                    if response.streaming
+                    else response.content
+                )
+                elapsed = (time.perf_counter() - start) * 1000
+            if iteration < warmup:
+                continue
+            latencies.append(elapsed)
+            queries.append(len(captured))
+            sizes.append(len(body))
+            statuses.add(response.status_code)
+
+        return {
+            "method": method,
+            "url": url,
+            "params": data if method == "GET" else {},
+            "status": sorted(statuses),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.5), 3),
+                "p90": round(percentile(latencies, 0.9), 3),
+                "p99": round(percentile(latencies, 0.99), 3),
+                "mean": round(statistics.fmean(latencies), 3),
+                "max": round(max(latencies), 3),
+            },
+            "queries": {
+                "min": min(queries),
+                "median": statistics.median(queries),
+                "max": max(queries),
+            },
+            "response_bytes": max(sizes),
+        }
@@ -0,0 +1,92 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from airport_service import renderers
+from airport_service.models import Flight
+from airport_service.serializers import FlightDetailSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the JSON, orjson and MessagePack "
+        "renderers on FlightDetailSerializer payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flights",
+            type=int,
+            default=100,
+            help="Flights in the list payload.",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument(
+            "--output", help="Write the JSON report to a file (stdout if not)."
+        )
+
+    def handle(self, *args, **options):
+        flights = list(
+            Flight.objects.select_related(
+                "airplane", "route__source", "route__destination"
+            )
+            .prefetch_related("crew")
+            .order_by("id")[: options["flights"]]
+        )
+        if not flights:
+            raise CommandError("No flights, run generate_dataset first.")
+
+        payloads = {
+            "detail": FlightDetailSerializer(flights[0]).data,
+            "list": FlightDetailSerializer(flights, many=True).data,
+        }
+        available = {"json": JSONRenderer()}
+        if renderers.orjson is not None:
+            available["orjson"] = renderers.ORJSONRenderer()
+        if renderers.msgpack is not None:
+            available["msgpack"] = renderers.MessagePackRenderer()
+
+        results = {}
+        for payload_name, payload in payloads.items():
+            reference = available["json"].render(payload)
+            for renderer_name, renderer in available.items():
+                result = self.measure(
+                    renderer, payload, options["iterations"]
+                )
+                if renderer.media_type == "application/json":
+                    result["matches_json"] = (
+                        renderer.render(payload) == reference
+                    )
+                results[f"{payload_name}:{renderer_name}"] = result
+                self.stderr.write(
+                    f"{payload_name} {renderer_name}: "
+                    f"{result['renders_per_second']} renders/s, "
+                    f"{result['bytes']} bytes"
+                )
+
+        report = {
+            "iterations": options["iterations"],
+            "flights": len(flights),
+            "renderers": results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def measure(self, renderer, payload, iterations: int) -> dict:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            rendered = renderer.render(payload)
+        elapsed = time.perf_counter() - start
+        return {
+            "bytes": len(rendered),
+            "renders_per_second": round(iterations / elapsed, 1),
+            "megabytes_per_second": round(
+                len(rendered) * iterations / elapsed / 1e6, 2
+            ),
+        }
@@ -0,0 +1,326 @@
+import heapq
+import random
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from airport_service import (
+    caching,
+    inventory,
+    reporting,
+    roster,
+    search,
+)
+from airport_service.itineraries import flight_index
+from airport_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightCrew,
+    Order,
+    Route,
+    Ticket,
+)
+
+BATCH_SIZE = 2000
+# Time on the ground between two flights of an airplane.
+TURNAROUND = timedelta(minutes=45)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a seeded synthetic dataset (airports, route graph, fleet, "
+        "flights, orders and tickets) using bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--airports", type=int, default=50)
+        parser.add_argument(
+            "--routes-per-airport",
+            type=int,
+            default=5,
+            help="Outgoing routes of every airport.",
+        )
+        parser.add_argument("--airplanes", type=int, default=100)
+        parser.add_argument("--crew", type=int, default=300)
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument(
+            "--days", type=int, default=90, help="Days of flights."
+        )
+        parser.add_argument(
+            "--flights-per-route",
+            type=int,
+            default=1,
+            help="Flights per route per day.",
+        )
+        parser.add_argument(
+            "--fill",
+            type=float,
+            default=0.5,
+            help="Average share of sold seats (0..1).",
+        )
+        parser.add_argument(
+            "--start",
+            type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+            default=None,
+            help="First day of flights (YYYY-MM-DD), today by default.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--prefix",
+            default="GEN",
+            help="Prefix of generated names, keeps datasets apart.",
+        )
+
+    def log(self, message: str) -> None:
+        self.stdout.write(message)
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.prefix = options["prefix"]
+
+        airports = self.create_airports(options["airports"])
+        routes = self.create_routes(airports, options["routes_per_airport"])
+        airplanes = self.create_airplanes(options["airplanes"])
+        crew = self.create_crew(options["crew"])
+        users = self.create_users(options["users"])
+        flights = self.create_flights(
+            routes,
+            airplanes,
+            crew,
+            options["start"] or timezone.localdate(),
+            options["days"],
+            options["flights_per_route"],
+        )
+        tickets = self.create_tickets(flights, users, options["fill"])
+
+        # Generated flights are exactly the ones flown by the new fleet.
+        inventory.rebuild(Flight.objects.filter(airplane__in=airplanes))
+        # Bulk inserts bypass the rollup signals, also moves the watermarks.
+        reporting.rebuild()
+        caching.bump_generation()
+        caching.bump_references()
+        transaction.on_commit(flight_index.changed)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(airports)} airports, {len(routes)} routes, "
+                f"{len(airplanes)} airplanes, {len(flights)} flights and "
+                f"{tickets} tickets."
+            )
+        )
+
+    def create_airports(self, count: int) -> list[Airport]:
+        airports = [
+            Airport(
+                name=f"{self.prefix} Airport {index:05d}",
+                closest_big_city=f"{self.prefix} City {index // 3:05d}",
+            )
+            for index in range(count)
+        ]
+        for airport in airports:
+            search.update_search_fields(airport)
+        airports = Airport.objects.bulk_create(airports, batch_size=BATCH_SIZE)
+        self.log(f"{len(airports)} airports")
+        return airports
+
+    def create_routes(self, airports, per_airport: int) -> list[Route]:
+        routes = []
+        per_airport = min(per_airport, len(airports) - 1)
+        for source in airports:
+            others = [airport for airport in airports if airport != source]
+            for destination in self.random.sample(others, per_airport):
+                routes.append(
+                    Route(
+                        source=source,
+                        destination=destination,
+                        distance=self.random.randint(200, 9000),
+                    )
+                )
+        routes = Route.objects.bulk_create(routes, batch_size=BATCH_SIZE)
+        self.log(f"{len(routes)} routes")
+        return routes
+
+    def create_airplanes(self, count: int) -> list[Airplane]:
+        airplane_types = []
+        for name in ("Regional", "Narrow-body", "Wide-body"):
+            airplane_type = AirplaneType(
+                airplane_type=f"{self.prefix} {name}"
+            )
+            search.update_search_fields(airplane_type)
+            airplane_types.append(airplane_type)
+        airplane_types = AirplaneType.objects.bulk_create(airplane_types)
+        sizes = {
+            airplane_types[0]: (18, 4),
+            airplane_types[1]: (30, 6),
+            airplane_types[2]: (40, 9),
+        }
+        airplanes = []
+        for index in range(count):
+            airplane_type = self.random.choice(airplane_types)
+            rows, seats_in_row = sizes[airplane_type]
+            airplanes.append(
+                Airplane(
+                    airplane_name=f"{self.prefix} Airplane {index:05d}",
+                    type=airplane_type,
+                    rows=rows,
+                    seats_in_row=seats_in_row,
+                )
+            )
+        airplanes = Airplane.objects.bulk_create(
+            airplanes, batch_size=BATCH_SIZE
+        )
+        self.log(f"{len(airplanes)} airplanes")
+        return airplanes
+
+    def create_crew(self, count: int) -> list[Crew]:
+        crew = Crew.objects.bulk_create(
+            [
+                Crew(first_name=self.prefix, last_name=f"Member {index:05d}")
+                for index in range(count)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        self.log(f"{len(crew)} crew members")
+        return crew
+
+    def create_users(self, count: int) -> list:
+        User = get_user_model()
+        users = []
+        for index in range(count):
+            user = User(email=f"{self.prefix.lower()}{index:06d}@example.com")
+            user.set_unusable_password()
+            users.append(user)
+        users = User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        self.log(f"{len(users)} users")
+        return users
+
+    def create_flights(
+        self, routes, airplanes, crew, start, days: int, per_route: int
+    ) -> list[Flight]:
+        planned = []
+        for day in range(days):
+            date = start + timedelta(days=day)
+            for route in routes:
+                for _ in range(per_route):
+                    departure_time = timezone.make_aware(
+                        datetime.combine(
+                            date,
+                            time(
+                                self.random.randint(5, 22),
+                                self.random.choice((0, 15, 30, 45)),
+                            ),
+                        )
+                    )
+                    planned.append(
+                        Flight(
+                            route=route,
+                            departure_time=departure_time,
+                            arrival_time=departure_time
+                            + timedelta(minutes=30 + route.distance // 12),
+                            # Airports are in the server's time zone.
+                            departure_local_date=date,
+                        )
+                    )
+        planned.sort(key=lambda flight: flight.departure_time)
+
+        # Airplanes and crew rotate by when they are free again, so their
+        # flights don't overlap and crew rest between duties, as the API
+        # enforces. Flights no airplane is free for are left out.
+        rest = roster.min_rest()
+        first = timezone.make_aware(datetime.combine(start, time()))
+        free_airplanes = [(first, index) for index in range(len(airplanes))]
+        free_crew = [(first, index) for index in range(len(crew))]
+        flights = []
+        crews = []
+        for flight in planned:
+            if (
+                not free_airplanes
+                or free_airplanes[0][0] > flight.departure_time
+            ):
+                continue
+            _, index = heapq.heappop(free_airplanes)
+            flight.airplane = airplanes[index]
+            heapq.heappush(
+                free_airplanes, (flight.arrival_time + TURNAROUND, index)
+            )
+            members = []
+            while (
+                len(members) < 2
+                and free_crew
+                and free_crew[0][0] <= flight.departure_time
+            ):
+                members.append(heapq.heappop(free_crew)[1])
+            for index in members:
+                heapq.heappush(free_crew, (flight.arrival_time + rest, index))
+            flights.append(flight)
+            crews.append([crew[index] for index in members])
+        flights = Flight.objects.bulk_create(flights, batch_size=BATCH_SIZE)
+
+        FlightCrew.objects.bulk_create(
+            [
+                FlightCrew(
+                    flight=flight,
+                    crew=member,
+                    departure_time=flight.departure_time,
+                    arrival_time=flight.arrival_time,
+                )
+                for flight, members in zip(flights, crews)
+                for member in members
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        self.log(f"{len(flights)} flights")
+        return flights
+
+    def create_tickets(self, flights, users, fill: float) -> int:
+        if not users:
+            return 0
+        airplanes = {
+            airplane.id: airplane
+            for airplane in Airplane.objects.filter(
+                id__in={flight.airplane_id for flight in flights}
+            )
+        }
+        created = 0
+        for offset in range(0, len(flights), BATCH_SIZE // 10):
+            orders = []
+            seats = []
+            for flight in flights[offset:offset + BATCH_SIZE // 10]:
+                airplane = airplanes[flight.airplane_id]
+                free = [
+                    (row, seat)
+                    for row in range(1, airplane.rows + 1)
+                    for seat in range(1, airplane.seats_in_row + 1)
+                ]
+                share = min(max(self.random.gauss(fill, 0.15), 0), 1)
+                sold = self.random.sample(free, int(len(free) * share))
+                while sold:
+                    size = min(len(sold), self.random.randint(1, 4))
+                    group = [sold.pop() for _ in range(size)]
+                    orders.append(
+                        Order(user_id=self.random.choice(users).id)
+                    )
+                    seats.append((flight, group))
+            orders = Order.objects.bulk_create(orders, batch_size=BATCH_SIZE)
+            tickets = Ticket.objects.bulk_create(
+                [
+                    Ticket(
+                        flight_id=flight.id,
+                        order_id=order.id,
+                        row=row,
+                        seat=seat,
+                    )
+                    for order, (flight, group) in zip(orders, seats)
+                    for row, seat in group
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            created += len(tickets)
+        self.log(f"{created} tickets")
+        return created
@@ -0,0 +1,124 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport_service import importing
+
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Import crew, airports, airplanes, routes and flights from JSON "
+        "(dumpdata fixtures or JSON lines), CSV or OpenFlights airports.dat "
+        "and routes.dat files. Files are streamed and written in chunks "
+        "with bulk inserts, rows already in the database are skipped. "
+        "Seat maps and rollups of imported flights are updated at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", metavar="path")
+        parser.add_argument(
+            "--format",
+            choices=("json", "csv", "openflights"),
+            help="By default from the extension: .csv, .dat or else JSON.",
+        )
+        parser.add_argument(
+            "--model",
+            help="Model of CSV rows and plain JSON objects, ex. airport.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=importing.CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "File keeping the number of imported rows of every path, "
+                "to resume an interrupted load. Removed when done."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            label = options["model"] and importing.model_label(
+                options["model"]
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        checkpoint = options["checkpoint"]
+        progress = {}
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as file:
+                progress = json.load(file)
+
+        importer = importing.Importer(
+            chunk_size=options["chunk_size"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        airports = {}
+        started = time.monotonic()
+        for path in options["paths"]:
+            key = os.path.abspath(path)
+            file_format = options["format"] or self.guess_format(path)
+            if file_format == "csv" and not label:
+                raise CommandError("--model is required for CSV files.")
+            if progress.get(key):
+                self.stdout.write(
+                    f"{path}: resuming after row {progress[key]}."
+                )
+
+            def done(rows: int, key: str = key) -> None:
+                progress[key] = rows
+                if checkpoint:
+                    self.save_checkpoint(checkpoint, progress)
+
+            with open(path, newline="", encoding="utf-8") as file:
+                if file_format == "csv":
+                    rows = importing.read_csv(file, label)
+                elif file_format == "openflights":
+                    rows = importing.read_openflights(file, airports)
+                else:
+                    rows = importing.read_json(file, label)
+                try:
+                    importer.run(
+                        rows, skip=progress.get(key, 0), on_chunk=done
+                    )
+                except importing.InvalidRows as error:
+                    for number, errors in error.errors[:MAX_REPORTED_ERRORS]:
+                        self.stderr.write(
+                            f"{path}, row {number}: {json.dumps(errors)}"
+                        )
+                    raise CommandError(f"{path}: {error}")
+                except ValueError as error:
+                    raise CommandError(f"{path}: {error}")
+
+        importer.finish()
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.monotonic() - started
+        created = ", ".join(
+            f"{count} {label.split('.')[1]}"
+            for label, count in importer.created.items()
+            if count
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {importer.rows} rows in {elapsed:.1f}s "
+                f"({importer.rate:.0f} rows/s): created "
+                f"{created or 'nothing'}, {importer.skipped} skipped."
+            )
+        )
+
+    @staticmethod
+    def guess_format(path: str) -> str:
+        extension = os.path.splitext(path)[1].lower()
+        return {".csv": "csv", ".dat": "openflights"}.get(extension, "json")
+
+    @staticmethod
+    def save_checkpoint(path: str, progress: dict) -> None:
+        # Written aside and renamed, a crash can't leave half a file.
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(progress, file)
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from airport_service import schedules
+from airport_service.models import FlightSchedule
+
+
+class Command(BaseCommand):
+    help = (
+        "Create, move or delete the flights of the flight schedules for a "
+        "rolling horizon. Flights with sold seats are never changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=60, help="Days ahead to materialize."
+        )
+        parser.add_argument(
+            "--schedule",
+            type=int,
+            action="append",
+            dest="schedules",
+            help="Limit to the given schedule id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = FlightSchedule.objects.all()
+        if options["schedules"]:
+            queryset = queryset.filter(id__in=options["schedules"])
+
+        result = schedules.materialize(queryset, days=options["days"])
+
+        if result.kept:
+            self.stdout.write(
+                f"{result.kept} flight(s) differ from their schedule but "
+                f"have sold seats or have departed."
+            )
+        if result.conflicts:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{result.conflicts} flight(s) skipped, the airplane "
+                    f"is busy with another flight."
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.created} flight(s) created, {result.updated} "
+                f"updated and {result.deleted} deleted."
+            )
+        )
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from airport_service import inventory
+from airport_service.models import Flight
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or verify) the stored seats_sold counter and seat map."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report stale counters, exit with an error if any.",
+        )
+        parser.add_argument(
+            "--flight",
+            type=int,
+            action="append",
+            dest="flights",
+            help="Limit to the given flight id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Flight.objects.all()
+        if options["flights"]:
+            queryset = queryset.filter(id__in=options["flights"])
+
+        if options["check"]:
+            mismatches = inventory.find_mismatches(queryset)
+        else:
+            with transaction.atomic():
+                mismatches = inventory.rebuild(queryset)
+
+        for flight_id, stored_sold, actual_sold, _ in mismatches:
+            self.stdout.write(
+                f"Flight {flight_id}: stored {stored_sold}, "
+                f"actual {actual_sold}"
+            )
+
+        if options["check"] and mismatches:
+            raise CommandError(f"{len(mismatches)} flight(s) out of sync.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(mismatches)} flight(s) "
+                f"{'out of sync' if options['check'] else 'rebuilt'}."
+            )
+        )
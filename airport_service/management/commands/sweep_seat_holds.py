@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from airport_service import holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds in bulk."
+
+    def handle(self, *args, **options):
+        swept = holds.get_store().sweep()
+        self.stdout.write(
+            self.style.SUCCESS(f"{swept} expired hold(s) swept.")
+        )
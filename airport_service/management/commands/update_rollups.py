@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport_service import reporting
+
+
+class Command(BaseCommand):
+    help = (
+        "Bring the daily load factor rollups, and the seats sold of the "
+        "flights they sum, up to date with the tickets and flights created "
+        "since the last run, ex. by bulk imports. "
+        "Meant to run periodically; the first run builds them all."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute the rollups from scratch instead.",
+        )
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="With --rebuild, first local day to recompute.",
+        )
+        parser.add_argument(
+            "--end",
+            type=date.fromisoformat,
+            help="With --rebuild, last local day to recompute.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=reporting.BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        start, end = options["start"], options["end"]
+        if not options["rebuild"]:
+            if start or end:
+                raise CommandError("--start and --end need --rebuild.")
+            rows = reporting.catch_up(batch_size=options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(f"{rows} new ticket(s) and flight(s).")
+            )
+            return
+
+        if start and end and end < start:
+            raise CommandError("--end should not be before --start.")
+        written = reporting.rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f"{written} rollup(s) rebuilt."))
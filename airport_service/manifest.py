@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from django.conf import settings
+
+from airport_service.models import Ticket
+from airport_service.serializers import datetime_formatter
+
+# Header of every manifest column and the ticket lookup it reads.
+COLUMNS = (
+    ("flight", "flight_id"),
+    ("departure_time", "flight__departure_time"),
+    ("source", "flight__route__source__name"),
+    ("destination", "flight__route__destination__name"),
+    ("row", "row"),
+    ("seat", "seat"),
+    ("ticket", "id"),
+    ("order", "order_id"),
+    ("ordered_at", "order__created_at"),
+    ("email", "order__user__email"),
+    ("first_name", "order__user__first_name"),
+    ("last_name", "order__user__last_name"),
+)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows rendered per yielded piece of the response.
+ROWS_PER_PIECE = 500
+
+
+def chunk_size() -> int:
+    return getattr(settings, "MANIFEST_CHUNK_SIZE", 2000)
+
+
+def manifest_rows(tickets=None) -> Iterator[tuple]:
+    """
+    Manifest rows of the tickets, one joined query read in chunks.
+
+    Rows are tuples, not model instances, and come from a server-side
+    cursor where the database has them, so memory doesn't grow with the
+    number of passengers.
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    return (
+        tickets.order_by("flight__departure_time", "flight_id", "row", "seat")
+        .values_list(*(lookup for _, lookup in COLUMNS))
+        .iterator(chunk_size=chunk_size())
+    )
+
+
+def _formatted(rows: Iterable[tuple]) -> Iterator[list]:
+    format_datetime = datetime_formatter()
+    for row in rows:
+        yield [
+            format_datetime(value) if isinstance(value, datetime) else value
+            for value in row
+        ]
+
+
+def render_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header for header, _ in COLUMNS)
+    for index, row in enumerate(_formatted(rows), 1):
+        writer.writerow(row)
+        if index % ROWS_PER_PIECE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def render_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    headers = [header for header, _ in COLUMNS]
+    piece = []
+    for row in _formatted(rows):
+        piece.append(json.dumps(dict(zip(headers, row))) + "\n")
+        if len(piece) == ROWS_PER_PIECE:
+            yield "".join(piece)
+            piece = []
+    yield "".join(piece)
+
+
+RENDERERS = {"csv": render_csv, "ndjson": render_ndjson}
@@ -0,0 +1,283 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from airport_service.querybudget import QueryRecorder, resolve_view
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+METRICS = {
+    "airport_http_requests_total": (
+        "counter",
+        "Requests served per view, action, method and status.",
+        None,
+    ),
+    "airport_http_request_duration_seconds": (
+        "histogram",
+        "Time spent serving a request.",
+        LATENCY_BUCKETS,
+    ),
+    "airport_serializer_duration_seconds": (
+        "histogram",
+        "Time spent in the view serializer's to_representation.",
+        LATENCY_BUCKETS,
+    ),
+    "airport_db_queries": (
+        "histogram",
+        "SQL queries run per request.",
+        (0, 1, 2, 5, 10, 20, 50, 100),
+    ),
+    "airport_db_duration_seconds": (
+        "histogram",
+        "Time spent in SQL queries per request.",
+        LATENCY_BUCKETS,
+    ),
+    "airport_response_bytes": (
+        "histogram",
+        "Size of non-streaming response bodies.",
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+    ),
+    "airport_reference_cache_total": (
+        "counter",
+        "Reference data lookups per model and result (hit or miss).",
+        None,
+    ),
+}
+
+
+def metrics_dir() -> Path | None:
+    directory = getattr(settings, "METRICS_DIR", None)
+    return Path(directory) if directory else None
+
+
+def running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms. When settings.METRICS_DIR is set,
+    each process periodically dumps its state to METRICS_DIR/<pid>.json
+    and collect() merges the files of all worker processes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters = defaultdict(float)
+            # (name, labels) -> [per bucket counts..., +Inf count, sum]
+            self.histograms = {}
+
+    def inc(self, name: str, labels: tuple, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name, labels] += value
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        buckets = METRICS[name][2]
+        with self._lock:
+            state = self.histograms.get((name, labels))
+            if state is None:
+                state = self.histograms[name, labels] = [0] * (
+                    len(buckets) + 2
+                )
+            state[bisect_left(buckets, value)] += 1
+            state[-1] += value
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [
+                    [name, labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [name, labels, list(state)]
+                    for (name, labels), state in self.histograms.items()
+                ],
+            }
+
+    def maybe_flush(self) -> None:
+        directory = metrics_dir()
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5)
+        if directory and time.monotonic() - self._last_flush >= interval:
+            self.flush(directory)
+
+    def flush(self, directory: Path) -> None:
+        self._last_flush = time.monotonic()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.state()))
+        os.replace(tmp_path, path)
+
+    def collect(self) -> dict:
+        """
+        State of this process merged with other workers' dumps. Dumps of
+        processes which are gone are deleted, so restarts reset them.
+        """
+        states = [self.state()]
+        directory = metrics_dir()
+        if directory:
+            self.flush(directory)
+            states = []
+            for path in sorted(directory.glob("*.json")):
+                if path.stem.isdigit() and not running(int(path.stem)):
+                    path.unlink(missing_ok=True)
+                    continue
+                states.append(json.loads(path.read_text()))
+
+        counters = defaultdict(float)
+        histograms = {}
+        for state in states:
+            for name, labels, value in state["counters"]:
+                counters[name, tuple(map(tuple, labels))] += value
+            for name, labels, values in state["histograms"]:
+                key = name, tuple(map(tuple, labels))
+                merged = histograms.setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    merged[i] += value
+        return {"counters": counters, "histograms": histograms}
+
+
+registry = MetricsRegistry()
+
+
+def format_labels(labels) -> str:
+    def escape(value) -> str:
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+        )
+
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels)
+
+
+def sort_key(sample) -> list:
+    return [(key, str(value)) for key, value in sample[0]]
+
+
+def exposition(collected: dict) -> str:
+    """Render collected metrics in the Prometheus text format"""
+    series = defaultdict(list)
+    for (name, labels), value in collected["counters"].items():
+        series[name].append(
+            (labels, [f"{name}{{{format_labels(labels)}}} {value!r}"])
+        )
+    for (name, labels), values in collected["histograms"].items():
+        buckets = METRICS[name][2]
+        *counts, total = values
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*buckets, "+Inf"), counts):
+            cumulative += count
+            bucket_labels = format_labels((*labels, ("le", bound)))
+            lines.append(f"{name}_bucket{{{bucket_labels}}} {cumulative}")
+        lines.append(f"{name}_sum{{{format_labels(labels)}}} {total!r}")
+        lines.append(f"{name}_count{{{format_labels(labels)}}} {cumulative}")
+        series[name].append((labels, lines))
+
+    lines = []
+    for name, (metric_type, help_text, _) in METRICS.items():
+        if name in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for _, sample_lines in sorted(series[name], key=sort_key):
+                lines.extend(sample_lines)
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request) -> HttpResponse:
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if not token or request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden()
+    return HttpResponse(
+        exposition(registry.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        request.serializer_duration = 0.0
+        with QueryRecorder(track_shapes=False) as recorder:
+            request.query_recorder = recorder
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        name, view_class, action = resolve_view(request)
+        labels = (
+            ("view", name or "unmatched"),
+            ("action", action or request.method.lower()),
+        )
+        registry.inc(
+            "airport_http_requests_total",
+            (
+                *labels,
+                ("method", request.method),
+                ("status", response.status_code),
+            ),
+        )
+        registry.observe(
+            "airport_http_request_duration_seconds", labels, duration
+        )
+        registry.observe("airport_db_queries", labels, recorder.count)
+        registry.observe(
+            "airport_db_duration_seconds", labels, recorder.duration
+        )
+        if request.serializer_duration:
+            registry.observe(
+                "airport_serializer_duration_seconds",
+                labels,
+                request.serializer_duration,
+            )
+        if not response.streaming:
+            registry.observe(
+                "airport_response_bytes", labels, len(response.content)
+            )
+        registry.maybe_flush()
+        return response
+
+
+# Times the top level serializer of a view for MetricsMiddleware. Not a
+# docstring: drf-spectacular would publish it as every view's description.
+class SerializerMetricsMixin:
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+        request = self.request._request
+
+        def timed_to_representation(instance):
+            start = time.perf_counter()
+            try:
+                return to_representation(instance)
+            finally:
+                if hasattr(request, "serializer_duration"):
+                    request.serializer_duration += (
+                        time.perf_counter() - start
+                    )
+
+        serializer.to_representation = timed_to_representation
+        return serializer
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_seats_sold(apps, schema_editor) -> None:
+    Flight = apps.get_model("airport_service", "Flight")
+    Ticket = apps.get_model("airport_service", "Ticket")
+    sold = (
+        Ticket.objects.filter(flight=OuterRef("pk"))
+        .order_by()
+        .values("flight")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Flight.objects.update(seats_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0007_alter_ticket_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='seats_sold',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_seats_sold, migrations.RunPython.noop),
+    ]
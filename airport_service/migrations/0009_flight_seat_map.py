@@ -0,0 +1,36 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:06
+
+from django.db import migrations, models
+
+from airport_service.seat_map import SeatMap
+
+
+def backfill_seat_map(apps, schema_editor) -> None:
+    Flight = apps.get_model("airport_service", "Flight")
+    Ticket = apps.get_model("airport_service", "Ticket")
+    flights = []
+    for flight in Flight.objects.select_related("airplane"):
+        seat_map = SeatMap(flight.airplane.rows, flight.airplane.seats_in_row)
+        for row, seat in Ticket.objects.filter(flight=flight).values_list(
+            "row", "seat"
+        ):
+            seat_map.take(row, seat)
+        flight.seat_map = seat_map.to_bytes()
+        flights.append(flight)
+    Flight.objects.bulk_update(flights, ["seat_map"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0008_flight_seats_sold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='seat_map',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(backfill_seat_map, migrations.RunPython.noop),
+    ]
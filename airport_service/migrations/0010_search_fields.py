@@ -0,0 +1,45 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+from airport_service import search
+
+
+def backfill_search_fields(apps, schema_editor) -> None:
+    for label in search.SEARCH_FIELDS:
+        model = apps.get_model(label)
+        objects = list(model.objects.all())
+        for obj in objects:
+            search.update_search_fields(obj)
+        model.objects.bulk_update(
+            objects,
+            [search.search_column(field) for field in search.SEARCH_FIELDS[label]],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0009_flight_seat_map'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airplanetype',
+            name='airplane_type_search',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=60),
+        ),
+        migrations.AddField(
+            model_name='airport',
+            name='closest_big_city_search',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=60),
+        ),
+        migrations.AddField(
+            model_name='airport',
+            name='name_search',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=60),
+        ),
+        migrations.RunPython(backfill_search_fields, migrations.RunPython.noop),
+        migrations.RunPython(search.install, search.uninstall),
+    ]
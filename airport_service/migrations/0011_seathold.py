@@ -0,0 +1,31 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('airport_service', '0010_search_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.IntegerField()),
+                ('seat', models.IntegerField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='airport_service.flight')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('row', 'seat'),
+                'unique_together': {('flight', 'row', 'seat')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0011_seathold'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['airplane', 'departure_time'], name='flight_airplane_departure_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def copy_flight_times(apps, schema_editor) -> None:
+    Flight = apps.get_model("airport_service", "Flight")
+    FlightCrew = apps.get_model("airport_service", "FlightCrew")
+    flights = Flight.objects.filter(pk=OuterRef("flight_id"))
+    FlightCrew.objects.update(
+        departure_time=Subquery(flights.values("departure_time")[:1]),
+        arrival_time=Subquery(flights.values("arrival_time")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0012_flight_airplane_departure_index'),
+    ]
+
+    operations = [
+        # Flight.crew keeps its table, now through an explicit model.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='FlightCrew',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('crew', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='airport_service.crew')),
+                        ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='airport_service.flight')),
+                    ],
+                    options={
+                        'db_table': 'airport_service_flight_crew',
+                        'unique_together': {('flight', 'crew')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='flight',
+                    name='crew',
+                    field=models.ManyToManyField(through='airport_service.FlightCrew', to='airport_service.crew'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='flightcrew',
+            name='departure_time',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='flightcrew',
+            name='arrival_time',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_flight_times, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='flightcrew',
+            index=models.Index(fields=['crew', 'departure_time'], name='flightcrew_crew_departure_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:54
+
+import airport_service.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0013_flightcrew'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('days_of_week', models.CharField(default='1234567', help_text='ISO weekdays the flight operates on, 1 is Monday.', max_length=7, validators=[airport_service.models.validate_days_of_week])),
+                ('departure', models.TimeField(help_text='Local departure time.')),
+                ('duration', models.DurationField()),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['route', 'departure'],
+            },
+        ),
+        migrations.AddField(
+            model_name='flightschedule',
+            name='airplane',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='airport_service.airplane'),
+        ),
+        migrations.AddField(
+            model_name='flightschedule',
+            name='route',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='airport_service.route'),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='flights', to='airport_service.flightschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=models.UniqueConstraint(fields=('schedule', 'departure_time'), name='flight_schedule_departure_unique'),
+        ),
+    ]
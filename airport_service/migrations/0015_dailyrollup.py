@@ -0,0 +1,39 @@
+# Generated by Django 4.2.3 on 2026-10-18 03:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0014_flightschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=60, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('flights', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('seats_sold', models.IntegerField(default=0)),
+                ('airplane_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='airport_service.airplanetype')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='airport_service.route')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['route', 'day'], name='dailyrollup_route_day_idx')],
+                'unique_together': {('day', 'route', 'airplane_type')},
+            },
+        ),
+    ]
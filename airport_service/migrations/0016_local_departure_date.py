@@ -0,0 +1,47 @@
+# Generated by Django 4.2.3 on 2026-10-18 03:18
+
+import airport_service.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+from airport_service import search
+
+
+def backfill_local_dates(apps, schema_editor) -> None:
+    # Airports have no time zone yet, all departures are in the server's.
+    Flight = apps.get_model("airport_service", "Flight")
+    Flight.objects.update(
+        departure_local_date=TruncDate(
+            "departure_time",
+            tzinfo=airport_service.models.zone(settings.TIME_ZONE),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_service', '0015_dailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airport',
+            name='timezone',
+            field=models.CharField(blank=True, default='', help_text="IANA time zone, ex. Europe/Kyiv; the server's if blank", max_length=64, validators=[airport_service.models.validate_timezone]),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='departure_local_date',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['departure_local_date', 'departure_time'], name='flight_local_date_idx'),
+        ),
+        migrations.RunPython(backfill_local_dates, migrations.RunPython.noop),
+        # SQLite remakes the airport table to add the column, dropping the
+        # text search triggers.
+        migrations.RunPython(search.install, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,12 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+
+from airport_service.seat_map import SeatMap
 
 
 class Crew(models.Model):
@@ -15,9 +21,38 @@ class Crew(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
+def zone(name: str) -> ZoneInfo:
+    """The IANA time zone, the server's one for a blank name"""
+    return ZoneInfo(name or settings.TIME_ZONE)
+
+
+def validate_timezone(value: str) -> None:
+    try:
+        zone(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"Unknown time zone: {value}.")
+
+
+def local_date(moment: datetime, timezone_name: str) -> date:
+    return moment.astimezone(zone(timezone_name)).date()
+
+
 class Airport(models.Model):
     name = models.CharField(max_length=60, unique=True)
     closest_big_city = models.CharField(max_length=60)
+    timezone = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        validators=[validate_timezone],
+        help_text="IANA time zone, ex. Europe/Kyiv; the server's if blank",
+    )
+    name_search = models.CharField(
+        max_length=60, db_index=True, editable=False, default=""
+    )
+    closest_big_city_search = models.CharField(
+        max_length=60, db_index=True, editable=False, default=""
+    )
 
     class Meta:
         ordering = ["name"]
@@ -40,7 +75,7 @@ class Route(models.Model):
         unique_together = ("source", "destination")
 
     def clean(self):
-        if self.source == self.destination:
+        if self.source_id == self.destination_id:
             raise ValidationError("Source and destination cannot be the same.")
         if self.distance <= 0:
             raise ValidationError("Distance should be greater than 0.")
@@ -55,6 +90,9 @@ class Route(models.Model):
 
 class AirplaneType(models.Model):
     airplane_type = models.CharField(max_length=60, unique=True)
+    airplane_type_search = models.CharField(
+        max_length=60, db_index=True, editable=False, default=""
+    )
 
     class Meta:
         ordering = ["airplane_type"]
@@ -80,21 +118,159 @@ class Airplane(models.Model):
         return self.airplane_name
 
 
+def validate_days_of_week(value: str) -> None:
+    if not value or set(value) - set("1234567"):
+        raise ValidationError(
+            "Days of week should be ISO weekday numbers, ex. 12345."
+        )
+
+
+class FlightSchedule(models.Model):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="schedules"
+    )
+    airplane = models.ForeignKey(
+        Airplane, on_delete=models.CASCADE, related_name="schedules"
+    )
+    days_of_week = models.CharField(
+        max_length=7,
+        default="1234567",
+        validators=[validate_days_of_week],
+        help_text="ISO weekdays the flight operates on, 1 is Monday.",
+    )
+    departure = models.TimeField(help_text="Local departure time.")
+    duration = models.DurationField()
+    valid_from = models.DateField()
+    valid_until = models.DateField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["route", "departure"]
+
+    def clean(self):
+        if self.duration is not None and self.duration.total_seconds() <= 0:
+            raise ValidationError("Duration should be greater than 0.")
+        if (
+            self.valid_until is not None
+            and self.valid_from is not None
+            and self.valid_until < self.valid_from
+        ):
+            raise ValidationError("Validity can't end before it starts.")
+
+    def runs_on(self, date) -> bool:
+        return (
+            self.valid_from <= date
+            and (self.valid_until is None or date <= self.valid_until)
+            and str(date.isoweekday()) in self.days_of_week
+        )
+
+    def __str__(self):
+        return f"{self.route} at {self.departure:%H:%M} ({self.days_of_week})"
+
+
 class Flight(models.Model):
     route = models.ForeignKey(Route, on_delete=models.CASCADE)
     airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE)
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    seats_sold = models.PositiveIntegerField(default=0, editable=False)
+    seat_map = models.BinaryField(default=b"", editable=False)
+    # In the source airport's time zone, stored so that flights of a day
+    # are an index lookup (see local_dates.py for bulk writes).
+    departure_local_date = models.DateField(null=True, editable=False)
+    schedule = models.ForeignKey(
+        FlightSchedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="flights",
+    )
 
-    crew = models.ManyToManyField(Crew)
+    crew = models.ManyToManyField(Crew, through="FlightCrew")
 
     class Meta:
         ordering = ["departure_time"]
+        indexes = [
+            models.Index(
+                fields=["airplane", "departure_time"],
+                name="flight_airplane_departure_idx",
+            ),
+            models.Index(
+                fields=["departure_local_date", "departure_time"],
+                name="flight_local_date_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["schedule", "departure_time"],
+                name="flight_schedule_departure_unique",
+            ),
+        ]
+
+    def get_seat_map(self) -> SeatMap:
+        return SeatMap(
+            self.airplane.rows, self.airplane.seats_in_row, self.seat_map
+        )
+
+    def source_timezone(self) -> str:
+        if Flight.route.is_cached(self) and Route.source.is_cached(
+            self.route
+        ):
+            return self.route.source.timezone
+        return (
+            Airport.objects.filter(source_routs__id=self.route_id)
+            .values_list("timezone", flat=True)
+            .first()
+            or ""
+        )
+
+    def save(self, *args, **kwargs):
+        departure_time = self._meta.get_field("departure_time").to_python(
+            self.departure_time
+        )
+        if departure_time is not None:
+            if timezone.is_naive(departure_time):
+                departure_time = timezone.make_aware(departure_time)
+            self.departure_local_date = local_date(
+                departure_time, self.source_timezone()
+            )
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {
+                *kwargs["update_fields"],
+                "departure_local_date",
+            }
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.route.source} to {self.route.destination}"
 
 
+class FlightCrew(models.Model):
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE)
+    crew = models.ForeignKey(Crew, on_delete=models.CASCADE)
+    # Copies of the flight's times, so that the duties of a crew member
+    # can be read in time order from one index (see roster.py).
+    departure_time = models.DateTimeField(null=True, editable=False)
+    arrival_time = models.DateTimeField(null=True, editable=False)
+
+    class Meta:
+        db_table = "airport_service_flight_crew"
+        unique_together = ("flight", "crew")
+        indexes = [
+            models.Index(
+                fields=["crew", "departure_time"],
+                name="flightcrew_crew_departure_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.departure_time = self.flight.departure_time
+        self.arrival_time = self.flight.arrival_time
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return f"{self.crew} on {self.flight}"
+
+
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -139,3 +315,81 @@ class Ticket(models.Model):
 
     def __str__(self) -> str:
         return f"{str(self.flight)} (row: {self.row}, seat: {self.seat})"
+
+
+class SeatHold(models.Model):
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        unique_together = ("flight", "row", "seat")
+        ordering = ("row", "seat")
+
+    def __str__(self) -> str:
+        return (
+            f"{str(self.flight)} (row: {self.row}, seat: {self.seat}) "
+            f"held until {self.expires_at}"
+        )
+
+
+class DailyRollup(models.Model):
+    """Flights, capacity and seats sold per day, route and airplane type"""
+
+    day = models.DateField()
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="+"
+    )
+    airplane_type = models.ForeignKey(
+        AirplaneType, on_delete=models.CASCADE, related_name="+"
+    )
+    flights = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(default=0)
+    seats_sold = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["day"]
+        unique_together = ("day", "route", "airplane_type")
+        indexes = [
+            models.Index(
+                fields=["route", "day"], name="dailyrollup_route_day_idx"
+            ),
+        ]
+
+    @property
+    def load_factor(self) -> float | None:
+        if not self.capacity:
+            return None
+        return self.seats_sold / self.capacity
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.route_id}/{self.airplane_type_id}"
+
+
+class RollupWatermark(models.Model):
+    """Highest id of a model accounted for by the rollup catch-up job"""
+
+    name = models.CharField(max_length=60, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.value}"
+
+
+class DataVersion(models.Model):
+    """
+    Token replaced when a kind of data changes, read by every worker
+    process to tell whether its in-memory copy of that data is current.
+    """
+
+    name = models.CharField(max_length=60, unique=True)
+    token = models.CharField(max_length=32)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.token}"
@@ -0,0 +1,160 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class OptionalCountLimitOffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination that skips COUNT(*) with ?count=false"""
+
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.count_query_param) != "false":
+            self.with_count = True
+            return super().paginate_queryset(queryset, request, view)
+
+        self.with_count = False
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    def get_next_link(self):
+        if self.with_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        if self.with_count:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on the whole `ordering`, which must end with a
+    unique column.
+
+    DRF's cursor filters on the first column only and skips the rows
+    sharing its value with an offset, which scans every tie again and
+    breaks down past `offset_cutoff` of them (many flights departing at
+    the same time). The position here holds the values of all columns
+    and pages are fetched with a (a > x) OR (a = x AND b > y) condition,
+    so a page never reads more than `page_size` + 1 rows.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = self.after(queryset, ordering, position)
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = True, position
+            self.has_previous = following is not None
+            self.previous_position = following
+        else:
+            self.has_next = following is not None
+            self.next_position = following
+            self.has_previous = position is not None
+            self.previous_position = position
+
+        if (self.has_previous or self.has_next) and self.template:
+            self.display_page_controls = True
+        return self.page
+
+    def after(self, queryset, ordering, position: str):
+        """Rows of `queryset` past `position` in the `ordering` direction"""
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(
+                ordering
+            ):
+                raise ValueError
+            condition = Q()
+            equal = Q()
+            for field, value in zip(ordering, values):
+                name = field.lstrip("-")
+                lookup = "lt" if field.startswith("-") else "gt"
+                condition |= equal & Q(**{f"{name}__{lookup}": value})
+                equal &= Q(**{name: value})
+            return queryset.filter(condition)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering) -> str:
+        return json.dumps(
+            [
+                str(
+                    instance[field.lstrip("-")]
+                    if isinstance(instance, dict)
+                    else getattr(instance, field.lstrip("-"))
+                )
+                for field in ordering
+            ]
+        )
+
+
+class FlightCursorPagination(KeysetCursorPagination):
+    ordering = ("departure_time", "id")
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+
+class OrderCursorPagination(KeysetCursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+
+def ordering_columns(pagination_class) -> list[str]:
+    """Columns a cursor paginator reads from `.values()` rows"""
+    ordering = getattr(pagination_class, "ordering", ())
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    return [field.lstrip("-") for field in ordering]
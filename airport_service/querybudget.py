@@ -0,0 +1,162 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+DEFAULTS = {
+    # Share of requests which are measured, keep it low in production.
+    "SAMPLE_RATE": 1.0,
+    # Raise QueryBudgetExceeded instead of logging a warning.
+    "RAISE": False,
+    # Same query shape repeated this many times is reported as N+1.
+    "REPEAT_THRESHOLD": 5,
+    # Budget of views which don't declare `query_budget`, None for none.
+    "DEFAULT_BUDGET": None,
+    # Add X-DB-Queries / X-DB-Time-Ms headers to measured responses.
+    "HEADERS": False,
+}
+
+
+def budget_settings() -> dict:
+    return {**DEFAULTS, **getattr(settings, "QUERY_BUDGET", {})}
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """
+    Counts queries and their total time on all DBs, and their repeated
+    shapes while `track_shapes` is set.
+    """
+
+    def __init__(self, track_shapes: bool = True) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.track_shapes = track_shapes
+        self.shapes = Counter()
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if self.track_shapes:
+                self.shapes[IN_LIST.sub("IN (...)", sql)] += 1
+
+    def __enter__(self) -> "QueryRecorder":
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (sql, count)
+            for sql, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+def resolve_view(request) -> tuple[str | None, type | None, str | None]:
+    """Route name, view class and viewset action of the request"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None, None, None
+    view = match.func
+    view_class = getattr(view, "cls", getattr(view, "view_class", None))
+    action = (getattr(view, "actions", None) or {}).get(request.method.lower())
+    return match.view_name, view_class, action
+
+
+def view_budget(request) -> tuple[str, int | None]:
+    """Name of the resolved view/action and its declared query budget"""
+    name, view_class, action = resolve_view(request)
+    default = budget_settings()["DEFAULT_BUDGET"]
+    budget = getattr(view_class, "query_budget", default)
+    if isinstance(budget, dict):
+        budget = budget.get(action, default)
+    return name or request.path, budget
+
+
+def check_budget(name: str, budget, recorder: QueryRecorder) -> None:
+    options = budget_settings()
+    problems = []
+    if budget is not None and recorder.count > budget:
+        problems.append(
+            f"{name} ran {recorder.count} queries, its budget is {budget}"
+        )
+    for sql, count in recorder.repeated(options["REPEAT_THRESHOLD"]):
+        problems.append(f"{name} repeated a query {count} times: {sql}")
+    if not problems:
+        return
+    if options["RAISE"]:
+        raise QueryBudgetExceeded("\n".join(problems))
+    for problem in problems:
+        logger.warning(problem)
+
+
+class QueryBudgetMiddleware:
+    """
+    Measures a sample of requests and reports N+1 patterns and views that
+    exceed the `query_budget` declared on them (an int, or a dict keyed by
+    viewset action).
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        options = budget_settings()
+        if random.random() >= options["SAMPLE_RATE"]:
+            return self.get_response(request)
+
+        # MetricsMiddleware already counts every request's queries, only
+        # sampled ones pay for the shapes.
+        recorder = getattr(request, "query_recorder", None)
+        if recorder is not None:
+            recorder.track_shapes = True
+            response = self.get_response(request)
+        else:
+            with QueryRecorder() as recorder:
+                response = self.get_response(request)
+        if options["HEADERS"]:
+            response["X-DB-Queries"] = str(recorder.count)
+            response["X-DB-Time-Ms"] = f"{recorder.duration * 1000:.2f}"
+        name, budget = view_budget(request)
+        check_budget(name, budget, recorder)
+        return response
+
+
+@contextmanager
+def assert_query_budget(max_queries: int | None = None, max_repeats=None):
+    """
+    Test helper: fail when the block runs more than `max_queries` queries
+    or repeats one query shape more than `max_repeats` times.
+    """
+    with QueryRecorder() as recorder:
+        yield recorder
+    problems = []
+    if max_queries is not None and recorder.count > max_queries:
+        problems.append(f"{recorder.count} queries, expected {max_queries}")
+    if max_repeats is not None:
+        for sql, count in recorder.repeated(max_repeats + 1):
+            problems.append(f"query repeated {count} times: {sql}")
+    if problems:
+        raise AssertionError("\n".join(problems))
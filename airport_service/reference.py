@@ -0,0 +1,118 @@
+import threading
+
+from django.conf import settings
+
+from airport_service import caching
+from airport_service.metrics import registry
+from airport_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Route,
+)
+
+# Models served from memory and the relations loaded along, so their
+# __str__ and the fields serializers read don't query.
+MODELS = {
+    Airport: (),
+    AirplaneType: (),
+    Airplane: ("type",),
+    Route: ("source", "destination"),
+}
+
+
+class ReferenceCache:
+    """
+    Per-process read-through cache of airports, airplane types, airplanes
+    and routes, which change a few times a day but are read by every
+    flight list and detail, and by the seat checks of tickets.
+
+    The process' copy is checked against a version token in the
+    database, read once per request and replaced by
+    caching.bump_references() when any of those models is written, and
+    the whole copy is dropped when it changed. Misses are fetched with
+    one query per lookup. Cached instances are shared between requests
+    and threads: read them, never modify or save them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.version = None
+        self.objects = {}
+
+    @property
+    def size(self) -> int:
+        return getattr(settings, "REFERENCE_CACHE_SIZE", 20000)
+
+    def current(self) -> dict:
+        version = caching.reference_version()
+        with self._lock:
+            if version != self.version:
+                self.objects = {}
+                self.version = version
+            return self.objects
+
+    def get_many(self, model, pks) -> dict:
+        """Instances of `model` by primary key, missing ones left out"""
+        copy = self.current()
+        pks = set(pks)
+        with self._lock:
+            objects = copy.setdefault(model, {})
+            found = {pk: objects[pk] for pk in pks if pk in objects}
+        missing = pks - found.keys()
+        if missing:
+            fetched = (
+                model.objects.select_related(*MODELS[model])
+                .order_by()
+                .in_bulk(missing)
+            )
+            if self.size:
+                with self._lock:
+                    if len(objects) + len(fetched) > self.size:
+                        objects.clear()
+                    objects.update(fetched)
+            found.update(fetched)
+        for result, count in (
+            ("hit", len(pks) - len(missing)),
+            ("miss", len(missing)),
+        ):
+            if count:
+                registry.inc(
+                    "airport_reference_cache_total",
+                    (("model", model._meta.model_name), ("result", result)),
+                    count,
+                )
+        return found
+
+    def get(self, model, pk):
+        try:
+            return self.get_many(model, [pk])[pk]
+        except KeyError:
+            raise model.DoesNotExist(
+                f"{model.__name__} matching query does not exist."
+            )
+
+    def attach(self, flights, names) -> None:
+        """
+        Set the `names` relations ("route", "airplane") of the flights which
+        aren't loaded yet from the cache, with one lookup per relation.
+        """
+        for name in names:
+            field = Flight._meta.get_field(name)
+            pending = [
+                flight for flight in flights if not field.is_cached(flight)
+            ]
+            if not pending:
+                continue
+            objects = self.get_many(
+                field.related_model,
+                {getattr(flight, field.attname) for flight in pending},
+            )
+            for flight in pending:
+                field.set_cached_value(
+                    flight, objects[getattr(flight, field.attname)]
+                )
+
+
+references = ReferenceCache()
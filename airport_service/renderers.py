@@ -0,0 +1,65 @@
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# Types orjson and msgpack don't encode (or encode differently from DRF)
+# go through the same encoder as JSONRenderer.
+default_encoder = encoders.JSONEncoder()
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer producing the same bytes with orjson, falls back to the
+    stdlib encoder when orjson isn't installed or indentation is asked.
+    """
+
+    options = (
+        (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+        if orjson
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        if data is None:
+            return b""
+
+        ret = orjson.dumps(
+            data, default=default_encoder.default, option=self.options
+        )
+        # Escaped by JSONRenderer for compatibility with javascript.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Renders the JSON data shape as MessagePack"""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=default_encoder.default, use_bin_type=True
+        )
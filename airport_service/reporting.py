@@ -0,0 +1,263 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from airport_service import caching, inventory
+from airport_service.models import (
+    DailyRollup,
+    Flight,
+    RollupWatermark,
+    Ticket,
+)
+
+BATCH_SIZE = 2000
+# Ids behind the high-water mark the catch-up job reads again: ids are
+# allocated on insert but become visible on commit, so a transaction
+# committing late adds rows below ids already read.
+OVERLAP = 1000
+
+ROLLUP_FIELDS = ("flights", "capacity", "seats_sold")
+
+# Catch-up job progress: watermark name and the flight, route and local
+# departure date lookups of the model's rows.
+WATERMARKS = (
+    (
+        "ticket",
+        Ticket,
+        "flight_id",
+        "flight__route_id",
+        "flight__departure_local_date",
+    ),
+    ("flight", Flight, "id", "route_id", "departure_local_date"),
+)
+
+
+def grouped(flights) -> Iterable[dict]:
+    """Rollup values of the flights per local day, route and airplane type"""
+    return (
+        flights.annotate(day=F("departure_local_date"))
+        .order_by()
+        .values("day", "route_id", airplane_type_id=F("airplane__type_id"))
+        .annotate(
+            flights=Count("id"),
+            capacity=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+            seats_sold=Sum("seats_sold"),
+        )
+    )
+
+
+def _rollup(values: dict) -> DailyRollup:
+    return DailyRollup(
+        day=values["day"],
+        route_id=values["route_id"],
+        airplane_type_id=values["airplane_type_id"],
+        **{field: values[field] or 0 for field in ROLLUP_FIELDS},
+    )
+
+
+def _save(rollups: list[DailyRollup]) -> None:
+    DailyRollup.objects.bulk_create(
+        rollups,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=("day", "route", "airplane_type"),
+        update_fields=ROLLUP_FIELDS,
+    )
+
+
+def refresh(days_and_routes: Iterable[tuple[date, int]]) -> None:
+    """
+    Recompute the rollups of (local day, route id) pairs from the flights.
+
+    Every airplane type of a pair is recomputed, so a flight moved to
+    another type's airplane leaves no stale row behind.
+    """
+    pairs = {pair for pair in days_and_routes if pair[0] is not None}
+    if pairs:
+        with transaction.atomic():
+            _refresh(pairs)
+
+
+def _refresh(pairs: set[tuple[date, int]]) -> None:
+    first = min(day for day, _ in pairs)
+    last = max(day for day, _ in pairs)
+    routes = {route_id for _, route_id in pairs}
+    found = [
+        _rollup(values)
+        for values in grouped(
+            Flight.objects.filter(
+                route_id__in=routes,
+                departure_local_date__gte=first,
+                departure_local_date__lte=last,
+            )
+        )
+        if (values["day"], values["route_id"]) in pairs
+    ]
+    kept = {
+        (rollup.day, rollup.route_id, rollup.airplane_type_id)
+        for rollup in found
+    }
+    stale = [
+        rollup_id
+        for rollup_id, *key in DailyRollup.objects.filter(
+            day__gte=first,
+            day__lte=last,
+            route_id__in=routes,
+        ).values_list("id", "day", "route_id", "airplane_type_id")
+        if tuple(key[:2]) in pairs and tuple(key) not in kept
+    ]
+    if stale:
+        DailyRollup.objects.filter(id__in=stale).delete()
+    _save(found)
+
+
+def days_and_routes(flights) -> set[tuple[date, int]]:
+    """Local days and routes of a queryset of flights"""
+    return set(flights.values_list("departure_local_date", "route_id"))
+
+
+def flights_changed(flights) -> None:
+    """Refresh the rollups of a queryset of flights"""
+    refresh(days_and_routes(flights))
+
+
+def tickets_changed(seats_by_flight: dict[int, int]) -> set[int]:
+    """
+    Add the number of seats sold (or released, if negative) per flight id.
+
+    Rollups are updated in place, the ones missing are recomputed.
+    Returns the ids of the flights' routes.
+    """
+    seats_by_flight = {
+        flight_id: seats
+        for flight_id, seats in seats_by_flight.items()
+        if seats
+    }
+    if not seats_by_flight:
+        return set()
+    seats_by_key = defaultdict(int)
+    for flight_id, day, route_id, airplane_type_id in (
+        Flight.objects.filter(id__in=seats_by_flight).values_list(
+            "id", "departure_local_date", "route_id", "airplane__type_id"
+        )
+    ):
+        seats_by_key[day, route_id, airplane_type_id] += seats_by_flight[
+            flight_id
+        ]
+    missing = set()
+    for (day, route_id, airplane_type_id), seats in seats_by_key.items():
+        updated = DailyRollup.objects.filter(
+            day=day, route_id=route_id, airplane_type_id=airplane_type_id
+        ).update(seats_sold=F("seats_sold") + seats)
+        if not updated:
+            missing.add((day, route_id))
+    refresh(missing)
+    return {route_id for _, route_id, _ in seats_by_key}
+
+
+def _catch_up_rows(rows) -> None:
+    """Account for (flight id, local day, route id) rows of new objects"""
+    # The seats sold counters the rollups sum are kept by signals too.
+    stale = {
+        flight_id
+        for flight_id, *_ in inventory.rebuild(
+            Flight.objects.filter(id__in={row[0] for row in rows})
+        )
+    }
+    refresh((day, route_id) for _, day, route_id in rows)
+    if stale:
+        caching.bump_flights(stale)
+        caching.bump_routes(
+            {route_id for flight_id, _, route_id in rows if flight_id in stale}
+        )
+
+
+def catch_up(batch_size: int = BATCH_SIZE, overlap: int = OVERLAP) -> int:
+    """
+    Account for tickets and flights created since the last run.
+
+    Bulk inserts don't send the signals which keep the seat maps, seats
+    sold and rollups up to date, so rows above the high-water mark of
+    every model are read in batches, the flights they belong to are
+    recounted and the days and routes they touch are recomputed, along
+    with the last `overlap` ids below the mark. Recomputing is idempotent,
+    rows the signals did handle are merely done twice. Returns the number
+    of rows read above the marks.
+    """
+    rows_read = 0
+    for name, model, flight, route, local_date in WATERMARKS:
+        watermark, _ = RollupWatermark.objects.get_or_create(name=name)
+        if watermark.value and overlap:
+            with transaction.atomic():
+                _catch_up_rows(
+                    set(
+                        model.objects.filter(
+                            id__gt=watermark.value - overlap,
+                            id__lte=watermark.value,
+                        ).values_list(flight, local_date, route)
+                    )
+                )
+        while True:
+            rows = list(
+                model.objects.filter(id__gt=watermark.value)
+                .order_by("id")
+                .values_list("id", flight, local_date, route)[:batch_size]
+            )
+            if not rows:
+                break
+            with transaction.atomic():
+                _catch_up_rows({tuple(row[1:]) for row in rows})
+                watermark.value = rows[-1][0]
+                watermark.save(update_fields=["value"])
+            rows_read += len(rows)
+    return rows_read
+
+
+@transaction.atomic
+def rebuild(start: date | None = None, end: date | None = None) -> int:
+    """
+    Recompute the rollups of local days from start to end, all by default.
+
+    Returns the number of rollups written.
+    """
+    flights = Flight.objects.all()
+    rollups = DailyRollup.objects.all()
+    if start is not None:
+        flights = flights.filter(departure_local_date__gte=start)
+        rollups = rollups.filter(day__gte=start)
+    if end is not None:
+        flights = flights.filter(departure_local_date__lte=end)
+        rollups = rollups.filter(day__lte=end)
+    rollups.delete()
+    found = [_rollup(values) for values in grouped(flights)]
+    _save(found)
+    if start is None and end is None:
+        for name, model, *_ in WATERMARKS:
+            last = model.objects.order_by("-id").values_list("id", flat=True)
+            RollupWatermark.objects.update_or_create(
+                name=name, defaults={"value": last.first() or 0}
+            )
+    return len(found)
+
+
+def report(rollups, group_by: Iterable[str]) -> list[dict]:
+    """Sums of the rollups per the group_by fields, with the load factor"""
+    group_by = list(group_by)
+    sums = {field: Sum(field) for field in ROLLUP_FIELDS}
+    if group_by:
+        rows = rollups.order_by(*group_by).values(*group_by).annotate(**sums)
+    else:
+        rows = [rollups.aggregate(**sums)]
+    result = []
+    for row in rows:
+        row = {**row, **{field: row[field] or 0 for field in ROLLUP_FIELDS}}
+        row["load_factor"] = (
+            round(row["seats_sold"] / row["capacity"], 4)
+            if row["capacity"]
+            else None
+        )
+        result.append(row)
+    return result
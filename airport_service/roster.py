@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+
+from airport_service.models import Crew, Flight, FlightCrew
+from airport_service.scheduling import in_window
+
+
+class Duty(NamedTuple):
+    crew_id: int
+    flight_id: int
+    departure_time: datetime
+    arrival_time: datetime
+
+
+def min_rest() -> timedelta:
+    return timedelta(minutes=getattr(settings, "CREW_MIN_REST_MINUTES", 600))
+
+
+def sync_times(flight_ids) -> None:
+    """Copy the times of the flights to their crew assignments"""
+    flights = Flight.objects.filter(pk=OuterRef("flight_id"))
+    FlightCrew.objects.filter(flight_id__in=list(flight_ids)).update(
+        departure_time=Subquery(flights.values("departure_time")[:1]),
+        arrival_time=Subquery(flights.values("arrival_time")[:1]),
+    )
+
+
+def roster(
+    crew_id: int, start: datetime, end: datetime, queryset=None
+) -> list[FlightCrew]:
+    """Assignments of the crew member in the air during [start, end)"""
+    if queryset is None:
+        queryset = FlightCrew.objects.all()
+    return in_window(queryset.filter(crew_id=crew_id), start, end)
+
+
+def batch_conflicts(duties: list[Duty], replaced=()) -> list[list[int]]:
+    """
+    Flights clashing with each duty, with two queries for the whole batch.
+
+    A crew member can't be on two flights at once and needs min_rest()
+    after landing before the next departure. Stored assignments of the
+    `replaced` flights are ignored.
+    """
+    if not duties:
+        return []
+    rest = min_rest()
+    crew_ids = {duty.crew_id for duty in duties}
+    start = min(duty.departure_time for duty in duties) - rest
+    end = max(duty.arrival_time for duty in duties) + rest
+
+    stored = FlightCrew.objects.filter(crew_id__in=crew_ids).exclude(
+        flight_id__in=replaced
+    )
+    by_crew = defaultdict(list)
+    for row in stored.filter(
+        departure_time__gte=start, departure_time__lt=end
+    ).values_list("crew_id", "flight_id", "departure_time", "arrival_time"):
+        by_crew[row[0]].append((Duty(*row), None))
+    previous = stored.filter(
+        crew_id=OuterRef("pk"), departure_time__lt=start
+    ).order_by("-departure_time")
+    last_duties = (
+        Crew.objects.filter(pk__in=crew_ids)
+        .annotate(
+            last_flight=Subquery(previous.values("flight_id")[:1]),
+            last_departure=Subquery(previous.values("departure_time")[:1]),
+            last_arrival=Subquery(previous.values("arrival_time")[:1]),
+        )
+        .order_by()
+        .values_list("pk", "last_flight", "last_departure", "last_arrival")
+    )
+    for row in last_duties:
+        if row[1] is not None:
+            by_crew[row[0]].append((Duty(*row), None))
+    for index, duty in enumerate(duties):
+        by_crew[duty.crew_id].append((duty, index))
+
+    result = [[] for _ in duties]
+    for crew_duties in by_crew.values():
+        crew_duties.sort(key=lambda item: item[0].departure_time)
+        # Sweep by departure, keeping the duties not rested from yet.
+        busy = []
+        for duty, index in crew_duties:
+            busy = [
+                item
+                for item in busy
+                if item[0].arrival_time + rest > duty.departure_time
+            ]
+            for other, other_index in busy:
+                if other.flight_id == duty.flight_id:
+                    continue
+                if index is not None:
+                    result[index].append(other.flight_id)
+                if other_index is not None:
+                    result[other_index].append(duty.flight_id)
+            busy.append((duty, index))
+    return [sorted(set(flight_ids)) for flight_ids in result]
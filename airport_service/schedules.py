@@ -0,0 +1,277 @@
+from datetime import date, datetime, timedelta
+from typing import Iterator, NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from airport_service import (
+    caching,
+    inventory,
+    reporting,
+    roster,
+    scheduling,
+)
+from airport_service.itineraries import flight_index
+from airport_service.models import (
+    Flight,
+    FlightCrew,
+    FlightSchedule,
+    Route,
+    SeatHold,
+    Ticket,
+    zone,
+)
+
+BATCH_SIZE = 2000
+
+SCHEDULED_FIELDS = (
+    "route_id",
+    "airplane_id",
+    "departure_time",
+    "arrival_time",
+)
+
+
+class Materialized(NamedTuple):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    # Flights differing from their schedule but sold or already departed.
+    kept: int = 0
+    # Occurrences skipped as the airplane is busy with another flight, or
+    # moves which would double-book the flight's crew or cut their rest.
+    conflicts: int = 0
+
+
+def occurrences(
+    schedule: FlightSchedule, first: date, last: date, tz=None
+) -> Iterator[tuple[date, datetime, datetime]]:
+    """
+    Local dates of [first, last] the schedule runs on, with times.
+
+    The departure is local to `tz`, the source airport's time zone, or the
+    current one by default.
+    """
+    day = max(first, schedule.valid_from)
+    if schedule.valid_until is not None:
+        last = min(last, schedule.valid_until)
+    while day <= last:
+        if str(day.isoweekday()) in schedule.days_of_week:
+            departure_time = timezone.make_aware(
+                datetime.combine(day, schedule.departure), tz
+            )
+            yield day, departure_time, departure_time + schedule.duration
+        day += timedelta(days=1)
+
+
+def materialize(schedules=None, days: int = 60, now=None) -> Materialized:
+    """
+    Bring the flights of the next `days` in line with the schedules.
+
+    A schedule's flight is matched to its occurrence by the local date of
+    departure. Missing flights are created, and future flights without
+    sold seats are moved, or deleted when the schedule no longer runs on
+    their date. Everything is read with one query and written in batches,
+    so re-running it over unchanged schedules is cheap.
+    """
+    now = now or timezone.now()
+    if schedules is None:
+        schedules = FlightSchedule.objects.all()
+    schedules = list(schedules)
+    zones = dict(
+        Route.objects.filter(
+            id__in={schedule.route_id for schedule in schedules}
+        ).values_list("id", "source__timezone")
+    )
+    # Today and the last day of the horizon at each schedule's airport.
+    windows = {}
+    for schedule in schedules:
+        tz = zone(zones.get(schedule.route_id, ""))
+        first = timezone.localdate(now, tz)
+        windows[schedule.id] = (tz, first, first + timedelta(days=days))
+
+    stored = {}
+    stale = []
+    # From the start of the day, so that moving a departure past "now"
+    # doesn't duplicate today's flight. Time zones differ by a day at most.
+    for flight in (
+        Flight.objects.filter(
+            schedule__in=schedules,
+            departure_local_date__gte=timezone.localdate(now)
+            - timedelta(days=1),
+        )
+        .order_by("departure_time")
+        .only(
+            "id",
+            "schedule_id",
+            "seats_sold",
+            "departure_local_date",
+            *SCHEDULED_FIELDS,
+        )
+    ):
+        key = (flight.schedule_id, flight.departure_local_date)
+        _, first, last = windows[flight.schedule_id]
+        if not first <= key[1] <= last:
+            continue
+        if key in stored:
+            stale.append(flight)
+        else:
+            stored[key] = flight
+
+    created = []
+    changed = []
+    kept = 0
+    for schedule in schedules:
+        tz, first, last = windows[schedule.id]
+        for day, departure_time, arrival_time in occurrences(
+            schedule, first, last, tz
+        ):
+            flight = stored.pop((schedule.id, day), None)
+            wanted = (
+                schedule.route_id,
+                schedule.airplane_id,
+                departure_time,
+                arrival_time,
+            )
+            if flight is None:
+                if departure_time >= now:
+                    created.append(
+                        Flight(
+                            schedule=schedule,
+                            route_id=schedule.route_id,
+                            airplane_id=schedule.airplane_id,
+                            departure_time=departure_time,
+                            arrival_time=arrival_time,
+                            departure_local_date=day,
+                        )
+                    )
+            elif wanted != tuple(
+                getattr(flight, field) for field in SCHEDULED_FIELDS
+            ):
+                if flight.seats_sold or flight.departure_time < now:
+                    kept += 1
+                else:
+                    changed.append((flight, wanted, day))
+
+    deleted = []
+    for flight in [*stored.values(), *stale]:
+        if flight.seats_sold or flight.departure_time < now:
+            kept += 1
+        else:
+            deleted.append(flight)
+    if deleted:
+        # Tickets inserted without signals leave seats_sold behind.
+        ticketed = set(
+            Ticket.objects.filter(
+                flight_id__in=[flight.id for flight in deleted]
+            ).values_list("flight_id", flat=True)
+        )
+        kept += len(ticketed)
+        deleted = [flight for flight in deleted if flight.id not in ticketed]
+    deleted_ids = [flight.id for flight in deleted]
+
+    with transaction.atomic():
+        if deleted:
+            # Without the per-flight delete signals, their work is done
+            # once for all the flights below. The flights have no tickets.
+            FlightCrew.objects.filter(flight_id__in=deleted_ids).delete()
+            SeatHold.objects.filter(flight_id__in=deleted_ids).delete()
+            flights = Flight.objects.filter(id__in=deleted_ids)
+            flights._raw_delete(flights.db)
+
+        intervals = [
+            scheduling.Interval(
+                flight.airplane_id,
+                flight.departure_time,
+                flight.arrival_time,
+            )
+            for flight in created
+        ] + [
+            scheduling.Interval(wanted[1], wanted[2], wanted[3], flight.id)
+            for flight, wanted, _ in changed
+        ]
+        clashing = {
+            index
+            for index, found in enumerate(
+                scheduling.batch_conflicts(intervals)
+            )
+            if found["flights"] or found["items"]
+        }
+        first_changed = len(created)
+        # Moved flights keep their crew, so re-check the crew's duties.
+        moved = {
+            flight.id: (index, wanted)
+            for index, (flight, wanted, _) in enumerate(
+                changed, first_changed
+            )
+            if index not in clashing
+        }
+        if moved:
+            duties = [
+                roster.Duty(crew_id, flight_id, *moved[flight_id][1][2:])
+                for crew_id, flight_id in FlightCrew.objects.filter(
+                    flight_id__in=list(moved)
+                ).values_list("crew_id", "flight_id")
+            ]
+            for duty, found in zip(
+                duties, roster.batch_conflicts(duties, replaced=list(moved))
+            ):
+                if found:
+                    clashing.add(moved[duty.flight_id][0])
+        created = [
+            flight
+            for index, flight in enumerate(created)
+            if index not in clashing
+        ]
+        updated = []
+        # Days and routes of the rollups to recompute, before and after.
+        rollups = {
+            (flight.departure_local_date, flight.route_id)
+            for flight in deleted
+        }
+        for index, (flight, wanted, day) in enumerate(
+            changed, first_changed
+        ):
+            if index in clashing:
+                continue
+            rollups.add((flight.departure_local_date, flight.route_id))
+            for field, value in zip(SCHEDULED_FIELDS, wanted):
+                setattr(flight, field, value)
+            flight.departure_local_date = day
+            updated.append(flight)
+
+        Flight.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        if updated:
+            Flight.objects.bulk_update(
+                updated,
+                [*SCHEDULED_FIELDS, "departure_local_date"],
+                batch_size=BATCH_SIZE,
+            )
+            updated_ids = [flight.id for flight in updated]
+            roster.sync_times(updated_ids)
+            # Unsold, but the layout may have changed with the airplane.
+            inventory.rebuild(Flight.objects.filter(id__in=updated_ids))
+        if created or updated or deleted:
+            rollups.update(
+                (flight.departure_local_date, flight.route_id)
+                for flight in created + updated
+            )
+            reporting.refresh(rollups)
+            caching.bump_generation()
+            flight_ids = [flight.id for flight in created + updated]
+            if deleted_ids:
+                transaction.on_commit(
+                    lambda: flight_index.remove_flights(deleted_ids)
+                )
+            if flight_ids:
+                transaction.on_commit(
+                    lambda: flight_index.update_flights(flight_ids)
+                )
+
+    return Materialized(
+        created=len(created),
+        updated=len(updated),
+        deleted=len(deleted),
+        kept=kept,
+        conflicts=len(clashing),
+    )
@@ -0,0 +1,114 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import NamedTuple
+
+from airport_service.models import Flight
+
+
+class Interval(NamedTuple):
+    airplane_id: int
+    departure_time: datetime
+    arrival_time: datetime
+    # The flight being rescheduled, ignored when looking for conflicts.
+    flight_id: int | None = None
+
+
+def in_window(queryset, start: datetime, end: datetime) -> list:
+    """
+    Rows of `queryset` between departure_time and arrival_time during
+    [start, end), for rows of one airplane or crew member.
+
+    Those don't overlap, so ordered by departure_time their arrival times
+    are increasing as well. The rows overlapping a window are then the ones
+    departing inside it plus at most the last one departing before it: two
+    range scans of a (owner, departure_time) index, however many years of
+    history there are.
+    """
+    previous = (
+        queryset.filter(departure_time__lt=start)
+        .order_by("-departure_time")
+        .first()
+    )
+    found = list(
+        queryset.filter(
+            departure_time__gte=start, departure_time__lt=end
+        ).order_by("departure_time")
+    )
+    if previous is not None and previous.arrival_time > start:
+        found.insert(0, previous)
+    return found
+
+
+def overlapping(
+    airplane_id: int,
+    start: datetime,
+    end: datetime,
+    exclude=(),
+    queryset=None,
+) -> list[Flight]:
+    """Flights of the airplane in the air during [start, end)"""
+    if queryset is None:
+        queryset = Flight.objects.all()
+    return in_window(
+        queryset.filter(airplane_id=airplane_id).exclude(pk__in=exclude),
+        start,
+        end,
+    )
+
+
+def conflicts(interval: Interval) -> list[Flight]:
+    return overlapping(
+        interval.airplane_id,
+        interval.departure_time,
+        interval.arrival_time,
+        exclude=[interval.flight_id] if interval.flight_id else (),
+    )
+
+
+def batch_conflicts(intervals: list[Interval]) -> list[dict]:
+    """
+    Conflicts of many intervals, with two queries per airplane.
+
+    Returns, aligned with `intervals`, dicts of the conflicting stored
+    flight ids ("flights") and indexes of other intervals ("items").
+    """
+    by_airplane = defaultdict(list)
+    for index, interval in enumerate(intervals):
+        by_airplane[interval.airplane_id].append(index)
+
+    result = [{"flights": [], "items": []} for _ in intervals]
+    for airplane_id, indexes in by_airplane.items():
+        batch = [intervals[index] for index in indexes]
+        moved = {item.flight_id for item in batch if item.flight_id}
+        stored = overlapping(
+            airplane_id,
+            min(item.departure_time for item in batch),
+            max(item.arrival_time for item in batch),
+            exclude=moved,
+        )
+        events = sorted(
+            [
+                (
+                    flight.departure_time,
+                    flight.arrival_time,
+                    "flights",
+                    flight.id,
+                )
+                for flight in stored
+            ]
+            + [
+                (item.departure_time, item.arrival_time, "items", index)
+                for index, item in zip(indexes, batch)
+            ]
+        )
+        # Sweep by departure, keeping what is still in the air.
+        in_air = []
+        for departure, arrival, kind, key in events:
+            in_air = [event for event in in_air if event[0] > departure]
+            for _, other_kind, other_key in in_air:
+                if kind == "items":
+                    result[key][other_kind].append(other_key)
+                if other_kind == "items":
+                    result[other_key][kind].append(key)
+            in_air.append((arrival, kind, key))
+    return result
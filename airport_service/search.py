@@ -0,0 +1,132 @@
+import unicodedata
+
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+
+# Text fields served by the search subsystem, per model. Each of them has a
+# normalized "<field>_search" column kept up to date on save.
+SEARCH_FIELDS = {
+    "airport_service.airport": ("name", "closest_big_city"),
+    "airport_service.airplanetype": ("airplane_type",),
+}
+
+# FTS5 trigram tokenizer and pg_trgm both need at least three characters.
+MIN_TRIGRAM_LENGTH = 3
+
+
+def normalize(value: str) -> str:
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.casefold().split())
+
+
+def search_column(field: str) -> str:
+    return f"{field}_search"
+
+
+def fts_table(db_table: str) -> str:
+    return f"{db_table}_fts"
+
+
+def update_search_fields(instance) -> None:
+    for field in SEARCH_FIELDS[instance._meta.label_lower]:
+        column = search_column(field)
+        max_length = instance._meta.get_field(column).max_length
+        setattr(
+            instance, column, normalize(getattr(instance, field))[:max_length]
+        )
+
+
+def text_search(model, field: str, term: str):
+    """
+    Subquery of ids of `model` rows whose `field` contains `term`.
+
+    Keeps the case-insensitive substring semantics of `__icontains`, but is
+    answered by the FTS5 trigram table on SQLite and by a pg_trgm GIN index
+    on PostgreSQL instead of a leading-wildcard scan.
+    """
+    term = normalize(term)
+    column = search_column(field)
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor == "sqlite" and len(term) >= MIN_TRIGRAM_LENGTH:
+        return RawSQL(
+            f"SELECT rowid FROM {fts_table(model._meta.db_table)} "
+            f"WHERE {column} MATCH %s",
+            ['"' + term.replace('"', '""') + '"'],
+        )
+    return model.objects.filter(**{f"{column}__contains": term}).values("id")
+
+
+def _sqlite_statements(db_table: str, columns: list[str]) -> list[str]:
+    table = fts_table(db_table)
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {table}({table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {table}(rowid, {column_list}) "
+        f"VALUES (new.id, {new_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+        f"{column_list}, content='{db_table}', content_rowid='id', "
+        f"tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {db_table} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {db_table} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE ON {db_table} "
+        f"BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    ]
+
+
+def _postgresql_statements(db_table: str, columns: list[str]) -> list[str]:
+    return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+        f"CREATE INDEX IF NOT EXISTS {db_table}_{column}_trgm "
+        f"ON {db_table} USING gin ({column} gin_trgm_ops)"
+        for column in columns
+    ]
+
+
+def install(apps, schema_editor) -> None:
+    """
+    Create (or repair) the text search structures of the database.
+
+    Idempotent, so migrations which remake a searchable table on SQLite
+    (dropping its triggers) can simply run it again.
+    """
+    vendor = schema_editor.connection.vendor
+    for label, fields in SEARCH_FIELDS.items():
+        model = apps.get_model(label)
+        columns = [search_column(field) for field in fields]
+        if vendor == "sqlite":
+            statements = _sqlite_statements(model._meta.db_table, columns)
+        elif vendor == "postgresql":
+            statements = _postgresql_statements(model._meta.db_table, columns)
+        else:
+            statements = []
+        for statement in statements:
+            schema_editor.execute(statement, params=None)
+
+
+def uninstall(apps, schema_editor) -> None:
+    vendor = schema_editor.connection.vendor
+    for label, fields in SEARCH_FIELDS.items():
+        db_table = apps.get_model(label)._meta.db_table
+        if vendor == "sqlite":
+            table = fts_table(db_table)
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(
+                    f"DROP TRIGGER IF EXISTS {table}_{suffix}"
+                )
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+        elif vendor == "postgresql":
+            for field in fields:
+                schema_editor.execute(
+                    f"DROP INDEX IF EXISTS "
+                    f"{db_table}_{search_column(field)}_trgm"
+                )
@@ -0,0 +1,60 @@
+import base64
+
+
+class SeatMap:
+    """Occupancy bitmap of a flight, one bit per seat in row-major order."""
+
+    def __init__(
+        self, rows: int, seats_in_row: int, data: bytes = b""
+    ) -> None:
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self.bits = bytearray(bytes(data)[:size].ljust(size, b"\x00"))
+
+    def _index(self, row: int, seat: int) -> int:
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+            raise IndexError(f"Seat ({row}, {seat}) is out of the airplane.")
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def is_taken(self, row: int, seat: int) -> bool:
+        index = self._index(row, seat)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def take(self, row: int, seat: int) -> None:
+        index = self._index(row, seat)
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def release(self, row: int, seat: int) -> None:
+        index = self._index(row, seat)
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def taken_seats(self):
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low_bit = byte & -byte
+                index = (byte_index << 3) + low_bit.bit_length() - 1
+                byte ^= low_bit
+                row, seat = divmod(index, self.seats_in_row)
+                yield row + 1, seat + 1
+
+    def count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.bits).decode("ascii")
+
+    def to_rle(self) -> list[list[int]]:
+        """Encode seats as [value, length] runs in row-major order."""
+        runs = []
+        for row in range(1, self.rows + 1):
+            for seat in range(1, self.seats_in_row + 1):
+                value = int(self.is_taken(row, seat))
+                if runs and runs[-1][0] == value:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([value, 1])
+        return runs
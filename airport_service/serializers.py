@@ -1,6 +1,26 @@
-from django.db import transaction
-from rest_framework import serializers
+import copy
+import operator
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import timedelta
+from functools import partial, reduce
+from operator import itemgetter
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.settings import api_settings
+from rest_framework.utils.field_mapping import get_unique_error_message
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+
+from airport_service import holds, inventory, roster, scheduling, search
+from airport_service.reference import references
+from airport_service.sparse import SparseFieldsetMixin
 from airport_service.models import (
     Crew,
     Airport,
@@ -8,41 +28,360 @@ from airport_service.models import (
     AirplaneType,
     Airplane,
     Flight,
+    FlightCrew,
     Ticket,
     Order,
 )
 
 
-class CrewSerializer(serializers.ModelSerializer):
+def datetime_formatter():
+    """DateTimeField().to_representation with the timezone resolved once"""
+    output_format = api_settings.DATETIME_FORMAT
+    if not (
+        settings.USE_TZ
+        and output_format
+        and output_format.lower() == ISO_8601
+    ):
+        return serializers.DateTimeField().to_representation
+    current_timezone = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if not value:
+            return None
+        value = value.astimezone(current_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+class FastListSerializer(serializers.ListSerializer):
+    """
+    Fast path of list views: a page of `.values()` rows selected by the
+    child's `rows()` is turned into output dicts by its `represent_rows()`
+    without per-field dispatch. Model instances use the regular fields.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            return self.child.represent_rows(data)
+        return super().to_representation(data)
+
+
+# Child of FastListSerializer. `row_columns` maps each output field to
+# the `.values()` columns it is built from, `row_renderer()` builds it.
+class FastRowsMixin(SparseFieldsetMixin):
+    row_columns = {}
+
+    def rows(self, queryset, extra_columns=()):
+        columns = list(extra_columns)
+        for name in self.fields:
+            if self.collapsed(name):
+                columns.append(name)
+            else:
+                columns.extend(self.row_columns.get(name, (name,)))
+        return queryset.values(*dict.fromkeys(columns))
+
+    def row_renderer(self, name: str, rows: list[dict], format_datetime):
+        if self.collapsed(name):
+            return itemgetter(name)
+        if isinstance(self.fields[name], serializers.DateTimeField):
+            return lambda row: format_datetime(row[name])
+        return itemgetter(*self.row_columns.get(name, (name,)))
+
+    def represent_rows(self, rows: list[dict]) -> list[dict]:
+        format_datetime = datetime_formatter()
+        renderers = [
+            (name, self.row_renderer(name, rows, format_datetime))
+            for name in self.fields
+        ]
+        return [
+            {name: render(row) for name, render in renderers} for row in rows
+        ]
+
+
+FLIGHT_ROW_FIELDS = (
+    "id",
+    "route",
+    "airplane",
+    "departure_time",
+    "arrival_time",
+)
+
+
+def flight_row(
+    row: dict, format_datetime, routes: dict, airplanes: dict, prefix=""
+) -> dict:
+    """
+    FlightListSerializer output from FLIGHT_ROW_FIELDS values, with the
+    routes and airplanes of the rows by id (see references.get_many()).
+    """
+    return {
+        "id": row[prefix + "id"],
+        "route": str(routes[row[prefix + "route"]]),
+        "airplane": str(airplanes[row[prefix + "airplane"]]),
+        "departure_time": format_datetime(row[prefix + "departure_time"]),
+        "arrival_time": format_datetime(row[prefix + "arrival_time"]),
+    }
+
+
+def prefetched_lookup(field, objects: dict, data):
+    if isinstance(data, bool):
+        field.fail("incorrect_type", data_type=type(data).__name__)
+    try:
+        return objects[int(data)]
+    except KeyError:
+        field.fail("does_not_exist", pk_value=data)
+    except (TypeError, ValueError):
+        field.fail("incorrect_type", data_type=type(data).__name__)
+
+
+def prefetch_related_fields(serializer, data: list) -> None:
+    """
+    Make the primary key fields of `serializer`, the child of a list
+    serializer, look up the objects of the whole `data` fetched at once.
+    """
+    for name, field in serializer.fields.items():
+        many = isinstance(field, serializers.ManyRelatedField)
+        relation = field.child_relation if many else field
+        if field.read_only or not isinstance(
+            relation, serializers.PrimaryKeyRelatedField
+        ):
+            continue
+        pks = set()
+        for item in data:
+            if not isinstance(item, Mapping):
+                continue
+            values = item.get(name)
+            if not many or not isinstance(values, list):
+                values = [values]
+            for value in values:
+                try:
+                    pks.add(int(value))
+                except (TypeError, ValueError):
+                    pass
+        relation.to_internal_value = partial(
+            prefetched_lookup, relation, relation.get_queryset().in_bulk(pks)
+        )
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validates and writes a batch of model objects with a fixed number of
+    queries.
+
+    Related objects are fetched once per field, unique fields and
+    unique_together sets are checked with one query each and the model's
+    clean() runs on unsaved instances. Every item is validated, errors are
+    returned as a list aligned with the input. For updates `instance` is
+    the list of objects to update, in the order of the data.
+    """
+
+    conflict_error = {
+        api_settings.NON_FIELD_ERRORS_KEY: [
+            "Some of the items have just been changed, try again."
+        ]
+    }
+
+    def to_internal_value(self, data):
+        # Leave the type and size checks of the whole list to DRF.
+        if (
+            not isinstance(data, list)
+            or not data
+            or (self.max_length is not None and len(data) > self.max_length)
+        ):
+            return super().to_internal_value(data)
+
+        prefetch_related_fields(self.child, data)
+        self.child.validators = [
+            validator
+            for validator in self.child.validators
+            if not isinstance(validator, UniqueTogetherValidator)
+        ]
+        for field in self.child.fields.values():
+            field.validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+
+        ret = []
+        errors = []
+        for item in data:
+            try:
+                ret.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                ret.append(None)
+                errors.append(exc.detail)
+            else:
+                errors.append({})
+
+        instances = self.instance or [None] * len(ret)
+        objects = [
+            None if attrs is None else self.build(instance, attrs)
+            for instance, attrs in zip(instances, ret)
+        ]
+        self.validate_clean(objects, errors)
+        self.validate_unique(objects, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return ret
+
+    def build(self, instance, attrs: dict):
+        if instance is None:
+            return self.child.Meta.model(**attrs)
+        instance = copy.copy(instance)
+        for name, value in attrs.items():
+            setattr(instance, name, value)
+        return instance
+
+    @staticmethod
+    def add_error(errors: list, index: int, key: str, message, code) -> None:
+        errors[index].setdefault(key, []).append(
+            ErrorDetail(str(message), code=code)
+        )
+
+    def validate_clean(self, objects: list, errors: list) -> None:
+        for index, instance in enumerate(objects):
+            if instance is None:
+                continue
+            try:
+                instance.clean()
+            except DjangoValidationError as error:
+                for message in error.messages:
+                    self.add_error(
+                        errors,
+                        index,
+                        api_settings.NON_FIELD_ERRORS_KEY,
+                        message,
+                        code="invalid",
+                    )
+
+    def validate_unique(self, objects: list, errors: list) -> None:
+        opts = self.child.Meta.model._meta
+        unique_sets = [
+            (field.name,)
+            for field in opts.fields
+            if field.unique and not field.primary_key
+        ]
+        unique_sets += [tuple(names) for names in opts.unique_together]
+        batch_pks = {
+            instance.pk for instance in objects if instance is not None
+        }
+
+        for names in unique_sets:
+            columns = [opts.get_field(name).attname for name in names]
+            keys = {
+                index: tuple(getattr(instance, column) for column in columns)
+                for index, instance in enumerate(objects)
+                if instance is not None
+            }
+            keys = {
+                index: key for index, key in keys.items() if None not in key
+            }
+            if not keys:
+                continue
+
+            # Narrowed down by the first column only: an OR of every key
+            # gets too deep for SQLite on big batches.
+            # Rows updated in this batch are checked against their new values.
+            taken = set(
+                opts.model.objects.filter(
+                    **{f"{columns[0]}__in": {key[0] for key in keys.values()}}
+                )
+                .exclude(pk__in=batch_pks - {None})
+                .values_list(*columns)
+            )
+
+            if len(names) == 1:
+                key_name = names[0]
+                message = get_unique_error_message(opts.get_field(key_name))
+            else:
+                key_name = api_settings.NON_FIELD_ERRORS_KEY
+                message = UniqueTogetherValidator.message.format(
+                    field_names=", ".join(names)
+                )
+            for index, key in keys.items():
+                if key in taken:
+                    self.add_error(errors, index, key_name, message, "unique")
+                taken.add(key)
+
+    def update_search_fields(self, objects: list) -> list[str]:
+        model = self.child.Meta.model
+        fields = search.SEARCH_FIELDS.get(model._meta.label_lower, ())
+        for instance in objects:
+            if fields:
+                search.update_search_fields(instance)
+        return [search.search_column(field) for field in fields]
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objects = [model(**attrs) for attrs in validated_data]
+        self.update_search_fields(objects)
+        try:
+            with transaction.atomic():
+                return model.objects.bulk_create(objects)
+        except IntegrityError:
+            raise serializers.ValidationError(self.conflict_error)
+
+    def update(self, instance, validated_data):
+        fields = set()
+        for item, attrs in zip(instance, validated_data):
+            for name, value in attrs.items():
+                setattr(item, name, value)
+            fields.update(attrs)
+        if fields:
+            fields.update(self.update_search_fields(instance))
+            try:
+                with transaction.atomic():
+                    self.child.Meta.model.objects.bulk_update(
+                        instance, sorted(fields)
+                    )
+            except IntegrityError:
+                raise serializers.ValidationError(self.conflict_error)
+        return instance
+
+
+class CrewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Crew
         fields = ("id", "first_name", "last_name")
 
 
-class AirportSerializer(serializers.ModelSerializer):
+class AirportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ("id", "name", "closest_big_city")
+        fields = ("id", "name", "closest_big_city", "timezone")
 
 
-class RouteSerializer(serializers.ModelSerializer):
+class RouteSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Route
         fields = ("id", "source", "destination", "distance")
 
 
-class RouteListSerializer(RouteSerializer):
+class RouteListSerializer(FastRowsMixin, RouteSerializer):
     source = serializers.StringRelatedField(many=False, read_only=True)
     destination = serializers.StringRelatedField(many=False, read_only=True)
 
+    expandable_fields = ("source", "destination")
+    row_columns = {
+        "source": ("source__name",),
+        "destination": ("destination__name",),
+    }
+
+    class Meta(RouteSerializer.Meta):
+        list_serializer_class = FastListSerializer
 
-class AirplaneTypeSerializer(serializers.ModelSerializer):
+
+class AirplaneTypeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AirplaneType
         fields = ("id", "airplane_type")
 
 
-class AirplaneSerializer(serializers.ModelSerializer):
+class AirplaneSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Airplane
         fields = ("id", "airplane_name", "type", "rows", "seats_in_row")
@@ -51,12 +390,44 @@ class AirplaneSerializer(serializers.ModelSerializer):
 class AirplaneListSerializer(AirplaneSerializer):
     type = serializers.StringRelatedField(many=False, read_only=True)
 
+    expandable_fields = ("type",)
+
     class Meta:
         model = Airplane
         fields = ("id", "airplane_name", "type", "capacity")
 
 
-class FlightSerializer(serializers.ModelSerializer):
+class FlightBatchSerializer(serializers.ListSerializer):
+    """
+    Validates a list of flights, checking the airplane schedules of the
+    whole batch with two queries per airplane instead of per flight.
+    """
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        found = scheduling.batch_conflicts(
+            [self.child.interval(item) for item in attrs]
+        )
+        errors = []
+        for conflicts in found:
+            messages = []
+            if conflicts["flights"]:
+                messages.append(
+                    self.child.conflict_message(conflicts["flights"])
+                )
+            if conflicts["items"]:
+                items = ", ".join(map(str, conflicts["items"]))
+                messages.append(
+                    "The airplane is scheduled at that time by the items: "
+                    f"{items}."
+                )
+            errors.append({"airplane": messages} if messages else {})
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class FlightSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Flight
         fields = (
@@ -66,13 +437,278 @@ class FlightSerializer(serializers.ModelSerializer):
             "departure_time",
             "arrival_time",
         )
+        list_serializer_class = FlightBatchSerializer
+
+    def interval(self, attrs) -> scheduling.Interval:
+        def value(name):
+            if name in attrs:
+                return attrs[name]
+            return getattr(self.instance, name, None)
+
+        return scheduling.Interval(
+            value("airplane").id,
+            value("departure_time"),
+            value("arrival_time"),
+            getattr(self.instance, "id", None),
+        )
+
+    @staticmethod
+    def conflict_message(flight_ids) -> str:
+        return (
+            "The airplane is already scheduled at that time on the flights: "
+            f"{', '.join(map(str, flight_ids))}."
+        )
+
+    def validate(self, attrs):
+        data = super(FlightSerializer, self).validate(attrs)
+        interval = self.interval(attrs)
+        if interval.arrival_time <= interval.departure_time:
+            raise serializers.ValidationError(
+                {"arrival_time": "Arrival should be after the departure."}
+            )
+        if not isinstance(self.parent, FlightBatchSerializer):
+            conflicts = scheduling.conflicts(interval)
+            if conflicts:
+                raise serializers.ValidationError(
+                    {
+                        "airplane": self.conflict_message(
+                            flight.id for flight in conflicts
+                        )
+                    }
+                )
+        if self.instance is not None and (
+            interval.departure_time != self.instance.departure_time
+            or interval.arrival_time != self.instance.arrival_time
+        ):
+            self.validate_crew_rest(interval)
+        return data
+
+    def validate_crew_rest(self, interval: scheduling.Interval) -> None:
+        duties = [
+            roster.Duty(
+                crew_id,
+                self.instance.id,
+                interval.departure_time,
+                interval.arrival_time,
+            )
+            for crew_id in FlightCrew.objects.filter(
+                flight=self.instance
+            ).values_list("crew_id", flat=True)
+        ]
+        errors = [
+            crew_conflict_message(duty.crew_id, flight_ids)
+            for duty, flight_ids in zip(
+                duties,
+                roster.batch_conflicts(duties, replaced=[self.instance.id]),
+            )
+            if flight_ids
+        ]
+        if errors:
+            raise serializers.ValidationError({"departure_time": errors})
+
+
+def crew_conflict_message(crew_id: int, flight_ids) -> str:
+    return (
+        f"Crew member {crew_id} is on the flights "
+        f"{', '.join(map(str, flight_ids))} at that time or without the "
+        "minimum rest."
+    )
+
+
+class CrewAssignmentBatchSerializer(serializers.ListSerializer):
+    """
+    Validates the crews of many flights at once: objects are fetched once
+    for the whole batch and the crew double-booking and rest checks take
+    two queries, counting the other flights of the batch.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            prefetch_related_fields(self.child, data)
+        attrs = super().to_internal_value(data)
+
+        errors = [{} for _ in attrs]
+        flight_ids = set()
+        duties = []
+        owners = []
+        for index, item in enumerate(attrs):
+            flight = item["flight"]
+            if flight.id in flight_ids:
+                errors[index]["flight"] = ["Duplicate flight."]
+                continue
+            flight_ids.add(flight.id)
+            for crew in dict.fromkeys(item["crew"]):
+                duties.append(
+                    roster.Duty(
+                        crew.id,
+                        flight.id,
+                        flight.departure_time,
+                        flight.arrival_time,
+                    )
+                )
+                owners.append(index)
+
+        found = roster.batch_conflicts(duties, replaced=flight_ids)
+        for duty, index, conflicts in zip(duties, owners, found):
+            if conflicts:
+                errors[index].setdefault("crew", []).append(
+                    crew_conflict_message(duty.crew_id, conflicts)
+                )
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        FlightCrew.objects.filter(
+            flight__in=[item["flight"] for item in validated_data]
+        ).delete()
+        FlightCrew.objects.bulk_create(
+            [
+                FlightCrew(
+                    flight=item["flight"],
+                    crew=crew,
+                    departure_time=item["flight"].departure_time,
+                    arrival_time=item["flight"].arrival_time,
+                )
+                for item in validated_data
+                for crew in dict.fromkeys(item["crew"])
+            ]
+        )
+        return validated_data
+
+
+class CrewAssignmentSerializer(serializers.Serializer):
+    flight = serializers.PrimaryKeyRelatedField(queryset=Flight.objects.all())
+    crew = serializers.PrimaryKeyRelatedField(
+        queryset=Crew.objects.all(), many=True
+    )
+
+    class Meta:
+        list_serializer_class = CrewAssignmentBatchSerializer
+
+
+class AirplaneTimelineSerializer(serializers.ModelSerializer):
+    route = serializers.StringRelatedField(read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = ("id", "route", "departure_time", "arrival_time")
+
+
+class CrewDutySerializer(serializers.ModelSerializer):
+    route = serializers.StringRelatedField(source="flight.route")
+    airplane = serializers.StringRelatedField(source="flight.airplane")
+
+    class Meta:
+        model = FlightCrew
+        fields = (
+            "flight",
+            "route",
+            "airplane",
+            "departure_time",
+            "arrival_time",
+        )
+
+
+class AirplaneTimelineSearchSerializer(serializers.Serializer):
+    start = serializers.DateTimeField(
+        required=False, help_text="Window start, now by default"
+    )
+    end = serializers.DateTimeField(
+        required=False, help_text="Window end, 30 days after start by default"
+    )
+
+    MAX_DAYS = 366
+
+    def validate(self, attrs):
+        start = attrs.setdefault("start", timezone.now())
+        end = attrs.setdefault("end", start + timedelta(days=30))
+        if end <= start:
+            raise serializers.ValidationError(
+                {"end": "Should be after the start."}
+            )
+        if end - start > timedelta(days=self.MAX_DAYS):
+            raise serializers.ValidationError(
+                {"end": f"At most {self.MAX_DAYS} days after the start."}
+            )
+        return attrs
+
+
+class CrewRosterSearchSerializer(serializers.Serializer):
+    MAX_DAYS = 366
 
+    # "from" is a keyword, so the fields can't be declared as attributes.
+    def get_fields(self):
+        return {
+            "from": serializers.DateTimeField(
+                required=False, help_text="Roster start, now by default"
+            ),
+            "to": serializers.DateTimeField(
+                required=False,
+                help_text="Roster end, 7 days after start by default",
+            ),
+        }
 
-class FlightListSerializer(FlightSerializer):
+    def validate(self, attrs):
+        start = attrs.setdefault("from", timezone.now())
+        end = attrs.setdefault("to", start + timedelta(days=7))
+        if end <= start:
+            raise serializers.ValidationError(
+                {"to": "Should be after the start."}
+            )
+        if end - start > timedelta(days=self.MAX_DAYS):
+            raise serializers.ValidationError(
+                {"to": f"At most {self.MAX_DAYS} days after the start."}
+            )
+        return attrs
+
+
+class ManifestSearchSerializer(serializers.Serializer):
+    # Not "format", DRF picks the renderer by that parameter.
+    export = serializers.ChoiceField(
+        choices=("csv", "ndjson"),
+        default="csv",
+        help_text="CSV, or JSON lines with one ticket per line",
+    )
+
+
+class DayManifestSearchSerializer(ManifestSearchSerializer):
+    date = serializers.DateField(
+        help_text="Departure date, local to the source airport"
+    )
+
+
+class RouteCalendarSearchSerializer(serializers.Serializer):
+    month = serializers.DateField(
+        input_formats=["%Y-%m"],
+        required=False,
+        help_text="Month as YYYY-MM, the current one by default",
+    )
+
+    def validate(self, attrs):
+        attrs.setdefault("month", timezone.localdate())
+        attrs["month"] = attrs["month"].replace(day=1)
+        return attrs
+
+
+class RouteCalendarPairSearchSerializer(RouteCalendarSearchSerializer):
+    source = serializers.IntegerField(help_text="Departure airport id")
+    destination = serializers.IntegerField(help_text="Arrival airport id")
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField(read_only=True)
+    flights = serializers.IntegerField(read_only=True)
+    seats_available = serializers.IntegerField(read_only=True)
+
+
+class FlightListSerializer(FastRowsMixin, FlightSerializer):
     airplane = serializers.StringRelatedField(many=False, read_only=True)
     route = serializers.StringRelatedField(many=False, read_only=True)
     tickets_available = serializers.IntegerField(read_only=True)
 
+    expandable_fields = ("route", "airplane")
+
     class Meta:
         model = Flight
         fields = (
@@ -83,26 +719,146 @@ class FlightListSerializer(FlightSerializer):
             "arrival_time",
             "tickets_available",
         )
+        list_serializer_class = FastListSerializer
+
+    def row_renderer(self, name: str, rows: list[dict], format_datetime):
+        # Rows hold the ids, the names come from the reference cache.
+        if name in ("route", "airplane") and not self.collapsed(name):
+            model = Route if name == "route" else Airplane
+            objects = references.get_many(model, {row[name] for row in rows})
+            return lambda row: str(objects[row[name]])
+        return super().row_renderer(name, rows, format_datetime)
+
+
+class BatchFlightField(serializers.PrimaryKeyRelatedField):
+    """Resolves flights prefetched by TicketBatchSerializer when in a batch"""
+
+    def to_internal_value(self, data):
+        flights = getattr(self.parent.parent, "flights", None)
+        if flights is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return flights[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class TicketBatchSerializer(serializers.ListSerializer):
+    """
+    Validates a list of tickets with a fixed number of queries.
+
+    Flights are fetched once for the whole batch (their airplanes come
+    from the reference cache) and seat uniqueness is checked with one query
+    against existing tickets, instead of a flight lookup and an
+    UniqueTogetherValidator query per ticket.
+    """
+
+    def to_internal_value(self, data):
+        flight_ids = set()
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, Mapping):
+                    try:
+                        flight_ids.add(int(item.get("flight")))
+                    except (TypeError, ValueError):
+                        pass
+        self.flights = Flight.objects.in_bulk(flight_ids)
+        attrs = super().to_internal_value(data)
+        self.validate_unique_seats(attrs)
+        return attrs
+
+    def validate_unique_seats(self, attrs) -> None:
+        seats = [
+            (item["flight"].id, item["row"], item["seat"]) for item in attrs
+        ]
+        taken = set()
+        if seats:
+            taken = set(
+                Ticket.objects.filter(
+                    reduce(
+                        operator.or_,
+                        (
+                            Q(flight_id=flight_id, row=row, seat=seat)
+                            for flight_id, row, seat in seats
+                        ),
+                    )
+                ).values_list("flight_id", "row", "seat")
+            )
+
+        seats_by_flight = {}
+        for flight_id, row, seat in seats:
+            seats_by_flight.setdefault(flight_id, []).append((row, seat))
+        held = {}
+        store = holds.get_store()
+        for flight_id, flight_seats in seats_by_flight.items():
+            for (row, seat), user_id in store.holders(
+                flight_id, flight_seats
+            ).items():
+                held[(flight_id, row, seat)] = user_id
+        request = self.context.get("request")
+        user_id = request.user.id if request else None
+
+        errors = []
+        for seat in seats:
+            if seat in taken:
+                errors.append(
+                    self.seat_error(
+                        UniqueTogetherValidator.message.format(
+                            field_names="flight, row, seat"
+                        ),
+                        code="unique",
+                    )
+                )
+            elif held.get(seat, user_id) != user_id:
+                errors.append(
+                    self.seat_error(
+                        "The seat is held by another customer.", code="held"
+                    )
+                )
+            else:
+                errors.append({})
+            taken.add(seat)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+    @staticmethod
+    def seat_error(message: str, code: str) -> dict:
+        return {
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                ErrorDetail(message, code=code)
+            ]
+        }
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    flight = BatchFlightField(queryset=Flight.objects.all())
+
+    def get_validators(self):
+        if isinstance(self.parent, TicketBatchSerializer):
+            return []
+        return super(TicketSerializer, self).get_validators()
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs)
-        if not (1 <= attrs["row"] <= attrs["flight"].airplane.rows):
+        airplane = references.get(Airplane, attrs["flight"].airplane_id)
+        if not (1 <= attrs["row"] <= airplane.rows):
             raise serializers.ValidationError(
-                f"row should be in range:"
-                f" [1, {attrs['flight'].airplane.rows}]"
+                f"row should be in range: [1, {airplane.rows}]"
             )
-        if not (1 <= attrs["seat"] <= attrs["flight"].airplane.seats_in_row):
+        if not (1 <= attrs["seat"] <= airplane.seats_in_row):
             raise serializers.ValidationError(
-                f"seat should be in range:"
-                f" [1, {attrs['flight'].airplane.seats_in_row}]"
+                f"seat should be in range: [1, {airplane.seats_in_row}]"
             )
         return data
 
     class Meta:
         model = Ticket
         fields = ("id", "flight", "row", "seat")
+        list_serializer_class = TicketBatchSerializer
 
 
 class TicketListSerializer(TicketSerializer):
@@ -115,7 +871,7 @@ class TicketSeatsSerializer(TicketSerializer):
         fields = ("row", "seat")
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
 
     class Meta:
@@ -126,22 +882,90 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data) -> Order:
         tickets_data = validated_data.pop("tickets")
         order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+        try:
+            with transaction.atomic():
+                tickets = Ticket.objects.bulk_create(
+                    [
+                        Ticket(order=order, **ticket_data)
+                        for ticket_data in tickets_data
+                    ]
+                )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"tickets": ["Some of the seats have just been sold."]}
+            )
+        inventory.tickets_created(tickets)
+
+        store = holds.get_store()
+        for flight_id, seats in inventory.seats_by_flight(tickets).items():
+            store.release(flight_id, order.user_id, seats)
         return order
 
 
-class OrderListSerializer(OrderSerializer):
+class OrderListSerializer(FastRowsMixin, OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
 
+    row_columns = {"tickets": ("id",)}
+
+    class Meta(OrderSerializer.Meta):
+        list_serializer_class = FastListSerializer
+
+    def row_renderer(self, name: str, rows: list[dict], format_datetime):
+        if name == "tickets":
+            tickets = self.page_tickets(rows, format_datetime)
+            return lambda row: tickets[row["id"]]
+        return super().row_renderer(name, rows, format_datetime)
+
+    @staticmethod
+    def page_tickets(rows: list[dict], format_datetime) -> dict:
+        # Flights of tickets aren't annotated with tickets_available, so
+        # like TicketListSerializer the field is left out.
+        ticket_rows = Ticket.objects.filter(
+            order_id__in=[order["id"] for order in rows]
+        ).values(
+            "id",
+            "order_id",
+            "row",
+            "seat",
+            *(f"flight__{field}" for field in FLIGHT_ROW_FIELDS),
+        )
+        routes = references.get_many(
+            Route, {row["flight__route"] for row in ticket_rows}
+        )
+        airplanes = references.get_many(
+            Airplane, {row["flight__airplane"] for row in ticket_rows}
+        )
+        tickets = defaultdict(list)
+        for row in ticket_rows:
+            tickets[row["order_id"]].append(
+                {
+                    "id": row["id"],
+                    "flight": flight_row(
+                        row, format_datetime, routes, airplanes, "flight__"
+                    ),
+                    "row": row["row"],
+                    "seat": row["seat"],
+                }
+            )
+        return tickets
+
+
+class FlightDetailBatchSerializer(serializers.ListSerializer):
+    """Attaches routes and airplanes of all the flights at once"""
+
+    def to_representation(self, data):
+        flights = list(data)
+        references.attach(flights, self.child.references())
+        return super().to_representation(flights)
+
 
 class FlightDetailSerializer(FlightSerializer):
     airplane = AirplaneListSerializer(many=False, read_only=True)
     route = RouteListSerializer(many=False, read_only=True)
     crew = serializers.StringRelatedField(many=True, read_only=True)
-    taken_seats = TicketSeatsSerializer(
-        source="tickets", many=True, read_only=True
-    )
+    taken_seats = serializers.SerializerMethodField()
+
+    expandable_fields = ("route", "airplane", "crew")
 
     class Meta:
         model = Flight
@@ -154,3 +978,165 @@ class FlightDetailSerializer(FlightSerializer):
             "crew",
             "taken_seats",
         )
+        list_serializer_class = FlightDetailBatchSerializer
+
+    def references(self) -> list[str]:
+        """Relations of the flight read by the selected fields"""
+        names = [
+            name
+            for name in ("route", "airplane")
+            if name in self.fields and not self.collapsed(name)
+        ]
+        if "taken_seats" in self.fields and "airplane" not in names:
+            names.append("airplane")
+        return names
+
+    def to_representation(self, instance):
+        references.attach([instance], self.references())
+        return super().to_representation(instance)
+
+    @extend_schema_field(TicketSeatsSerializer(many=True))
+    def get_taken_seats(self, obj: Flight) -> list[dict]:
+        return [
+            {"row": row, "seat": seat}
+            for row, seat in obj.get_seat_map().taken_seats()
+        ]
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+
+class FlightSeatMapSerializer(serializers.ModelSerializer):
+    ENCODINGS = ("base64", "rle")
+
+    rows = serializers.IntegerField(source="airplane.rows", read_only=True)
+    seats_in_row = serializers.IntegerField(
+        source="airplane.seats_in_row", read_only=True
+    )
+    encoding = serializers.SerializerMethodField()
+    seats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "rows",
+            "seats_in_row",
+            "seats_sold",
+            "encoding",
+            "seats",
+        )
+
+    def get_encoding(self, obj: Flight) -> str:
+        return self.context.get("encoding", "base64")
+
+    @extend_schema_field(serializers.JSONField())
+    def get_seats(self, obj: Flight):
+        seat_map = obj.get_seat_map()
+        if self.get_encoding(obj) == "rle":
+            return seat_map.to_rle()
+        return seat_map.to_base64()
+
+
+class ItinerarySerializer(serializers.Serializer):
+    stops = serializers.IntegerField(read_only=True)
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+    distance = serializers.IntegerField(read_only=True)
+    flights = FlightListSerializer(many=True, read_only=True)
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField(help_text="Departure airport id")
+    destination = serializers.IntegerField(help_text="Arrival airport id")
+    date = serializers.DateField(help_text="Date of the first departure")
+    max_stops = serializers.IntegerField(min_value=0, max_value=2, default=2)
+    min_connection = serializers.IntegerField(
+        min_value=0, default=60, help_text="Minimum connection, minutes"
+    )
+    max_connection = serializers.IntegerField(
+        min_value=1, default=24 * 60, help_text="Maximum connection, minutes"
+    )
+    sort = serializers.ChoiceField(
+        choices=("arrival", "distance"), default="arrival"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=5)
+
+    def validate(self, attrs):
+        data = super(ItinerarySearchSerializer, self).validate(attrs)
+        if attrs["source"] == attrs["destination"]:
+            raise serializers.ValidationError(
+                "Source and destination cannot be the same."
+            )
+        if attrs["min_connection"] > attrs["max_connection"]:
+            raise serializers.ValidationError(
+                "min_connection cannot be greater than max_connection."
+            )
+        return data
+
+
+class LoadFactorSerializer(serializers.Serializer):
+    # Rows have only the fields they are grouped by, the others are skipped.
+    day = serializers.DateField(read_only=True)
+    route = serializers.IntegerField(read_only=True)
+    airplane_type = serializers.IntegerField(read_only=True)
+    flights = serializers.IntegerField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True)
+    seats_sold = serializers.IntegerField(read_only=True)
+    load_factor = serializers.FloatField(read_only=True, allow_null=True)
+
+
+class LoadFactorSearchSerializer(serializers.Serializer):
+    GROUP_BY = ("day", "route", "airplane_type")
+    MAX_DAYS = 366
+
+    start = serializers.DateField(
+        required=False, help_text="First day, 30 days before end by default"
+    )
+    end = serializers.DateField(
+        required=False, help_text="Last day, today by default"
+    )
+    group_by = serializers.CharField(
+        default="day,route,airplane_type",
+        allow_blank=True,
+        help_text=(
+            "Comma separated day, route and airplane_type, "
+            "blank for totals"
+        ),
+    )
+    route = serializers.IntegerField(required=False, help_text="Route id")
+    airplane_type = serializers.IntegerField(
+        required=False, help_text="Airplane type id"
+    )
+
+    def validate_group_by(self, value: str) -> list[str]:
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        unknown = set(fields) - set(self.GROUP_BY)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(sorted(unknown))}."
+            )
+        return [field for field in self.GROUP_BY if field in fields]
+
+    def validate(self, attrs):
+        end = attrs.setdefault("end", timezone.localdate())
+        start = attrs.setdefault("start", end - timedelta(days=30))
+        if end < start:
+            raise serializers.ValidationError(
+                {"end": "Should not be before the start."}
+            )
+        # Other groupings are bounded by the number of routes and types.
+        if "day" in attrs["group_by"] and (
+            end - start >= timedelta(days=self.MAX_DAYS)
+        ):
+            raise serializers.ValidationError(
+                {"end": f"At most {self.MAX_DAYS} days when grouped by day."}
+            )
+        return attrs
@@ -0,0 +1,200 @@
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_save,
+    post_delete,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from airport_service import (
+    caching,
+    inventory,
+    local_dates,
+    reporting,
+    roster,
+    search,
+)
+from airport_service.itineraries import flight_index
+from airport_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Route,
+    Ticket,
+)
+
+
+@receiver(request_started)
+def request_started_versions(sender, **kwargs) -> None:
+    # Data versions are read again by every request.
+    caching.start_request()
+
+
+@receiver(request_finished)
+def request_finished_versions(sender, **kwargs) -> None:
+    caching.finish_request()
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_created(sender, instance, created, **kwargs) -> None:
+    if created:
+        inventory.tickets_created([instance])
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs) -> None:
+    inventory.tickets_deleted([instance])
+
+
+@receiver(post_save, sender=Flight)
+def flight_changed(sender, instance, created, raw, **kwargs) -> None:
+    # The seat map layout depends on the airplane, which may have changed.
+    if not created and not raw:
+        inventory.rebuild(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Airplane)
+def airplane_changed(sender, instance, created, raw, **kwargs) -> None:
+    if not created and not raw:
+        inventory.rebuild(Flight.objects.filter(airplane=instance))
+
+
+@receiver(post_save, sender=Flight)
+def flight_times_changed(sender, instance, created, **kwargs) -> None:
+    if not created:
+        roster.sync_times([instance.pk])
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def crew_assigned(sender, instance, action, reverse, pk_set, **kwargs) -> None:
+    # Rows added by Flight.crew.add()/set() miss the flight's times.
+    if action == "post_add":
+        roster.sync_times(pk_set if reverse else [instance.pk])
+
+
+@receiver(pre_save, sender=Flight)
+@receiver(pre_delete, sender=Flight)
+def remember_rollup(sender, instance, raw=False, **kwargs) -> None:
+    # The day and route of the rollup the flight is moved away from.
+    instance._previous_rollups = set()
+    if instance.pk is not None and not raw:
+        instance._previous_rollups = reporting.days_and_routes(
+            Flight.objects.filter(pk=instance.pk)
+        )
+
+
+@receiver(post_save, sender=Flight)
+def flight_saved_rollup(sender, instance, raw, **kwargs) -> None:
+    if not raw:
+        reporting.refresh(
+            getattr(instance, "_previous_rollups", set())
+            | reporting.days_and_routes(Flight.objects.filter(pk=instance.pk))
+        )
+
+
+@receiver(post_delete, sender=Flight)
+def flight_deleted_rollup(sender, instance, **kwargs) -> None:
+    reporting.refresh(getattr(instance, "_previous_rollups", ()))
+
+
+@receiver(post_save, sender=Flight)
+def flight_loaded_local_date(sender, instance, raw, **kwargs) -> None:
+    # Fixtures are saved without Flight.save(), which sets the date.
+    if raw:
+        local_dates.sync(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Airport)
+def remember_timezone(sender, instance, raw, **kwargs) -> None:
+    instance._previous_timezone = None
+    if instance.pk is not None and not raw:
+        instance._previous_timezone = (
+            Airport.objects.filter(pk=instance.pk)
+            .values_list("timezone", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Airport)
+def timezone_changed(sender, instance, created, raw, **kwargs) -> None:
+    previous = getattr(instance, "_previous_timezone", None)
+    if not created and not raw and previous not in (None, instance.timezone):
+        local_dates.sync(Flight.objects.filter(route__source=instance))
+
+
+@receiver(pre_save, sender=Route)
+def remember_source(sender, instance, raw, **kwargs) -> None:
+    instance._previous_source_id = None
+    if instance.pk is not None and not raw:
+        instance._previous_source_id = (
+            Route.objects.filter(pk=instance.pk)
+            .values_list("source_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Route)
+def source_changed(sender, instance, created, raw, **kwargs) -> None:
+    previous = getattr(instance, "_previous_source_id", None)
+    if not created and not raw and previous not in (None, instance.source_id):
+        local_dates.sync(Flight.objects.filter(route=instance))
+
+
+@receiver(post_save, sender=Airplane)
+def airplane_changed_rollup(sender, instance, created, raw, **kwargs) -> None:
+    # Capacity and type of the airplane's flights.
+    if not created and not raw:
+        reporting.flights_changed(Flight.objects.filter(airplane=instance))
+
+
+@receiver(post_save, sender=Flight)
+def flight_saved_index(sender, instance, **kwargs) -> None:
+    flight_id = instance.pk
+    transaction.on_commit(lambda: flight_index.update_flights([flight_id]))
+
+
+@receiver(post_delete, sender=Flight)
+def flight_deleted_index(sender, instance, **kwargs) -> None:
+    flight_id = instance.pk
+    transaction.on_commit(lambda: flight_index.remove_flights([flight_id]))
+
+
+@receiver(post_save, sender=Route)
+def route_saved_index(sender, instance, created, **kwargs) -> None:
+    if not created:
+        route_id = instance.pk
+        transaction.on_commit(lambda: flight_index.update_route(route_id))
+
+
+@receiver(pre_save, sender=Airport)
+@receiver(pre_save, sender=AirplaneType)
+def update_search_fields(sender, instance, **kwargs) -> None:
+    search.update_search_fields(instance)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def flight_list_changed(sender, **kwargs) -> None:
+    caching.bump_generation()
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_delete, sender=AirplaneType)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def reference_changed(sender, **kwargs) -> None:
+    caching.bump_references()
@@ -0,0 +1,134 @@
+from functools import cached_property
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type=OpenApiTypes.STR,
+        description="Comma separated fields to return (ex. ?fields=id,route)",
+    ),
+    OpenApiParameter(
+        "expand",
+        type=OpenApiTypes.STR,
+        description=(
+            "Comma separated relations to render in full, the other "
+            "expandable ones are returned as ids (ex. ?expand=route)"
+        ),
+    ),
+]
+
+
+def unknown_error(message: str, unknown: set, available) -> str:
+    return (
+        f"{message}: {', '.join(sorted(unknown))}. "
+        f"Available: {', '.join(available) or '-'}"
+    )
+
+
+def select_related(queryset, related):
+    """select_related(*related), a bare select_related() joins everything"""
+    related = list(related)
+    return queryset.select_related(*related) if related else queryset
+
+
+MANY_FIELDS = (serializers.ListSerializer, serializers.ManyRelatedField)
+
+
+# Serializer taking `fields`, the names to keep, and `expand`, the
+# relations of `expandable_fields` to render as declared; the other
+# expandable relations become primary keys. None keeps everything.
+class SparseFieldsetMixin:
+    expandable_fields = ()
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.only = fields
+        self.expand = expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.only is not None:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in self.only
+            }
+        for name in self.expandable_fields:
+            if name in fields and self.collapsed(name):
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    read_only=True,
+                    many=isinstance(fields[name], MANY_FIELDS),
+                )
+        return fields
+
+    def expands(self, name: str) -> bool:
+        return self.expand is None or name in self.expand
+
+    def collapsed(self, name: str) -> bool:
+        return name in self.expandable_fields and not self.expands(name)
+
+
+# Reads `?fields=` and `?expand=` for list and retrieve actions; use
+# `wants()` and `expands()` in get_queryset to skip unused joins.
+class SparseFieldsViewMixin:
+    sparse_actions = ("list", "retrieve")
+
+    def sparse_param(self, name: str) -> list[str] | None:
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        return [part.strip() for part in value.split(",") if part.strip()]
+
+    def sparse_serializer_class(self):
+        serializer_class = self.get_serializer_class()
+        if self.action in self.sparse_actions and issubclass(
+            serializer_class, SparseFieldsetMixin
+        ):
+            return serializer_class
+        return None
+
+    @cached_property
+    def sparse_fields(self) -> tuple[set | None, set | None]:
+        serializer_class = self.sparse_serializer_class()
+        if serializer_class is None:
+            return None, None
+        fields = self.sparse_param("fields") or None
+        expand = self.sparse_param("expand")
+        errors = {}
+        available = list(serializer_class().fields)
+        unknown = set(fields or ()) - set(available)
+        if unknown:
+            errors["fields"] = unknown_error(
+                "Unknown fields", unknown, available
+            )
+        expandable = serializer_class.expandable_fields
+        unknown = set(expand or ()) - set(expandable)
+        if unknown:
+            errors["expand"] = unknown_error(
+                "Cannot expand", unknown, expandable
+            )
+        if errors:
+            raise ValidationError(errors)
+        return (
+            None if fields is None else set(fields),
+            None if expand is None else set(expand),
+        )
+
+    def wants(self, name: str) -> bool:
+        fields = self.sparse_fields[0]
+        return fields is None or name in fields
+
+    def expands(self, name: str) -> bool:
+        expand = self.sparse_fields[1]
+        return self.wants(name) and (expand is None or name in expand)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_serializer_class() is not None:
+            fields, expand = self.sparse_fields
+            kwargs.setdefault("fields", fields)
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
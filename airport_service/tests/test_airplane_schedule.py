@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Flight
+from airport_service.serializers import FlightSerializer
+from airport_service.tests.test_order_api import test_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+START = timezone.make_aware(datetime(2030, 1, 10, 8))
+
+
+def flight_url(flight_id: int) -> str:
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+def timeline_url(airplane_id: int) -> str:
+    return reverse("airport:airplane-timeline", args=[airplane_id])
+
+
+class AirplaneScheduleTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=10)
+        )
+
+    def payload(self, departure: datetime, hours: int = 2) -> dict:
+        return {
+            "route": self.flight.route_id,
+            "airplane": self.flight.airplane_id,
+            "departure_time": departure.isoformat(),
+            "arrival_time": (departure + timedelta(hours=hours)).isoformat(),
+        }
+
+    def test_overlapping_flight_rejected(self) -> None:
+        response = self.client.post(
+            FLIGHT_URL, self.payload(START + timedelta(hours=9))
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(self.flight.id), response.data["airplane"][0])
+
+    def test_flight_inside_a_long_one_rejected(self) -> None:
+        Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=START - timedelta(days=1),
+            arrival_time=START - timedelta(hours=20),
+        )
+
+        response = self.client.post(
+            FLIGHT_URL, self.payload(START + timedelta(hours=2), hours=1)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_back_to_back_flights_allowed(self) -> None:
+        response = self.client.post(
+            FLIGHT_URL, self.payload(START + timedelta(hours=10))
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_arrival_before_departure_rejected(self) -> None:
+        response = self.client.post(
+            FLIGHT_URL, self.payload(START + timedelta(days=2), hours=-1)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_time", response.data)
+
+    def test_reschedule_ignores_itself(self) -> None:
+        response = self.client.patch(
+            flight_url(self.flight.id),
+            {"arrival_time": (START + timedelta(hours=11)).isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reschedule_into_another_flight_rejected(self) -> None:
+        other = Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=START + timedelta(days=1),
+            arrival_time=START + timedelta(days=1, hours=2),
+        )
+
+        response = self.client.patch(
+            flight_url(other.id),
+            {"departure_time": (START + timedelta(hours=5)).isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_validation(self) -> None:
+        data = [
+            self.payload(START + timedelta(hours=1)),
+            self.payload(START + timedelta(days=1)),
+            self.payload(START + timedelta(days=1, hours=1)),
+            self.payload(START + timedelta(days=2)),
+        ]
+
+        serializer = FlightSerializer(data=data, many=True)
+
+        self.assertFalse(serializer.is_valid())
+        errors = serializer.errors
+        self.assertIn(str(self.flight.id), errors[0]["airplane"][0])
+        self.assertIn("items: 2", errors[1]["airplane"][0])
+        self.assertIn("items: 1", errors[2]["airplane"][0])
+        self.assertEqual(errors[3], {})
+
+    def test_timeline(self) -> None:
+        later = Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=START + timedelta(days=3),
+            arrival_time=START + timedelta(days=3, hours=2),
+        )
+        Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=START + timedelta(days=40),
+            arrival_time=START + timedelta(days=40, hours=2),
+        )
+
+        response = self.client.get(
+            timeline_url(self.flight.airplane_id),
+            {"start": (START + timedelta(hours=5)).isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [flight["id"] for flight in response.data],
+            [self.flight.id, later.id],
+        )
+
+    def test_timeline_queries_independent_of_history(self) -> None:
+        url = timeline_url(self.flight.airplane_id)
+        params = {"start": START.isoformat()}
+        with CaptureQueriesContext(connection) as short:
+            self.client.get(url, params)
+        Flight.objects.bulk_create(
+            Flight(
+                route=self.flight.route,
+                airplane=self.flight.airplane,
+                departure_time=START - timedelta(days=day),
+                arrival_time=START - timedelta(days=day, hours=-2),
+            )
+            for day in range(1, 100)
+        )
+        with CaptureQueriesContext(connection) as long:
+            self.client.get(url, params)
+
+        self.assertEqual(len(short), len(long))
+
+    def test_timeline_window_validated(self) -> None:
+        response = self.client.get(
+            timeline_url(self.flight.airplane_id),
+            {
+                "start": START.isoformat(),
+                "end": (START - timedelta(days=1)).isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
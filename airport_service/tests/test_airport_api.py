@@ -69,6 +69,21 @@ class AdminAirportApiTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_list_airport_without_count(self) -> None:
+        for index in range(3):
+            test_airport(name=f"Test{index}")
+        airports = Airport.objects.all()
+        serializer = AirportSerializer(airports[:2], many=True)
+
+        response = self.client.get(
+            AIRPORT_URL, {"count": "false", "limit": 2}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(response.data["results"], serializer.data)
+        self.assertIn("offset=2", response.data["next"])
+
     def test_retrieve_airport(self) -> None:
         airport = test_airport()
         url = detail_url(airport.id)
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Airport, Crew, Flight
+from airport_service.serializers import (
+    AirportSerializer,
+    FlightDetailSerializer,
+)
+from airport_service.tests.test_order_api import test_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+AIRPORT_URL = reverse("airport:airport-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+class BatchRetrieveApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = test_flight()
+        self.flight.crew.add(
+            Crew.objects.create(first_name="Olena", last_name="Pchilka")
+        )
+
+    def test_flights_in_request_order(self) -> None:
+        other = Flight.objects.exclude(id=self.flight.id).first()
+        ids = f"{self.flight.id},999999,{other.id},{self.flight.id}"
+
+        response = self.client.get(FLIGHT_URL, {"ids": ids})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        flights = Flight.objects.in_bulk([self.flight.id, other.id])
+        self.assertEqual(
+            response.data["results"],
+            FlightDetailSerializer(
+                [flights[self.flight.id], flights[other.id]], many=True
+            ).data,
+        )
+        self.assertEqual(response.data["missing"], [999999])
+
+    def test_fixed_number_of_queries(self) -> None:
+        ids = list(Flight.objects.values_list("id", flat=True))
+        self.assertGreater(len(ids), 3)
+
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(FLIGHT_URL, {"ids": ids[0]})
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(FLIGHT_URL, {"ids": ",".join(map(str, ids))})
+
+        self.assertEqual(len(one), len(many))
+
+    def test_sparse_fields(self) -> None:
+        response = self.client.get(
+            FLIGHT_URL, {"ids": self.flight.id, "fields": "id,crew"}
+        )
+
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.flight.id, "crew": ["Olena Pchilka"]}],
+        )
+
+    def test_airports_and_routes(self) -> None:
+        airports = list(Airport.objects.order_by("-id")[:2])
+
+        response = self.client.get(
+            AIRPORT_URL, {"ids": f"{airports[0].id},{airports[1].id}"}
+        )
+        self.assertEqual(
+            response.data,
+            {
+                "results": AirportSerializer(airports, many=True).data,
+                "missing": [],
+            },
+        )
+
+        response = self.client.get(
+            ROUTE_URL, {"ids": str(self.flight.route_id)}
+        )
+        self.assertEqual(
+            response.data["results"][0]["source"],
+            self.flight.route.source_id,
+        )
+
+    def test_invalid_ids(self) -> None:
+        for ids in ("1,a", "", ",".join(map(str, range(101)))):
+            response = self.client.get(FLIGHT_URL, {"ids": ids})
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn("ids", response.data)
@@ -0,0 +1,153 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+
+from airport_service import roster, scheduling
+from airport_service.models import (
+    Airport,
+    DailyRollup,
+    Flight,
+    FlightCrew,
+    Route,
+    Ticket,
+)
+
+
+class GenerateDatasetTests(TestCase):
+    def test_generate_dataset(self) -> None:
+        call_command(
+            "generate_dataset",
+            "--airports=6",
+            "--routes-per-airport=2",
+            "--airplanes=24",
+            "--crew=60",
+            "--days=2",
+            "--users=5",
+            "--fill=0.5",
+            "--start=2024-01-01",
+            "--prefix=T",
+            stdout=StringIO(),
+        )
+
+        airports = Airport.objects.filter(name__startswith="T Airport")
+        self.assertEqual(airports.count(), 6)
+        self.assertEqual(Route.objects.filter(source__in=airports).count(), 12)
+        flights = Flight.objects.filter(route__source__in=airports)
+        self.assertEqual(flights.count(), 24)
+        self.assertTrue(Ticket.objects.filter(flight__in=flights).exists())
+        self.assertEqual(
+            DailyRollup.objects.filter(
+                route__source__in=airports
+            ).aggregate(Sum("flights"))["flights__sum"],
+            24,
+        )
+        self.assertTrue(airports.first().name_search.startswith("t airport"))
+        call_command("rebuild_seat_inventory", "--check", stdout=StringIO())
+
+    def test_generated_schedules_dont_clash(self) -> None:
+        call_command(
+            "generate_dataset",
+            "--airports=6",
+            "--routes-per-airport=3",
+            "--airplanes=4",
+            "--crew=10",
+            "--days=3",
+            "--users=0",
+            "--start=2024-01-01",
+            "--prefix=T",
+            stdout=StringIO(),
+        )
+
+        flights = Flight.objects.filter(
+            route__source__name__startswith="T Airport"
+        )
+        self.assertLess(flights.count(), 54)
+        conflicts = scheduling.batch_conflicts(
+            [
+                scheduling.Interval(*row)
+                for row in flights.values_list(
+                    "airplane_id", "departure_time", "arrival_time", "id"
+                )
+            ]
+        )
+        self.assertFalse(any(item["flights"] for item in conflicts))
+        duties = [
+            roster.Duty(*row)
+            for row in FlightCrew.objects.filter(flight__in=flights)
+            .values_list(
+                "crew_id", "flight_id", "departure_time", "arrival_time"
+            )
+        ]
+        self.assertTrue(duties)
+        self.assertFalse(any(roster.batch_conflicts(duties)))
+
+    def test_generate_dataset_is_seeded(self) -> None:
+        for prefix in ("A", "B"):
+            call_command(
+                "generate_dataset",
+                "--airports=4",
+                "--days=1",
+                "--users=2",
+                "--start=2024-01-01",
+                f"--prefix={prefix}",
+                stdout=StringIO(),
+            )
+
+        distances = [
+            list(
+                Route.objects.filter(
+                    source__name__startswith=f"{prefix} Airport"
+                )
+                .order_by("id")
+                .values_list("distance", flat=True)
+            )
+            for prefix in ("A", "B")
+        ]
+        self.assertEqual(distances[0], distances[1])
+
+
+class BenchmarkEndpointsTests(TestCase):
+    def test_benchmark_report(self) -> None:
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_endpoints",
+            "--iterations=2",
+            "--warmup=0",
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(stdout.getvalue())
+        flight_list = report["endpoints"]["airport:flight-list"]
+        self.assertEqual(flight_list["status"], [200])
+        self.assertGreaterEqual(flight_list["queries"]["max"], 1)
+        self.assertIn("airport:order-detail", report["endpoints"])
+        self.assertIn("user:manage", report["endpoints"])
+        self.assertIn("user:create", report["skipped"])
+        self.assertEqual(
+            report["endpoints"]["airport:flight-itineraries"]["status"], [200]
+        )
+
+
+class BenchmarkRenderersTests(TestCase):
+    def test_benchmark_report(self) -> None:
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_renderers",
+            "--flights=3",
+            "--iterations=2",
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["flights"], 3)
+        self.assertIn("list:json", report["renderers"])
+        for name, result in report["renderers"].items():
+            if "matches_json" in result:
+                self.assertTrue(result["matches_json"], name)
@@ -0,0 +1,271 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport_service.search import text_search
+from airport_service.tests.test_order_api import test_flight
+
+AIRPORT_BULK_URL = reverse("airport:airport-bulk")
+ROUTE_BULK_URL = reverse("airport:route-bulk")
+AIRPLANE_BULK_URL = reverse("airport:airplane-bulk")
+CREW_BULK_URL = reverse("airport:crew-bulk")
+
+
+class BulkWriteApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.kyiv = Airport.objects.create(
+            name="Bulk Kyiv", closest_big_city="Kyiv"
+        )
+        self.lviv = Airport.objects.create(
+            name="Bulk Lviv", closest_big_city="Lviv"
+        )
+
+    def test_admin_required(self) -> None:
+        user = get_user_model().objects.create_user(
+            "user@test.com", "Test1234"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.post(
+            CREW_BULK_URL,
+            [{"first_name": "Olena", "last_name": "Pchilka"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_airports(self) -> None:
+        payload = [
+            {"name": "Bulk Ödesa", "closest_big_city": "Odesa"},
+            {"name": "Bulk Kharkiv", "closest_big_city": "Kharkiv"},
+        ]
+
+        response = self.client.post(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = Airport.objects.filter(
+            id__in=[item["id"] for item in response.data]
+        )
+        self.assertEqual(
+            sorted(airport.name for airport in created),
+            ["Bulk Kharkiv", "Bulk Ödesa"],
+        )
+        self.assertEqual(
+            list(
+                Airport.objects.filter(
+                    id__in=text_search(Airport, "name", "bulk odesa")
+                ).values_list("name", flat=True)
+            ),
+            ["Bulk Ödesa"],
+        )
+
+    def test_errors_per_item(self) -> None:
+        payload = [
+            {"name": "Bulk Kyiv", "closest_big_city": "Kyiv"},
+            {"name": "Bulk Dnipro", "closest_big_city": "Dnipro"},
+            {"name": "Bulk Dnipro", "closest_big_city": "Dnipro"},
+            {"name": "Bulk Poltava"},
+        ]
+
+        response = self.client.post(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data), 4)
+        self.assertIn("name", response.data[0])
+        self.assertEqual(response.data[1], {})
+        self.assertIn("name", response.data[2])
+        self.assertIn("closest_big_city", response.data[3])
+        self.assertFalse(Airport.objects.filter(name="Bulk Dnipro").exists())
+
+    def test_route_clean_rules(self) -> None:
+        Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=500
+        )
+        kyiv, lviv = self.kyiv.id, self.lviv.id
+        payload = [
+            {"source": kyiv, "destination": kyiv, "distance": 1},
+            {"source": lviv, "destination": kyiv, "distance": 0},
+            {"source": kyiv, "destination": lviv, "distance": 9},
+            {"source": lviv, "destination": 999999, "distance": 9},
+        ]
+
+        response = self.client.post(ROUTE_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data[0]["non_field_errors"],
+            ["Source and destination cannot be the same."],
+        )
+        self.assertEqual(
+            response.data[1]["non_field_errors"],
+            ["Distance should be greater than 0."],
+        )
+        self.assertEqual(
+            response.data[2]["non_field_errors"][0].code, "unique"
+        )
+        self.assertIn("destination", response.data[3])
+
+    def test_update_routes(self) -> None:
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=500
+        )
+        back = Route.objects.create(
+            source=self.lviv, destination=self.kyiv, distance=500
+        )
+
+        response = self.client.patch(
+            ROUTE_BULK_URL,
+            [
+                {"id": route.id, "distance": 540},
+                {"id": back.id, "distance": 550},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        route.refresh_from_db()
+        back.refresh_from_db()
+        self.assertEqual((route.distance, back.distance), (540, 550))
+
+    def test_only_changed_time_zones_resync_flights(self) -> None:
+        from_kyiv = test_flight(
+            route=Route.objects.create(
+                source=self.kyiv, destination=self.lviv, distance=500
+            )
+        )
+        from_lviv = Flight.objects.create(
+            route=Route.objects.create(
+                source=self.lviv, destination=self.kyiv, distance=500
+            ),
+            airplane=from_kyiv.airplane,
+            departure_time=from_kyiv.arrival_time,
+            arrival_time=from_kyiv.arrival_time,
+        )
+
+        with mock.patch("airport_service.views.local_dates.sync") as sync:
+            self.client.patch(
+                AIRPORT_BULK_URL,
+                [
+                    {"id": self.kyiv.id, "name": "Bulk Kyiv Zhuliany"},
+                    {"id": self.lviv.id, "timezone": "Europe/Kyiv"},
+                ],
+                format="json",
+            )
+
+        (flights,), _ = sync.call_args
+        self.assertEqual(list(flights), [from_lviv])
+
+    def test_update_routes_without_moves_keeps_flights(self) -> None:
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=500
+        )
+
+        with mock.patch(
+            "airport_service.views.local_dates.sync"
+        ) as sync, mock.patch(
+            "airport_service.views.flight_index.update_route"
+        ) as update_route, self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                ROUTE_BULK_URL,
+                [{"id": route.id, "destination": self.lviv.id}],
+                format="json",
+            )
+
+        sync.assert_not_called()
+        update_route.assert_not_called()
+
+    def test_update_unknown_id(self) -> None:
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=500
+        )
+
+        response = self.client.patch(
+            ROUTE_BULK_URL,
+            [
+                {"id": route.id, "distance": 540},
+                {"id": 999999, "distance": 1},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("id", response.data[1])
+        route.refresh_from_db()
+        self.assertEqual(route.distance, 500)
+
+    def test_update_airplanes_rebuilds_seat_maps(self) -> None:
+        flight = test_flight()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=flight, row=2, seat=1)
+
+        response = self.client.patch(
+            AIRPLANE_BULK_URL,
+            [{"id": flight.airplane.id, "seats_in_row": 4}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        flight = Flight.objects.select_related("airplane").get(id=flight.id)
+        self.assertEqual(
+            list(flight.get_seat_map().taken_seats()), [(2, 1)]
+        )
+
+    def test_delete(self) -> None:
+        crew = Crew.objects.create(first_name="Olena", last_name="Pchilka")
+
+        response = self.client.delete(
+            CREW_BULK_URL, [crew.id, 999999], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"deleted": [crew.id], "missing": [999999]}
+        )
+        self.assertFalse(Crew.objects.filter(id=crew.id).exists())
+
+    def test_fixed_number_of_queries(self) -> None:
+        airplane_type = AirplaneType.objects.create(airplane_type="Bulk")
+
+        def payload(count: int) -> list[dict]:
+            return [
+                {
+                    "airplane_name": f"Bulk {count} {index}",
+                    "type": airplane_type.id,
+                    "rows": 10,
+                    "seats_in_row": 6,
+                }
+                for index in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as one:
+            self.client.post(AIRPLANE_BULK_URL, payload(1), format="json")
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(AIRPLANE_BULK_URL, payload(20), format="json")
+
+        self.assertEqual(len(one), len(many))
+        self.assertEqual(
+            Airplane.objects.filter(airplane_name__startswith="Bulk").count(),
+            21,
+        )
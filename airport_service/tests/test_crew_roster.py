@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Crew, Flight, FlightCrew
+from airport_service.tests.test_order_api import test_flight
+
+ASSIGNMENTS_URL = reverse("airport:flight-crew-assignments")
+
+START = timezone.make_aware(datetime(2030, 3, 2, 8))
+
+
+def roster_url(crew_id: int) -> str:
+    return reverse("airport:crew-roster", args=[crew_id])
+
+
+def flight_url(flight_id: int) -> str:
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class CrewRosterTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=3)
+        )
+        self.pilot = Crew.objects.create(first_name="Olena", last_name="Pilot")
+        self.steward = Crew.objects.create(
+            first_name="Taras", last_name="Steward"
+        )
+
+    def other_flight(self, departure: datetime, hours: int = 2) -> Flight:
+        return Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=hours),
+        )
+
+    def test_assignment_copies_flight_times(self) -> None:
+        self.flight.crew.add(self.pilot)
+        self.pilot.flight_set.add(self.other_flight(START + timedelta(days=1)))
+
+        self.assertFalse(
+            FlightCrew.objects.filter(departure_time__isnull=True).exists()
+        )
+        self.flight.departure_time = START - timedelta(hours=1)
+        self.flight.save()
+        self.assertEqual(
+            FlightCrew.objects.get(flight=self.flight).departure_time,
+            START - timedelta(hours=1),
+        )
+
+    def test_roster(self) -> None:
+        later = self.other_flight(START + timedelta(days=2))
+        self.other_flight(START + timedelta(days=20)).crew.add(self.pilot)
+        self.flight.crew.add(self.pilot)
+        later.crew.add(self.pilot)
+
+        response = self.client.get(
+            roster_url(self.pilot.id),
+            {"from": (START + timedelta(hours=1)).isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [duty["flight"] for duty in response.data],
+            [self.flight.id, later.id],
+        )
+        self.assertEqual(response.data[0]["route"], str(self.flight.route))
+
+    def test_assign_crews(self) -> None:
+        later = self.other_flight(START + timedelta(days=1))
+
+        response = self.client.post(
+            ASSIGNMENTS_URL,
+            [
+                {
+                    "flight": self.flight.id,
+                    "crew": [self.pilot.id, self.steward.id],
+                },
+                {"flight": later.id, "crew": [self.pilot.id]},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(self.flight.crew.all()), {self.pilot, self.steward}
+        )
+        self.assertEqual(list(later.crew.all()), [self.pilot])
+
+    def test_double_booking_rejected(self) -> None:
+        self.flight.crew.add(self.pilot)
+        overlapping = self.other_flight(START + timedelta(hours=2))
+
+        response = self.client.post(
+            ASSIGNMENTS_URL,
+            [{"flight": overlapping.id, "crew": [self.pilot.id]}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(self.flight.id), response.data[0]["crew"][0])
+        self.assertFalse(overlapping.crew.exists())
+
+    def test_rest_time_rejected(self) -> None:
+        too_soon = self.other_flight(START + timedelta(hours=5))
+        rested = self.other_flight(START + timedelta(hours=20))
+
+        response = self.client.post(
+            ASSIGNMENTS_URL,
+            [
+                {"flight": self.flight.id, "crew": [self.pilot.id]},
+                {"flight": too_soon.id, "crew": [self.pilot.id]},
+                {"flight": rested.id, "crew": [self.pilot.id]},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(too_soon.id), response.data[0]["crew"][0])
+        self.assertIn(str(self.flight.id), response.data[1]["crew"][0])
+        self.assertEqual(response.data[2], {})
+
+    def test_reassigning_a_flight_ignores_its_crew(self) -> None:
+        self.flight.crew.add(self.pilot)
+
+        response = self.client.post(
+            ASSIGNMENTS_URL,
+            [{"flight": self.flight.id, "crew": [self.steward.id]}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(self.flight.crew.all()), [self.steward])
+
+    def test_reschedule_checks_crew_rest(self) -> None:
+        self.flight.crew.add(self.pilot)
+        later = self.other_flight(START + timedelta(days=1))
+        later.crew.add(self.pilot)
+
+        response = self.client.patch(
+            flight_url(later.id),
+            {"departure_time": (START + timedelta(hours=4)).isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("departure_time", response.data)
+
+    def test_fixed_number_of_queries(self) -> None:
+        flights = [
+            self.other_flight(START + timedelta(days=day))
+            for day in range(1, 6)
+        ]
+
+        def payload(count: int) -> list[dict]:
+            return [
+                {"flight": flight.id, "crew": [self.pilot.id, self.steward.id]}
+                for flight in flights[:count]
+            ]
+
+        with CaptureQueriesContext(connection) as one:
+            self.client.post(ASSIGNMENTS_URL, payload(1), format="json")
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.post(
+                ASSIGNMENTS_URL, payload(5), format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(one), len(many))
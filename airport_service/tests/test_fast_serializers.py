@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from airport_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport_service.serializers import (
+    FlightListSerializer,
+    OrderListSerializer,
+    RouteListSerializer,
+)
+from airport_service.views import FlightViewSet
+
+
+@override_settings(FLIGHT_SEARCH_CACHE_TIMEOUT=0)
+class FastListSerializerParityTests(TestCase):
+    """Fast list path must render byte-identical JSON"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        airplane_type = AirplaneType.objects.create(airplane_type="Parity")
+        airplanes = [
+            Airplane.objects.create(
+                airplane_name=name, type=airplane_type, rows=4, seats_in_row=3
+            )
+            for name in ("Mriya \"Dream\"", "Ruslan")
+        ]
+        airports = [
+            Airport.objects.create(name=name, closest_big_city=city)
+            for name, city in (
+                ("Zhuliany", "Kyiv"),
+                ("Schönefeld", "Berlin"),
+                ("Malpensa", "Milano"),
+            )
+        ]
+        routes = [
+            Route.objects.create(
+                source=source, destination=destination, distance=700
+            )
+            for source, destination in (
+                (airports[0], airports[1]),
+                (airports[1], airports[2]),
+                (airports[2], airports[0]),
+            )
+        ]
+        start = datetime(2031, 3, 30, 23, 45, 0, 123456, dt_timezone.utc)
+        self.flights = [
+            Flight.objects.create(
+                route=routes[i % 3],
+                airplane=airplanes[i % 2],
+                departure_time=start + timedelta(hours=5 * i),
+                arrival_time=start + timedelta(hours=5 * i + 2),
+            )
+            for i in range(5)
+        ]
+        for i, flight in enumerate(self.flights[:3]):
+            order = Order.objects.create(user=self.user)
+            Ticket.objects.create(order=order, flight=flight, row=1, seat=2)
+            Ticket.objects.create(
+                order=order, flight=self.flights[4], row=i + 1, seat=1
+            )
+
+    def assert_api_parity(self, url: str, **params) -> None:
+        with override_settings(FAST_LIST_SERIALIZERS=True):
+            fast = self.client.get(url, params)
+        with override_settings(
+            FAST_LIST_SERIALIZERS=False, QUERY_BUDGET={"SAMPLE_RATE": 0}
+        ):
+            regular = self.client.get(url, params)
+
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, regular.content)
+
+    def assert_serializer_parity(self, serializer_class, queryset) -> None:
+        regular = serializer_class(list(queryset), many=True).data
+        fast = serializer_class(
+            list(serializer_class().rows(queryset)), many=True
+        ).data
+
+        self.assertEqual(
+            JSONRenderer().render(fast), JSONRenderer().render(regular)
+        )
+
+    def test_route_list(self) -> None:
+        self.assert_api_parity(reverse("airport:route-list"))
+        self.assert_api_parity(
+            reverse("airport:route-list"), source="Berlin", limit=1, offset=1
+        )
+
+    def test_flight_list(self) -> None:
+        url = reverse("airport:flight-list")
+        self.assert_api_parity(url)
+        self.assert_api_parity(url, limit=2)
+        cursor = self.client.get(url, {"limit": 2}).data["next"]
+        self.assert_api_parity(cursor)
+
+    def test_order_list(self) -> None:
+        self.assert_api_parity(reverse("airport:order-list"))
+        self.assert_api_parity(reverse("airport:order-list"), limit=2)
+
+    @override_settings(TIME_ZONE="UTC")
+    def test_utc_datetimes(self) -> None:
+        queryset = FlightViewSet.annotate_tickets_available(
+            Flight.objects.filter(id__in=[f.id for f in self.flights])
+        )
+        self.assert_serializer_parity(FlightListSerializer, queryset)
+        self.assert_serializer_parity(
+            OrderListSerializer, Order.objects.filter(user=self.user)
+        )
+        rows = list(FlightListSerializer().rows(queryset))
+        data = FlightListSerializer(rows, many=True).data
+        self.assertEqual(
+            data[0]["departure_time"], "2031-03-30T23:45:00.123456Z"
+        )
+
+    def test_route_rows(self) -> None:
+        self.assert_serializer_parity(
+            RouteListSerializer, Route.objects.all()
+        )
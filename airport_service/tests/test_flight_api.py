@@ -1,16 +1,27 @@
+import base64
+import time
+from unittest import mock
+
 from django.contrib.auth import get_user_model
-from django.db.models import F, Count
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from airport_service import caching
+from airport_service.itineraries import flight_index
 from airport_service.models import (
     Airport,
     Route,
     AirplaneType,
     Airplane,
     Flight,
+    Order,
+    Ticket,
 )
 from airport_service.serializers import (
     FlightListSerializer,
@@ -18,12 +29,17 @@ from airport_service.serializers import (
 )
 
 FLIGHT_URL = reverse("airport:flight-list")
+ITINERARIES_URL = reverse("airport:flight-itineraries")
 
 
 def detail_url(flight_id: int):
     return reverse_lazy("airport:flight-detail", args=[flight_id])
 
 
+def seat_map_url(flight_id: int):
+    return reverse_lazy("airport:flight-seat-map", args=[flight_id])
+
+
 def test_airplane_type(**params) -> AirplaneType:
     defaults = {
         "airplane_type": "test type",
@@ -88,7 +104,7 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = Flight.objects.annotate(
             tickets_available=(
                     F("airplane__rows") * F("airplane__seats_in_row")
-                    - Count("tickets")
+                    - F("seats_sold")
             )
         )
         serializer = FlightListSerializer(flights, many=True)
@@ -98,6 +114,65 @@ class AuthenticatedFlightApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_list_flight_cursor_pagination(self) -> None:
+        airplane_type = test_airplane_type()
+        airplane = test_airplane(type=airplane_type)
+        airport1 = test_airport()
+        airport2 = test_airport(name="Test2", closest_big_city="Test2")
+        route = test_route(source=airport1, destination=airport2)
+        for day in range(10, 22):
+            test_flight(
+                airplane=airplane,
+                route=route,
+                departure_time=f"2023-08-{day}T09:30:00+03:00",
+                arrival_time=f"2023-08-{day}T11:30:00+03:00",
+            )
+        expected_ids = list(
+            Flight.objects.order_by("departure_time", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+        ids = []
+        url = FLIGHT_URL + "?limit=5"
+        while url:
+            response = self.client.get(url)
+            self.assertNotIn("count", response.data)
+            ids.extend(flight["id"] for flight in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(ids, expected_ids)
+
+    def test_cursor_pagination_over_shared_departure_time(self) -> None:
+        airplane_type = test_airplane_type()
+        airplane = test_airplane(type=airplane_type)
+        airport1 = test_airport()
+        airport2 = test_airport(name="Test2", closest_big_city="Test2")
+        route = test_route(source=airport1, destination=airport2)
+        for _ in range(12):
+            test_flight(airplane=airplane, route=route)
+        expected_ids = list(
+            Flight.objects.order_by("departure_time", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+        pages = []
+        url = FLIGHT_URL + "?limit=5"
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            pages.append([flight["id"] for flight in response.data["results"]])
+            url = response.data["next"]
+            # Ties are skipped by the position, not an offset.
+            self.assertNotIn("OFFSET", queries[0]["sql"])
+        previous = self.client.get(response.data["previous"])
+
+        self.assertEqual(sum(pages, []), expected_ids)
+        self.assertEqual(
+            [flight["id"] for flight in previous.data["results"]], pages[-2]
+        )
+
     def test_filter_flight_by_source(self) -> None:
         airplane_type = test_airplane_type()
         airplane1 = test_airplane(type=airplane_type)
@@ -113,7 +188,7 @@ class AuthenticatedFlightApiTests(TestCase):
         ).annotate(
             tickets_available=(
                     F("airplane__rows") * F("airplane__seats_in_row")
-                    - Count("tickets")
+                    - F("seats_sold")
             )
         )
         serializer1 = FlightListSerializer(annotated_flights[0])
@@ -146,7 +221,7 @@ class AuthenticatedFlightApiTests(TestCase):
         ).annotate(
             tickets_available=(
                     F("airplane__rows") * F("airplane__seats_in_row")
-                    - Count("tickets")
+                    - F("seats_sold")
             )
         )
         serializer1 = FlightListSerializer(annotated_flights[0])
@@ -225,3 +300,262 @@ class AdminFlightApiTest(TestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class FlightSeatMapApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        airplane_type = test_airplane_type()
+        airplane = test_airplane(type=airplane_type, rows=2, seats_in_row=3)
+        airport1 = test_airport()
+        airport2 = test_airport(name="Test2", closest_big_city="Test2")
+        route = test_route(source=airport1, destination=airport2)
+        self.flight = test_flight(airplane=airplane, route=route)
+        user = get_user_model().objects.create_user(
+            "test123@test.com",
+            "Test1234",
+        )
+        order = Order.objects.create(user=user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+        Ticket.objects.create(flight=self.flight, order=order, row=2, seat=3)
+
+    def test_retrieve_taken_seats_from_seat_map(self) -> None:
+        response = self.client.get(detail_url(self.flight.id))
+
+        self.assertEqual(
+            response.data["taken_seats"],
+            [{"row": 1, "seat": 2}, {"row": 2, "seat": 3}],
+        )
+
+    def test_seat_map_base64(self) -> None:
+        response = self.client.get(seat_map_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rows"], 2)
+        self.assertEqual(response.data["seats_in_row"], 3)
+        self.assertEqual(response.data["seats_sold"], 2)
+        self.assertEqual(
+            base64.b64decode(response.data["seats"]), bytes([0b100010])
+        )
+
+    def test_seat_map_rle(self) -> None:
+        response = self.client.get(
+            seat_map_url(self.flight.id), {"encoding": "rle"}
+        )
+
+        self.assertEqual(
+            response.data["seats"], [[0, 1], [1, 1], [0, 3], [1, 1]]
+        )
+
+    def test_seat_map_released_on_ticket_delete(self) -> None:
+        Ticket.objects.get(flight=self.flight, row=1, seat=2).delete()
+
+        response = self.client.get(
+            seat_map_url(self.flight.id), {"encoding": "rle"}
+        )
+
+        self.assertEqual(response.data["seats"], [[0, 5], [1, 1]])
+
+
+class FlightItinerariesApiTests(TestCase):
+    def setUp(self) -> None:
+        flight_index.invalidate()
+        self.client = APIClient()
+        airplane_type = test_airplane_type()
+        airplane = test_airplane(type=airplane_type)
+        self.kyiv = test_airport(name="Zhuliany")
+        self.warsaw = test_airport(name="Modlin", closest_big_city="Warsaw")
+        self.lisbon = test_airport(name="Montijo", closest_big_city="Lisbon")
+        kyiv_warsaw = test_route(
+            source=self.kyiv, destination=self.warsaw, distance=700
+        )
+        warsaw_lisbon = test_route(
+            source=self.warsaw, destination=self.lisbon, distance=2700
+        )
+        kyiv_lisbon = test_route(
+            source=self.kyiv, destination=self.lisbon, distance=3200
+        )
+        self.first_leg = test_flight(
+            airplane=airplane,
+            route=kyiv_warsaw,
+            departure_time="2030-09-01T08:00:00+03:00",
+            arrival_time="2030-09-01T10:00:00+03:00",
+        )
+        test_flight(
+            airplane=airplane,
+            route=warsaw_lisbon,
+            departure_time="2030-09-01T10:30:00+03:00",
+            arrival_time="2030-09-01T14:00:00+03:00",
+        )
+        self.second_leg = test_flight(
+            airplane=airplane,
+            route=warsaw_lisbon,
+            departure_time="2030-09-01T11:30:00+03:00",
+            arrival_time="2030-09-01T15:00:00+03:00",
+        )
+        self.direct = test_flight(
+            airplane=airplane,
+            route=kyiv_lisbon,
+            departure_time="2030-09-01T12:00:00+03:00",
+            arrival_time="2030-09-01T17:00:00+03:00",
+        )
+
+    def search(self, **params):
+        payload = {
+            "source": self.kyiv.id,
+            "destination": self.lisbon.id,
+            "date": "2030-09-01",
+        }
+        payload.update(params)
+        return self.client.get(ITINERARIES_URL, payload)
+
+    def test_itineraries_sorted_by_arrival(self) -> None:
+        response = self.search()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                [flight["id"] for flight in itinerary["flights"]]
+                for itinerary in response.data
+            ],
+            [[self.first_leg.id, self.second_leg.id], [self.direct.id]],
+        )
+        self.assertEqual(response.data[0]["stops"], 1)
+        self.assertEqual(response.data[0]["distance"], 3400)
+
+    def test_itineraries_sorted_by_distance(self) -> None:
+        response = self.search(sort="distance", limit=1)
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["flights"][0]["id"], self.direct.id)
+
+    def test_itineraries_limit_keeps_the_best(self) -> None:
+        for sort in ("arrival", "distance"):
+            everything = self.search(sort=sort).data
+
+            for limit in (1, 2):
+                self.assertEqual(
+                    self.search(sort=sort, limit=limit).data,
+                    everything[:limit],
+                )
+
+    def test_itineraries_direct_only(self) -> None:
+        response = self.search(max_stops=0)
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["stops"], 0)
+
+    def test_itineraries_index_follows_flight_changes(self) -> None:
+        self.search()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.direct.delete()
+
+        response = self.search()
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["stops"], 1)
+
+    def test_itineraries_of_departed_flights_not_indexed(self) -> None:
+        test_flight(
+            airplane=self.direct.airplane,
+            route=self.direct.route,
+            departure_time="2023-09-01T12:00:00+03:00",
+            arrival_time="2023-09-01T17:00:00+03:00",
+        )
+
+        response = self.search(date="2023-09-01")
+
+        self.assertEqual(response.data, [])
+
+    def test_itineraries_index_expires(self) -> None:
+        self.search()
+        Flight.objects.bulk_create(
+            [
+                Flight(
+                    route=self.direct.route,
+                    airplane=self.direct.airplane,
+                    departure_time="2030-09-01T18:00:00+03:00",
+                    arrival_time="2030-09-01T23:00:00+03:00",
+                )
+            ]
+        )
+        self.assertEqual(len(self.search().data), 2)
+
+        flight_index._built_at -= 61
+
+        self.assertEqual(len(self.search().data), 3)
+
+    def test_itineraries_require_airports_and_date(self) -> None:
+        response = self.client.get(ITINERARIES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightListCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        airplane_type = test_airplane_type()
+        airplane = test_airplane(type=airplane_type)
+        airport1 = test_airport()
+        airport2 = test_airport(name="Test2", closest_big_city="Test2")
+        route = test_route(source=airport1, destination=airport2)
+        self.flight = test_flight(airplane=airplane, route=route)
+        user = get_user_model().objects.create_user(
+            "test123@test.com",
+            "Test1234",
+        )
+        self.order = Order.objects.create(user=user)
+
+    def tickets_available(self, response) -> int:
+        for flight in response.data["results"]:
+            if flight["id"] == self.flight.id:
+                return flight["tickets_available"]
+
+    def test_repeated_search_is_served_from_cache(self) -> None:
+        self.client.get(FLIGHT_URL, {"source": "Test"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(FLIGHT_URL, {"source": " TEST "})
+
+        self.assertEqual(self.tickets_available(response), 6)
+
+    def test_ticket_sale_invalidates_cached_search(self) -> None:
+        self.client.get(FLIGHT_URL)
+
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(self.tickets_available(response), 5)
+
+    def test_flight_change_invalidates_cached_search(self) -> None:
+        self.client.get(FLIGHT_URL)
+
+        self.flight.delete()
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertIsNone(self.tickets_available(response))
+
+    @override_settings(
+        FLIGHT_SEARCH_CACHE_TIMEOUT=30, ROUTE_CALENDAR_CACHE_TIMEOUT=300
+    )
+    def test_version_tokens_expire(self) -> None:
+        key = caching.flight_version_key(self.flight.id)
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        now = time.time()
+
+        with mock.patch("time.time", return_value=now + 299):
+            self.assertIsNotNone(cache.get(key))
+        with mock.patch("time.time", return_value=now + 301):
+            self.assertIsNone(cache.get(key))
+
+    @override_settings(FLIGHT_SEARCH_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self) -> None:
+        self.client.get(FLIGHT_URL)
+
+        # The reference data version and the flights.
+        with self.assertNumQueries(2):
+            self.client.get(FLIGHT_URL)
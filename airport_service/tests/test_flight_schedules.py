@@ -0,0 +1,223 @@
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from airport_service import schedules
+from airport_service.models import (
+    Airplane,
+    Crew,
+    DailyRollup,
+    Flight,
+    FlightSchedule,
+    Order,
+    Ticket,
+)
+from airport_service.tests.test_order_api import test_flight
+
+# A Monday.
+NOW = timezone.make_aware(datetime(2030, 1, 7, 6))
+
+
+class FlightScheduleTests(TestCase):
+    def setUp(self) -> None:
+        self.flight = test_flight(
+            departure_time=NOW - timedelta(days=30),
+            arrival_time=NOW - timedelta(days=30, hours=-2),
+        )
+        self.schedule = FlightSchedule.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            days_of_week="135",
+            departure=time(7, 30),
+            duration=timedelta(hours=2),
+            valid_from=date(2030, 1, 1),
+        )
+
+    def materialize(self, days: int = 13) -> schedules.Materialized:
+        return schedules.materialize(days=days, now=NOW)
+
+    def departures(self) -> list[datetime]:
+        return [
+            timezone.localtime(departure_time)
+            for departure_time in self.schedule.flights.values_list(
+                "departure_time", flat=True
+            )
+        ]
+
+    def test_creates_flights_of_the_horizon(self) -> None:
+        result = self.materialize()
+
+        self.assertEqual(result.created, 6)
+        self.assertEqual(
+            [departure.date() for departure in self.departures()],
+            [date(2030, 1, day) for day in (7, 9, 11, 14, 16, 18)],
+        )
+        self.assertEqual(self.departures()[0].time(), time(7, 30))
+
+    def test_rerun_skips_existing_flights(self) -> None:
+        self.materialize()
+
+        result = self.materialize(days=20)
+
+        self.assertEqual(result.created, 3)
+        self.assertEqual((result.updated, result.deleted), (0, 0))
+        self.assertEqual(self.schedule.flights.count(), 9)
+
+    def test_validity_window(self) -> None:
+        self.schedule.valid_from = date(2030, 1, 10)
+        self.schedule.valid_until = date(2030, 1, 16)
+        self.schedule.save()
+
+        self.materialize()
+
+        self.assertEqual(
+            [departure.day for departure in self.departures()], [11, 14, 16]
+        )
+
+    def test_edits_move_unsold_flights_only(self) -> None:
+        self.materialize()
+        sold, unsold = self.schedule.flights.all()[:2]
+        Ticket.objects.create(
+            order=Order.objects.create(
+                user=get_user_model().objects.create_user(
+                    "user@test.com", "Test1234"
+                )
+            ),
+            flight=sold,
+            row=1,
+            seat=1,
+        )
+        pilot = Crew.objects.create(first_name="Olena", last_name="Pilot")
+        unsold.crew.add(pilot)
+
+        self.schedule.departure = time(9)
+        self.schedule.save()
+        result = self.materialize()
+
+        self.assertEqual((result.updated, result.kept), (5, 1))
+        sold.refresh_from_db()
+        unsold.refresh_from_db()
+        self.assertEqual(timezone.localtime(sold.departure_time).hour, 7)
+        self.assertEqual(timezone.localtime(unsold.departure_time).hour, 9)
+        self.assertEqual(
+            unsold.flightcrew_set.get().departure_time, unsold.departure_time
+        )
+
+    def test_dropped_days_deleted(self) -> None:
+        self.materialize()
+
+        self.schedule.days_of_week = "1"
+        self.schedule.save()
+        result = self.materialize()
+
+        self.assertEqual(result.deleted, 4)
+        self.assertEqual(
+            [departure.day for departure in self.departures()], [7, 14]
+        )
+
+    def test_deletes_in_constant_queries(self) -> None:
+        self.materialize()
+        pilot = Crew.objects.create(first_name="Olena", last_name="Pilot")
+        self.schedule.flights.last().crew.add(pilot)
+
+        self.schedule.days_of_week = "13"
+        self.schedule.save()
+        with CaptureQueriesContext(connection) as two:
+            self.assertEqual(self.materialize().deleted, 2)
+        self.schedule.days_of_week = "135"
+        self.schedule.save()
+        self.materialize()
+        self.schedule.days_of_week = "1"
+        self.schedule.save()
+        with CaptureQueriesContext(connection) as four:
+            self.assertEqual(self.materialize().deleted, 4)
+
+        self.assertEqual(len(two), len(four))
+        self.assertFalse(pilot.flightcrew_set.exists())
+        self.assertEqual(
+            list(
+                DailyRollup.objects.filter(route=self.flight.route)
+                .order_by("day")
+                .values_list("day", "flights")
+            ),
+            [
+                (self.flight.departure_local_date, 1),
+                (date(2030, 1, 7), 1),
+                (date(2030, 1, 14), 1),
+            ],
+        )
+
+    def test_busy_airplane_skipped(self) -> None:
+        Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=timezone.make_aware(datetime(2030, 1, 9, 8)),
+            arrival_time=timezone.make_aware(datetime(2030, 1, 9, 10)),
+        )
+
+        result = self.materialize()
+
+        self.assertEqual((result.created, result.conflicts), (5, 1))
+        self.assertNotIn(9, [departure.day for departure in self.departures()])
+
+    def test_move_keeps_crew_rested(self) -> None:
+        self.materialize()
+        first = self.schedule.flights.first()
+        later = Flight.objects.create(
+            route=self.flight.route,
+            airplane=Airplane.objects.create(
+                airplane_name="Other",
+                type=self.flight.airplane.type,
+                rows=1,
+                seats_in_row=1,
+            ),
+            departure_time=timezone.make_aware(datetime(2030, 1, 7, 20)),
+            arrival_time=timezone.make_aware(datetime(2030, 1, 7, 22)),
+        )
+        pilot = Crew.objects.create(first_name="Olena", last_name="Pilot")
+        first.crew.add(pilot)
+        later.crew.add(pilot)
+
+        self.schedule.departure = time(9)
+        self.schedule.save()
+        result = self.materialize()
+
+        self.assertEqual((result.updated, result.conflicts), (5, 1))
+        first.refresh_from_db()
+        self.assertEqual(timezone.localtime(first.departure_time).hour, 7)
+
+    def test_rerun_queries_independent_of_schedules(self) -> None:
+        self.materialize()
+        with CaptureQueriesContext(connection) as one:
+            self.materialize()
+        for hour in (10, 13, 16, 19):
+            FlightSchedule.objects.create(
+                route=self.flight.route,
+                airplane=self.flight.airplane,
+                departure=time(hour),
+                duration=timedelta(hours=2),
+                valid_from=date(2030, 1, 1),
+            )
+        self.materialize()
+
+        with CaptureQueriesContext(connection) as many:
+            result = self.materialize()
+
+        self.assertEqual(result, schedules.Materialized())
+        self.assertEqual(len(one), len(many))
+
+    def test_command(self) -> None:
+        self.schedule.valid_from = timezone.localdate()
+        self.schedule.save()
+        out = StringIO()
+
+        call_command("materialize_schedules", "--days", "7", stdout=out)
+
+        self.assertIn("created", out.getvalue())
+        self.assertTrue(self.schedule.flights.exists())
@@ -0,0 +1,331 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from airport_service import importing
+from airport_service.models import (
+    Airplane,
+    Airport,
+    Crew,
+    DailyRollup,
+    Flight,
+    FlightCrew,
+    Route,
+)
+from airport_service.tests.test_order_api import test_flight
+
+OPENFLIGHTS_AIRPORTS = (
+    '2939,"Boryspil International Airport","Kiev","Ukraine","KBP","UKBB",'
+    '50.345001,30.894699,427,2,"E","Europe/Kiev","airport","OurAirports"\n'
+    '2949,"Lviv International Airport","Lviv","Ukraine","LWO","UKLL",'
+    '49.8125,23.9561,1071,2,"E","Europe/Kiev","airport","OurAirports"\n'
+    '9999,"Airstrip","\\N","Ukraine","\\N","UKXX",'
+    '48.0,30.0,0,2,"E","Europe/Kiev","airport","OurAirports"\n'
+)
+OPENFLIGHTS_ROUTES = (
+    "PS,14,KBP,2939,LWO,2949,,0,738\n"
+    "7W,1,KBP,2939,LWO,2949,,0,AT7\n"
+    "PS,14,LWO,2949,ZZZ,\\N,,0,738\n"
+    "PS,14,KBP,2939,WAW,679,,0,738\n"
+)
+
+
+class ImportDataTests(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def call(self, *args) -> str:
+        out = io.StringIO()
+        call_command("import_data", *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_fixture(self) -> None:
+        path = self.write(
+            "fixture.json",
+            json.dumps(
+                [
+                    {
+                        "model": "airport_service.crew",
+                        "pk": 9001,
+                        "fields": {
+                            "first_name": "Olena",
+                            "last_name": "Pilot",
+                        },
+                    },
+                    {
+                        "model": "airport_service.airport",
+                        "pk": 9001,
+                        "fields": {
+                            "name": "Imp Kyiv",
+                            "closest_big_city": "Kyiv",
+                        },
+                    },
+                    {
+                        "model": "airport_service.airport",
+                        "pk": 9002,
+                        "fields": {
+                            "name": "Imp Lviv",
+                            "closest_big_city": "Lviv",
+                        },
+                    },
+                    {
+                        "model": "airport_service.route",
+                        "pk": 9001,
+                        "fields": {
+                            "source": 9001,
+                            "destination": 9002,
+                            "distance": 470,
+                        },
+                    },
+                    {
+                        "model": "airport_service.airplanetype",
+                        "pk": 9001,
+                        "fields": {"airplane_type": "Imp type"},
+                    },
+                    {
+                        "model": "airport_service.airplane",
+                        "pk": 9001,
+                        "fields": {
+                            "airplane_name": "Imp plane",
+                            "type": 9001,
+                            "rows": 10,
+                            "seats_in_row": 4,
+                        },
+                    },
+                    {
+                        "model": "airport_service.flight",
+                        "pk": 9001,
+                        "fields": {
+                            "route": 9001,
+                            "airplane": 9001,
+                            "departure_time": "2030-05-01T08:00:00Z",
+                            "arrival_time": "2030-05-01T09:30:00Z",
+                            "crew": [9001],
+                        },
+                    },
+                    {
+                        "model": "sessions.session",
+                        "pk": "key",
+                        "fields": {},
+                    },
+                ]
+            ),
+        )
+
+        self.call(path)
+
+        flight = Flight.objects.get(pk=9001)
+        self.assertEqual(str(flight.route), "Imp Kyiv to Imp Lviv")
+        self.assertEqual(
+            FlightCrew.objects.get(flight=flight).departure_time,
+            flight.departure_time,
+        )
+        self.assertEqual(Airport.objects.get(pk=9002).name_search, "imp lviv")
+        self.assertIn("created nothing, 8 skipped", self.call(path))
+
+    def test_rerun_skips_flights_and_updates_rollups(self) -> None:
+        flight = test_flight()
+        path = self.write(
+            "flights.csv",
+            "route,airplane,departure_time,arrival_time\n"
+            f"{flight.route_id},{flight.airplane_id},"
+            "2030-05-01T11:00:00+03:00,2030-05-01T12:30:00+03:00\n",
+        )
+        args = (path, "--model", "flight")
+
+        self.call(*args)
+        output = self.call(*args)
+
+        self.assertIn("created nothing, 1 skipped", output)
+        imported = Flight.objects.get(departure_time__year=2030)
+        self.assertEqual(imported.seat_map, bytes(2))
+        self.assertEqual(
+            DailyRollup.objects.get(day=imported.departure_local_date).flights,
+            1,
+        )
+
+    def test_csv_with_natural_keys(self) -> None:
+        airports = self.write(
+            "airports.csv",
+            "name,closest_big_city\nImp Kyiv,Kyiv\nImp Lviv,Lviv\n",
+        )
+        routes = self.write(
+            "routes.csv",
+            "source,destination,distance\n"
+            "Imp Kyiv,Imp Lviv,470\n"
+            "Imp Lviv,Imp Kyiv,470\n",
+        )
+        types = self.write("types.csv", "airplane_type\nImp type\n")
+        airplanes = self.write(
+            "airplanes.csv",
+            "airplane_name,type,rows,seats_in_row\nImp plane,Imp type,10,4\n",
+        )
+        crew = Crew.objects.create(first_name="Olena", last_name="Pilot")
+        flights = self.write(
+            "flights.csv",
+            "route,airplane,departure_time,arrival_time,crew\n"
+            "Imp Kyiv|Imp Lviv,Imp plane,2030-05-01T08:00Z,"
+            f"2030-05-01T09:30Z,{crew.id}\n",
+        )
+
+        self.call(airports, "--model", "airport")
+        self.call(routes, "--model", "route")
+        self.call(types, "--model", "airplanetype")
+        self.call(airplanes, "--model", "airplane")
+        self.call(flights, "--model", "flight")
+
+        flight = Flight.objects.get(airplane__airplane_name="Imp plane")
+        self.assertEqual(flight.route.source.name, "Imp Kyiv")
+        self.assertEqual(list(flight.crew.all()), [crew])
+
+    def test_openflights(self) -> None:
+        airports = self.write("airports.dat", OPENFLIGHTS_AIRPORTS)
+        routes = self.write("routes.dat", OPENFLIGHTS_ROUTES)
+
+        self.call(airports, routes)
+
+        self.assertTrue(Airport.objects.filter(name="Airstrip (UKXX)"))
+        route = Route.objects.get(
+            source__name="Boryspil International Airport (KBP)"
+        )
+        self.assertEqual(route.destination.closest_big_city, "Lviv")
+        self.assertAlmostEqual(route.distance, 497, delta=5)
+        # Two airlines fly KBP-LWO, the other routes have unknown airports.
+        self.assertEqual(
+            Route.objects.filter(source__name__endswith="(KBP)").count(), 1
+        )
+        self.assertFalse(
+            Route.objects.filter(source__name__endswith="(LWO)").exists()
+        )
+
+    def test_invalid_rows_and_resume(self) -> None:
+        checkpoint = os.path.join(self.directory, "checkpoint.json")
+        rows = [f"Imp {index},City {index}" for index in range(6)]
+        rows[3] = "Imp 3,"
+        header = "name,closest_big_city"
+        path = self.write("airports.csv", "\n".join([header, *rows]))
+        args = (path, "--model", "airport", "--chunk-size", "2")
+
+        with self.assertRaises(CommandError):
+            self.call(*args, "--checkpoint", checkpoint)
+
+        with open(checkpoint) as file:
+            self.assertEqual(list(json.load(file).values()), [2])
+        self.assertEqual(
+            Airport.objects.filter(name__startswith="Imp ").count(), 2
+        )
+        rows[3] = "Imp 3,City 3"
+        self.write("airports.csv", "\n".join([header, *rows]))
+
+        output = self.call(*args, "--checkpoint", checkpoint)
+
+        self.assertIn("resuming after row 2", output)
+        self.assertIn("created 4 airport", output)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_read_json_in_small_blocks(self) -> None:
+        content = json.dumps(
+            [{"name": f"Imp {index}", "x": [1, 2]} for index in range(5)]
+        )
+        lines = "\n".join(
+            json.dumps({"id": index, "name": "Imp"}) for index in range(5)
+        )
+
+        array = list(
+            importing.read_json(io.StringIO(content), "a", read_size=5)
+        )
+        json_lines = list(
+            importing.read_json(io.StringIO(lines), "a", read_size=5)
+        )
+
+        self.assertEqual(
+            [row.fields["name"] for row in array],
+            [f"Imp {index}" for index in range(5)],
+        )
+        self.assertEqual([row.pk for row in json_lines], list(range(5)))
+        with self.assertRaises(ValueError):
+            list(importing.read_json(io.StringIO('[{"name": '), "a"))
+
+    def test_fixed_number_of_queries_per_chunk(self) -> None:
+        def rows(count: int) -> list[importing.Row]:
+            return [
+                importing.Row(
+                    importing.AIRPORT,
+                    None,
+                    {"name": f"Imp {count} {index}", "closest_big_city": "C"},
+                )
+                for index in range(count)
+            ]
+
+        importer = importing.Importer()
+        importer.natural_keys(importing.AIRPORT)
+        with CaptureQueriesContext(connection) as few:
+            importer.run(rows(2))
+        with CaptureQueriesContext(connection) as many:
+            importer.run(rows(50))
+
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(importer.created[importing.AIRPORT], 52)
+
+    def test_crew_conflicts(self) -> None:
+        flight = test_flight()
+        other = Airplane.objects.create(
+            airplane_name="Other",
+            type=flight.airplane.type,
+            rows=1,
+            seats_in_row=1,
+        )
+        crew = Crew.objects.create(first_name="Olena", last_name="Pilot")
+        FlightCrew.objects.create(
+            flight=flight,
+            crew=crew,
+            departure_time=flight.departure_time,
+            arrival_time=flight.arrival_time,
+        )
+
+        def row(airplane: Airplane, departure: str, arrival: str):
+            return importing.Row(
+                importing.FLIGHT,
+                None,
+                {
+                    "route": flight.route_id,
+                    "airplane": airplane.id,
+                    "departure_time": departure,
+                    "arrival_time": arrival,
+                    "crew": [crew.id],
+                },
+            )
+
+        with self.assertRaises(importing.InvalidRows) as raised:
+            importing.Importer().run(
+                [
+                    row(other, "2023-07-20T00:00Z", "2023-07-20T02:00Z"),
+                    row(
+                        flight.airplane,
+                        "2030-01-01T08:00Z",
+                        "2030-01-01T10:00Z",
+                    ),
+                    row(other, "2030-01-01T12:00Z", "2030-01-01T14:00Z"),
+                ]
+            )
+
+        self.assertEqual(
+            [number for number, _ in raised.exception.errors], [1, 2, 3]
+        )
+        self.assertIn(str(flight.id), raised.exception.errors[0][1]["crew"][0])
+        self.assertIn("rows 3", raised.exception.errors[1][1]["crew"][0])
+        self.assertFalse(Flight.objects.filter(airplane=other).exists())
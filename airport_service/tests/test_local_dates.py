@@ -0,0 +1,116 @@
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service import schedules
+from airport_service.models import DailyRollup, Flight, FlightSchedule
+from airport_service.tests.test_order_api import test_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+AIRPORT_URL = reverse("airport:airport-list")
+
+# Already the 6th in Kyiv, still the 5th in New York.
+START = datetime(2030, 4, 5, 23, 30, tzinfo=ZoneInfo("UTC"))
+
+
+class LocalDepartureDateTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=2)
+        )
+        self.airport = self.flight.route.source
+
+    def listed(self, day: str) -> list[int]:
+        response = self.client.get(FLIGHT_URL, {"date": day})
+        return [flight["id"] for flight in response.data["results"]]
+
+    def test_server_time_zone_by_default(self) -> None:
+        self.assertEqual(self.flight.departure_local_date, date(2030, 4, 6))
+        self.assertEqual(self.listed("2030-04-06"), [self.flight.id])
+
+    def test_airport_time_zone(self) -> None:
+        self.airport.timezone = "America/New_York"
+        self.airport.save()
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.departure_local_date, date(2030, 4, 5))
+        self.assertEqual(self.listed("2030-04-05"), [self.flight.id])
+        self.assertEqual(self.listed("2030-04-06"), [])
+        self.assertEqual(
+            list(
+                DailyRollup.objects.filter(
+                    route=self.flight.route
+                ).values_list("day", flat=True)
+            ),
+            [date(2030, 4, 5)],
+        )
+
+        self.flight.departure_time += timedelta(hours=6)
+        self.flight.save()
+        self.assertEqual(self.listed("2030-04-06"), [self.flight.id])
+
+    def test_date_filter_uses_index(self) -> None:
+        plan = Flight.objects.filter(
+            departure_local_date=date(2030, 4, 6)
+        ).explain()
+
+        self.assertIn("flight_local_date_idx", plan)
+
+    def test_backfill_command(self) -> None:
+        Flight.objects.filter(pk=self.flight.pk).update(
+            departure_local_date=None
+        )
+        out = StringIO()
+
+        call_command("backfill_local_dates", "--missing", stdout=out)
+
+        self.assertIn("1 flight(s) updated", out.getvalue())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.departure_local_date, date(2030, 4, 6))
+
+    def test_invalid_time_zone_rejected(self) -> None:
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@test.com", "Test1234", is_staff=True
+            )
+        )
+
+        response = self.client.post(
+            AIRPORT_URL,
+            {"name": "Z", "closest_big_city": "Z", "timezone": "Mars/Base"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("timezone", response.data)
+
+    def test_schedule_departs_in_airport_time_zone(self) -> None:
+        self.airport.timezone = "Asia/Tokyo"
+        self.airport.save()
+        schedule = FlightSchedule.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure=time(7, 30),
+            duration=timedelta(hours=2),
+            valid_from=date(2030, 1, 1),
+        )
+
+        schedules.materialize(
+            [schedule],
+            days=0,
+            now=datetime(2030, 1, 7, tzinfo=ZoneInfo("Asia/Tokyo")),
+        )
+
+        flight = schedule.flights.get()
+        self.assertEqual(flight.departure_local_date, date(2030, 1, 7))
+        self.assertEqual(
+            flight.departure_time,
+            datetime(2030, 1, 7, 7, 30, tzinfo=ZoneInfo("Asia/Tokyo")),
+        )
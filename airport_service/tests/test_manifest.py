@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Flight, Order, Ticket
+from airport_service.tests.test_order_api import test_flight
+
+DAY_MANIFEST_URL = reverse("airport:flight-day-manifest")
+
+START = timezone.make_aware(datetime(2030, 4, 5, 9))
+
+
+def manifest_url(flight_id: int) -> str:
+    return reverse("airport:flight-manifest", args=[flight_id])
+
+
+def content(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+class ManifestApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.passenger = get_user_model().objects.create_user(
+            "passenger@test.com",
+            "Test1234",
+            first_name="Olena",
+            last_name="Teliha",
+        )
+        self.client.force_authenticate(self.admin)
+        self.flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=2)
+        )
+
+    def sell(self, flight: Flight, seats) -> None:
+        order = Order.objects.create(user=self.passenger)
+        for row, seat in seats:
+            Ticket.objects.create(
+                order=order, flight=flight, row=row, seat=seat
+            )
+
+    def other_flight(self, departure: datetime) -> Flight:
+        return Flight.objects.create(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+        )
+
+    def test_admin_required(self) -> None:
+        self.client.force_authenticate(self.passenger)
+
+        response = self.client.get(manifest_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_flight_manifest_csv(self) -> None:
+        self.sell(self.flight, [(2, 1), (1, 3)])
+
+        response = self.client.get(manifest_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        self.assertEqual(
+            [(row["row"], row["seat"]) for row in rows],
+            [("1", "3"), ("2", "1")],
+        )
+        self.assertEqual(rows[0]["email"], "passenger@test.com")
+        self.assertEqual(rows[0]["last_name"], "Teliha")
+        self.assertEqual(rows[0]["source"], "Test")
+
+    def test_flight_manifest_ndjson(self) -> None:
+        self.sell(self.flight, [(1, 1)])
+
+        response = self.client.get(
+            manifest_url(self.flight.id), {"export": "ndjson"}
+        )
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["flight"], self.flight.id)
+        self.assertEqual(
+            datetime.fromisoformat(lines[0]["departure_time"]), START
+        )
+
+    def test_day_manifest(self) -> None:
+        evening = self.other_flight(START + timedelta(hours=10))
+        next_day = self.other_flight(START + timedelta(days=1))
+        self.sell(self.flight, [(1, 1)])
+        self.sell(evening, [(1, 1), (1, 2)])
+        self.sell(next_day, [(1, 1)])
+
+        response = self.client.get(
+            DAY_MANIFEST_URL, {"date": START.date().isoformat()}
+        )
+
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        self.assertEqual(
+            [int(row["flight"]) for row in rows],
+            [self.flight.id, evening.id, evening.id],
+        )
+
+    def test_day_manifest_params_validated(self) -> None:
+        response = self.client.get(
+            DAY_MANIFEST_URL, {"date": "2030-04-05", "export": "xml"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("export", response.data)
+
+        response = self.client.get(DAY_MANIFEST_URL)
+        self.assertIn("date", response.data)
+
+    def test_queries_independent_of_passengers(self) -> None:
+        busy = self.other_flight(START + timedelta(days=2))
+        self.sell(self.flight, [(1, 1)])
+        self.sell(busy, [(row, seat) for row in (1, 2, 3) for seat in (1, 2)])
+
+        with CaptureQueriesContext(connection) as few:
+            content(self.client.get(manifest_url(self.flight.id)))
+        with CaptureQueriesContext(connection) as many:
+            content(self.client.get(manifest_url(busy.id)))
+
+        self.assertEqual(len(few), len(many))
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.metrics import exposition, registry
+
+FLIGHT_URL = reverse("airport:flight-list")
+METRICS_URL = reverse("metrics")
+FLIGHT_LIST = 'view="airport:flight-list",action="list"'
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        registry.reset()
+
+    def get_metrics(self):
+        return self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+
+    @override_settings(FLIGHT_SEARCH_CACHE_TIMEOUT=0)
+    def test_request_metrics_exposed(self) -> None:
+        self.client.get(FLIGHT_URL)
+        self.client.get(FLIGHT_URL)
+
+        response = self.get_metrics()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn(
+            "# TYPE airport_http_request_duration_seconds histogram", body
+        )
+        self.assertIn(
+            "airport_http_requests_total"
+            f'{{{FLIGHT_LIST},method="GET",status="200"}} 2.0',
+            body,
+        )
+        self.assertIn(
+            "airport_http_request_duration_seconds_bucket"
+            f'{{{FLIGHT_LIST},le="+Inf"}} 2',
+            body,
+        )
+        self.assertIn(
+            f"airport_serializer_duration_seconds_count{{{FLIGHT_LIST}}}",
+            body,
+        )
+        self.assertIn(f"airport_response_bytes_count{{{FLIGHT_LIST}}}", body)
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        labels = (("view", "test"), ("action", "list"))
+        for value in (0, 1, 3, 500):
+            registry.observe("airport_db_queries", labels, value)
+
+        body = exposition(registry.collect())
+
+        bucket = 'airport_db_queries_bucket{view="test",action="list",le='
+        self.assertIn(f'{bucket}"0"}} 1', body)
+        self.assertIn(f'{bucket}"5"}} 3', body)
+        self.assertIn(f'{bucket}"+Inf"}} 4', body)
+        self.assertIn(
+            'airport_db_queries_sum{view="test",action="list"} 504', body
+        )
+
+    def test_token_required(self) -> None:
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.assertEqual(self.get_metrics().status_code, status.HTTP_200_OK)
+        with override_settings(METRICS_TOKEN=None):
+            response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_worker_dumps_merged(self) -> None:
+        labels = [["view", "test"], ["action", "list"]]
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, "1.json").write_text(
+                json.dumps(
+                    {
+                        "counters": [
+                            ["airport_http_requests_total", labels, 3]
+                        ],
+                        "histograms": [],
+                    }
+                )
+            )
+            registry.inc(
+                "airport_http_requests_total",
+                (("view", "test"), ("action", "list")),
+                2,
+            )
+
+            with override_settings(METRICS_DIR=directory):
+                body = self.get_metrics().content.decode()
+
+        self.assertIn(
+            'airport_http_requests_total{view="test",action="list"} 5.0',
+            body,
+        )
+
+    def test_dumps_of_exited_workers_pruned(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            # Above the kernel's pid_max, so no such process.
+            dump = Path(directory, f"{2 ** 22 + 1}.json")
+            dump.write_text(json.dumps({"counters": [], "histograms": []}))
+
+            with override_settings(METRICS_DIR=directory):
+                self.get_metrics()
+
+            self.assertFalse(dump.exists())
+            self.assertTrue(Path(directory, f"{os.getpid()}.json").exists())
@@ -0,0 +1,137 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import (
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Flight,
+    Order,
+    Ticket,
+)
+from airport_service.reference import references
+
+ORDER_URL = reverse("airport:order-list")
+UNIQUE_ERROR = "The fields flight, row, seat must make a unique set."
+
+
+def test_flight(**params) -> Flight:
+    airplane_type = AirplaneType.objects.create(airplane_type="test type")
+    airplane = Airplane.objects.create(
+        airplane_name="Test", type=airplane_type, rows=3, seats_in_row=3
+    )
+    airport1 = Airport.objects.create(name="Test", closest_big_city="Kyiv")
+    airport2 = Airport.objects.create(name="Test2", closest_big_city="Test2")
+    route = Route.objects.create(
+        source=airport1, destination=airport2, distance=1000
+    )
+    defaults = {
+        "route": route,
+        "airplane": airplane,
+        "departure_time": "2023-07-19T19:30:46+03:00",
+        "arrival_time": "2023-07-19T21:30:00+03:00",
+    }
+    defaults.update(**params)
+    return Flight.objects.create(**defaults)
+
+
+class UnauthenticatedOrderApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_auth_required(self) -> None:
+        response = self.client.get(ORDER_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedOrderApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test123@test.com",
+            "Test1234",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = test_flight()
+
+    def order(self, *seats):
+        payload = {
+            "tickets": [
+                {"flight": self.flight.id, "row": row, "seat": seat}
+                for row, seat in seats
+            ]
+        }
+        return self.client.post(ORDER_URL, payload, format="json")
+
+    def test_create_group_order(self) -> None:
+        seats = [(row, seat) for row in range(1, 4) for seat in range(1, 4)]
+        # Seat ranges are checked against the cached airplane.
+        references.get(Airplane, self.flight.airplane_id)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.order(*seats)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertLessEqual(len(queries), 18)
+        self.assertEqual(
+            set(
+                Ticket.objects.filter(flight=self.flight).values_list(
+                    "row", "seat"
+                )
+            ),
+            set(seats),
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 9)
+        self.assertEqual(
+            list(self.flight.get_seat_map().taken_seats()), seats
+        )
+
+    def test_taken_seat_rejected(self) -> None:
+        self.order((1, 1))
+
+        response = self.order((1, 2), (1, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"],
+            [{}, {"non_field_errors": [UNIQUE_ERROR]}],
+        )
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 1)
+
+    def test_duplicate_seat_in_order_rejected(self) -> None:
+        response = self.order((2, 2), (2, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"],
+            [{}, {"non_field_errors": [UNIQUE_ERROR]}],
+        )
+
+    def test_seat_out_of_range_rejected(self) -> None:
+        response = self.order((4, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"],
+            [{"non_field_errors": ["row should be in range: [1, 3]"]}],
+        )
+
+    def test_unknown_flight_rejected(self) -> None:
+        response = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"flight": 0, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"][0]["flight"][0].code, "does_not_exist"
+        )
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Airport, Flight, Order, Ticket
+from airport_service.querybudget import (
+    QueryBudgetExceeded,
+    QueryRecorder,
+    assert_query_budget,
+)
+from airport_service.tests.test_order_api import test_flight
+from airport_service.views import AirportViewSet
+
+AIRPORT_URL = reverse("airport:airport-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    @override_settings(QUERY_BUDGET={"SAMPLE_RATE": 1.0, "HEADERS": True})
+    def test_query_headers(self) -> None:
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-DB-Queries"], "2")
+        self.assertIn("X-DB-Time-Ms", response)
+
+    @override_settings(QUERY_BUDGET={"SAMPLE_RATE": 0.0, "HEADERS": True})
+    def test_unsampled_request_not_measured(self) -> None:
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertNotIn("X-DB-Queries", response)
+
+    @override_settings(QUERY_BUDGET={"SAMPLE_RATE": 1.0, "RAISE": True})
+    def test_budget_exceeded_raises(self) -> None:
+        with mock.patch.object(AirportViewSet, "query_budget", {"list": 1}):
+            with self.assertRaisesMessage(
+                QueryBudgetExceeded, "airport:airport-list ran 2 queries"
+            ):
+                self.client.get(AIRPORT_URL)
+
+            # Actions left out of the mapping have no budget.
+            airport = Airport.objects.create(
+                name="Test", closest_big_city="Test"
+            )
+            response = self.client.get(
+                reverse("airport:airport-detail", args=[airport.id])
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(QUERY_BUDGET={"SAMPLE_RATE": 1.0})
+    def test_budget_exceeded_logged(self) -> None:
+        with mock.patch.object(AirportViewSet, "query_budget", 1):
+            with self.assertLogs("airport_service.querybudget") as logs:
+                response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("its budget is 1", logs.output[0])
+
+
+class AssertQueryBudgetTests(TestCase):
+    def test_repeated_queries_detected(self) -> None:
+        with self.assertRaisesMessage(AssertionError, "repeated 5 times"):
+            with assert_query_budget(max_repeats=1):
+                for flight in Flight.objects.all():
+                    str(flight)
+
+    def test_max_queries(self) -> None:
+        with self.assertRaisesMessage(AssertionError, "expected 0"):
+            with assert_query_budget(max_queries=0):
+                Airport.objects.count()
+
+        with assert_query_budget(max_queries=1, max_repeats=1) as queries:
+            list(Flight.objects.select_related("route__source"))
+        self.assertEqual(queries.count, 1)
+
+    def test_shapes_tracked_on_demand(self) -> None:
+        with QueryRecorder(track_shapes=False) as recorder:
+            Airport.objects.count()
+
+        self.assertEqual(recorder.count, 1)
+        self.assertFalse(recorder.shapes)
+
+    def test_order_list_has_no_n_plus_one(self) -> None:
+        user = get_user_model().objects.create_user("u@test.com", "Test1234")
+        flight = test_flight()
+        for row in range(1, 4):
+            order = Order.objects.create(user=user)
+            Ticket.objects.create(order=order, flight=flight, row=row, seat=1)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with assert_query_budget(max_queries=7, max_repeats=2):
+            response = client.get(ORDER_URL)
+
+        self.assertEqual(len(response.data["results"]), 3)
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service import caching
+from airport_service.metrics import registry
+from airport_service.models import Airplane, DataVersion, Route
+from airport_service.reference import references
+from airport_service.tests.test_order_api import test_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+def lookups(model: str, result: str) -> float:
+    return registry.counters[
+        "airport_reference_cache_total",
+        (("model", model), ("result", result)),
+    ]
+
+
+class ReferenceCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.flight = test_flight()
+        self.route = self.flight.route
+        # Lookups below run as a request, reading the version once.
+        caching.start_request()
+        self.addCleanup(caching.finish_request)
+
+    def test_read_through(self) -> None:
+        hits, misses = lookups("route", "hit"), lookups("route", "miss")
+
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                str(references.get(Route, self.route.id)), "Test to Test2"
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                str(references.get(Route, self.route.id)), "Test to Test2"
+            )
+        with self.assertRaises(Route.DoesNotExist):
+            references.get(Route, 0)
+
+        self.assertEqual(lookups("route", "hit") - hits, 1)
+        self.assertEqual(lookups("route", "miss") - misses, 2)
+
+    def test_invalidated_by_writes(self) -> None:
+        references.get(Route, self.route.id)
+
+        self.route.source.name = "Renamed"
+        self.route.source.save()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                str(references.get(Route, self.route.id)), "Renamed to Test2"
+            )
+
+    @override_settings(REFERENCE_CACHE_SIZE=0)
+    def test_can_be_disabled(self) -> None:
+        references.get(Route, self.route.id)
+
+        with self.assertNumQueries(1):
+            references.get(Route, self.route.id)
+
+    def test_invalidated_by_other_processes(self) -> None:
+        references.get(Route, self.route.id)
+        # A write committed by another worker process.
+        DataVersion.objects.filter(name="reference").update(token="other")
+
+        with self.assertNumQueries(0):
+            references.get(Route, self.route.id)
+        caching.start_request()
+        with self.assertNumQueries(2):
+            references.get(Route, self.route.id)
+
+    def test_flight_list_and_detail(self) -> None:
+        client = APIClient()
+        self.route.destination.name = "Odesa"
+        self.route.destination.save()
+
+        response = client.get(FLIGHT_URL, {"date": "2023-07-19"})
+        self.assertEqual(
+            [flight["route"] for flight in response.data["results"]],
+            ["Test to Odesa"],
+        )
+
+        # The reference data version, the flight and its crew.
+        with self.assertNumQueries(3):
+            response = client.get(
+                reverse("airport:flight-detail", args=[self.flight.id])
+            )
+        self.assertEqual(response.data["route"]["destination"], "Odesa")
+        self.assertEqual(response.data["airplane"]["capacity"], 9)
+
+    def test_ticket_validation(self) -> None:
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "Test1234")
+        )
+        references.get(Airplane, self.flight.airplane_id)
+
+        self.flight.airplane.rows = 2
+        self.flight.airplane.save()
+        response = client.post(
+            ORDER_URL,
+            {"tickets": [{"flight": self.flight.id, "row": 3, "seat": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("[1, 2]", str(response.data))
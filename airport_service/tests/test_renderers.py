@@ -0,0 +1,70 @@
+import json
+import unittest
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from airport_service import renderers
+from airport_service.renderers import MessagePackRenderer, ORJSONRenderer
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+PAYLOAD = {
+    "id": 1,
+    "name": "Київ\u2028Бориспіль",
+    "departure_time": datetime(2031, 1, 2, 3, 4, 5, 678901, dt_timezone.utc),
+    "price": Decimal("10.50"),
+    "seats": [{"row": 1, "seat": 2}, (3, 4)],
+}
+
+
+@unittest.skipIf(renderers.orjson is None, "orjson is not installed")
+class ORJSONRendererTests(TestCase):
+    def test_same_bytes_as_json_renderer(self) -> None:
+        payload = {**PAYLOAD, 7: None}
+
+        self.assertEqual(
+            ORJSONRenderer().render(payload), JSONRenderer().render(payload)
+        )
+
+    def test_api_json_unchanged(self) -> None:
+        client = APIClient()
+
+        response = client.get(FLIGHT_URL, HTTP_ACCEPT="application/json")
+        indented = client.get(
+            FLIGHT_URL, HTTP_ACCEPT="application/json; indent=2"
+        )
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.content, JSONRenderer().render(response.data)
+        )
+        self.assertEqual(
+            indented.content.decode(),
+            json.dumps(
+                json.loads(response.content), indent=2, ensure_ascii=False
+            ),
+        )
+
+
+@unittest.skipIf(renderers.msgpack is None, "msgpack is not installed")
+class MessagePackRendererTests(TestCase):
+    def test_json_shape(self) -> None:
+        data = renderers.msgpack.unpackb(MessagePackRenderer().render(PAYLOAD))
+
+        self.assertEqual(data, json.loads(JSONRenderer().render(PAYLOAD)))
+
+    def test_negotiated_by_accept(self) -> None:
+        client = APIClient()
+
+        response = client.get(FLIGHT_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            renderers.msgpack.unpackb(response.content),
+            json.loads(client.get(FLIGHT_URL).content),
+        )
@@ -0,0 +1,293 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service import reporting
+from airport_service.models import (
+    Airplane,
+    AirplaneType,
+    DailyRollup,
+    Flight,
+    Order,
+    RollupWatermark,
+    Ticket,
+)
+from airport_service.tests.test_order_api import test_flight
+
+REPORT_URL = reverse("airport:load-factor-report-list")
+
+START = timezone.make_aware(datetime(2030, 4, 5, 9))
+DAY = date(2030, 4, 5)
+
+
+def rollups() -> list[tuple]:
+    # Of the test flights, not the ones of the initial data.
+    return list(
+        DailyRollup.objects.filter(route__source__name="Test")
+        .order_by("day", "airplane_type_id")
+        .values_list(
+            "day",
+            "airplane_type__airplane_type",
+            "flights",
+            "capacity",
+            "seats_sold",
+        )
+    )
+
+
+class RollupTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "passenger@test.com", "Test1234"
+        )
+        self.flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=2)
+        )
+
+    def other_flight(self, departure: datetime, **params) -> Flight:
+        params.setdefault("airplane", self.flight.airplane)
+        return Flight.objects.create(
+            route=self.flight.route,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+            **params,
+        )
+
+    def sell(self, flight: Flight, seats) -> list[Ticket]:
+        order = Order.objects.create(user=self.user)
+        return [
+            Ticket.objects.create(
+                order=order, flight=flight, row=row, seat=seat
+            )
+            for row, seat in seats
+        ]
+
+    def test_updated_by_ticket_sales(self) -> None:
+        self.other_flight(START + timedelta(hours=6))
+        tickets = self.sell(self.flight, [(1, 1), (1, 2), (2, 1)])
+
+        tickets[0].delete()
+
+        self.assertEqual(rollups(), [(DAY, "test type", 2, 18, 2)])
+        rollup = DailyRollup.objects.get(route=self.flight.route)
+        self.assertAlmostEqual(rollup.load_factor, 2 / 18)
+
+    def test_moved_flight(self) -> None:
+        self.sell(self.flight, [(1, 1)])
+        jet = Airplane.objects.create(
+            airplane_name="Jet",
+            type=AirplaneType.objects.create(airplane_type="jet"),
+            rows=10,
+            seats_in_row=4,
+        )
+
+        self.flight.departure_time += timedelta(days=1)
+        self.flight.arrival_time += timedelta(days=1)
+        self.flight.airplane = jet
+        self.flight.save()
+
+        self.assertEqual(
+            rollups(), [(DAY + timedelta(days=1), "jet", 1, 40, 1)]
+        )
+
+        self.flight.delete()
+
+        self.assertEqual(rollups(), [])
+
+    def test_catch_up_after_bulk_inserts(self) -> None:
+        reporting.catch_up()
+        flights = Flight.objects.bulk_create(
+            Flight(
+                route=self.flight.route,
+                airplane=self.flight.airplane,
+                departure_time=START + timedelta(days=days),
+                arrival_time=START + timedelta(days=days, hours=2),
+                departure_local_date=DAY + timedelta(days=days),
+            )
+            for days in (1, 2)
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.bulk_create(
+            Ticket(order=order, flight=flight, row=1, seat=1)
+            for flight in (self.flight, flights[0])
+        )
+
+        self.assertEqual(reporting.catch_up(batch_size=1), 4)
+
+        self.assertEqual(
+            rollups(),
+            [
+                (DAY, "test type", 1, 9, 1),
+                (DAY + timedelta(days=1), "test type", 1, 9, 1),
+                (DAY + timedelta(days=2), "test type", 1, 9, 0),
+            ],
+        )
+        self.assertEqual(
+            RollupWatermark.objects.get(name="flight").value, flights[1].id
+        )
+        self.assertEqual(reporting.catch_up(), 0)
+
+    def test_catch_up_counts_bulk_created_tickets(self) -> None:
+        reporting.catch_up()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.bulk_create(
+            Ticket(order=order, flight=self.flight, row=1, seat=seat)
+            for seat in (1, 2)
+        )
+
+        self.assertEqual(reporting.catch_up(), 2)
+
+        self.assertEqual(
+            DailyRollup.objects.get(route=self.flight.route).seats_sold, 2
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2)
+        self.assertTrue(self.flight.get_seat_map().is_taken(1, 2))
+
+    def test_catch_up_rereads_late_commits(self) -> None:
+        reporting.catch_up()
+        DailyRollup.objects.all().delete()
+        # Committed after higher ids were read.
+        RollupWatermark.objects.filter(name="flight").update(
+            value=self.flight.id + 10
+        )
+
+        self.assertEqual(reporting.catch_up(), 0)
+
+        self.assertEqual(rollups(), [(DAY, "test type", 1, 9, 0)])
+
+    def test_rebuild(self) -> None:
+        self.other_flight(START + timedelta(days=1))
+        self.sell(self.flight, [(1, 1)])
+        expected = rollups()
+        DailyRollup.objects.update(seats_sold=5)
+
+        self.assertEqual(reporting.rebuild(start=DAY, end=DAY), 1)
+        self.assertEqual(rollups()[0], expected[0])
+        self.assertEqual(rollups()[1][4], 5)
+
+        reporting.rebuild()
+        self.assertEqual(rollups(), expected)
+
+    def test_command(self) -> None:
+        DailyRollup.objects.all().delete()
+        out = StringIO()
+
+        call_command("update_rollups", stdout=out)
+
+        self.assertIn("new ticket(s) and flight(s)", out.getvalue())
+        self.assertEqual(rollups(), [(DAY, "test type", 1, 9, 0)])
+
+
+class LoadFactorReportTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        # Rolled up as an empty flight of the day.
+        flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=2)
+        )
+        self.route = flight.route
+        self.airplane_type = flight.airplane.type
+        other_type = AirplaneType.objects.create(airplane_type="other")
+        for day, airplane_type, capacity, seats_sold in (
+            (DAY, other_type, 100, 50),
+            (DAY + timedelta(days=1), self.airplane_type, 9, 9),
+            (DAY + timedelta(days=40), self.airplane_type, 9, 3),
+        ):
+            DailyRollup.objects.create(
+                day=day,
+                route=self.route,
+                airplane_type=airplane_type,
+                flights=1,
+                capacity=capacity,
+                seats_sold=seats_sold,
+            )
+
+    def test_admin_required(self) -> None:
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "Test1234")
+        )
+
+        response = self.client.get(REPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_grouped_by_day(self) -> None:
+        response = self.client.get(
+            REPORT_URL,
+            {"start": "2030-04-05", "end": "2030-04-06", "group_by": "day"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "day": "2030-04-05",
+                    "flights": 2,
+                    "capacity": 109,
+                    "seats_sold": 50,
+                    "load_factor": 0.4587,
+                },
+                {
+                    "day": "2030-04-06",
+                    "flights": 1,
+                    "capacity": 9,
+                    "seats_sold": 9,
+                    "load_factor": 1.0,
+                },
+            ],
+        )
+
+    def test_filtered_totals(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                REPORT_URL,
+                {
+                    "start": "2030-01-01",
+                    "end": "2030-12-31",
+                    "group_by": "route,airplane_type",
+                    "airplane_type": self.airplane_type.id,
+                },
+            )
+
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "route": self.route.id,
+                    "airplane_type": self.airplane_type.id,
+                    "flights": 3,
+                    "capacity": 27,
+                    "seats_sold": 12,
+                    "load_factor": 0.4444,
+                }
+            ],
+        )
+
+    def test_params_validated(self) -> None:
+        response = self.client.get(REPORT_URL, {"group_by": "day,airline"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("group_by", response.data)
+
+        response = self.client.get(
+            REPORT_URL, {"start": "2028-01-01", "end": "2030-01-01"}
+        )
+        self.assertIn("end", response.data)
+
+        response = self.client.get(
+            REPORT_URL,
+            {"start": "2029-07-01", "end": "2030-06-30", "group_by": ""},
+        )
+        self.assertEqual(response.data[0]["flights"], 4)
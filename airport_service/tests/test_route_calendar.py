@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Flight, Order, Route, Ticket
+from airport_service.tests.test_order_api import test_flight
+
+PAIR_CALENDAR_URL = reverse("airport:route-pair-calendar")
+
+START = timezone.make_aware(datetime(2030, 4, 5, 9))
+
+
+def calendar_url(route_id: int) -> str:
+    return reverse("airport:route-calendar", args=[route_id])
+
+
+class RouteCalendarApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "passenger@test.com", "Test1234"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = test_flight(
+            departure_time=START, arrival_time=START + timedelta(hours=2)
+        )
+        self.route = self.flight.route
+        for departure in (
+            START + timedelta(hours=8),
+            START + timedelta(days=2),
+            START + timedelta(days=30),
+        ):
+            Flight.objects.create(
+                route=self.route,
+                airplane=self.flight.airplane,
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+            )
+
+    def sell(self, flight: Flight) -> None:
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=flight, row=1, seat=1)
+
+    def test_calendar(self) -> None:
+        self.sell(self.flight)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                calendar_url(self.route.id), {"month": "2030-04"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 30)
+        self.assertEqual(
+            response.data[4],
+            {"date": "2030-04-05", "flights": 2, "seats_available": 17},
+        )
+        self.assertEqual(response.data[6]["flights"], 1)
+        self.assertEqual(response.data[5]["seats_available"], 0)
+        self.assertNotIn("2030-05-05", [day["date"] for day in response.data])
+
+    def test_pair_calendar(self) -> None:
+        response = self.client.get(
+            PAIR_CALENDAR_URL,
+            {
+                "source": self.route.source_id,
+                "destination": self.route.destination_id,
+                "month": "2030-05",
+            },
+        )
+
+        self.assertEqual(response.data[4]["flights"], 1)
+
+        response = self.client.get(
+            PAIR_CALENDAR_URL,
+            {
+                "source": self.route.destination_id,
+                "destination": self.route.source_id,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_month_validated(self) -> None:
+        response = self.client.get(
+            calendar_url(self.route.id), {"month": "2030-13"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("month", response.data)
+
+    def test_revalidated_until_route_tickets_sold(self) -> None:
+        url = calendar_url(self.route.id)
+        other_route = Route.objects.create(
+            source=self.route.destination,
+            destination=self.route.source,
+            distance=1000,
+        )
+        other_flight = Flight.objects.create(
+            route=other_route,
+            airplane=self.flight.airplane,
+            departure_time=START + timedelta(days=1),
+            arrival_time=START + timedelta(days=1, hours=2),
+        )
+        response = self.client.get(url, {"month": "2030-04"})
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        self.sell(other_flight)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                url, {"month": "2030-04"}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.sell(self.flight)
+        response = self.client.get(
+            url, {"month": "2030-04"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data[4]["seats_available"], 17)
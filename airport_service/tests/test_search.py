@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport_service.models import Airport, AirplaneType, Route
+from airport_service.search import normalize, text_search
+
+ROUTE_URL = reverse("airport:route-list")
+
+
+class TextSearchTests(TestCase):
+    def setUp(self) -> None:
+        self.krakow = Airport.objects.create(
+            name="Balice", closest_big_city="Kraków"
+        )
+        self.sao_paulo = Airport.objects.create(
+            name="Guarulhos", closest_big_city="São Paulo"
+        )
+
+    def test_normalize(self) -> None:
+        self.assertEqual(normalize("  São   PAULO "), "sao paulo")
+
+    def test_search_fields_updated_on_save(self) -> None:
+        self.krakow.closest_big_city = "Cracow"
+        self.krakow.save()
+
+        self.assertEqual(self.krakow.closest_big_city_search, "cracow")
+        self.assertIn(
+            self.krakow.id,
+            Airport.objects.filter(
+                id__in=text_search(Airport, "closest_big_city", "CRAC")
+            ).values_list("id", flat=True),
+        )
+
+    def test_substring_case_and_accent_insensitive(self) -> None:
+        for term in ("kraków", "rako", "KRAK", "aulo", "sao p"):
+            airports = Airport.objects.filter(
+                id__in=text_search(Airport, "closest_big_city", term)
+            )
+            self.assertEqual(airports.count(), 1, term)
+
+    def test_short_terms_fall_back_to_column_scan(self) -> None:
+        airports = Airport.objects.filter(
+            id__in=text_search(Airport, "closest_big_city", "ó")
+        )
+
+        self.assertIn(self.krakow, airports)
+        self.assertIn(self.sao_paulo, airports)
+
+    def test_deleted_rows_are_not_found(self) -> None:
+        self.sao_paulo.delete()
+
+        airports = Airport.objects.filter(
+            id__in=text_search(Airport, "name", "guarul")
+        )
+
+        self.assertFalse(airports.exists())
+
+    def test_airplane_type_search(self) -> None:
+        airplane_type = AirplaneType.objects.create(airplane_type="Wide-body")
+
+        airplane_types = AirplaneType.objects.filter(
+            id__in=text_search(AirplaneType, "airplane_type", "e-BOD")
+        )
+
+        self.assertEqual(list(airplane_types), [airplane_type])
+
+    def test_route_filter_by_city(self) -> None:
+        route = Route.objects.create(
+            source=self.krakow, destination=self.sao_paulo, distance=10000
+        )
+        Route.objects.create(
+            source=self.sao_paulo, destination=self.krakow, distance=10000
+        )
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin123@admin.com", "test1234", is_staff=True
+            )
+        )
+
+        response = client.get(ROUTE_URL, {"source": "krak"})
+
+        self.assertEqual(
+            [result["id"] for result in response.data["results"]], [route.id]
+        )
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import (
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Flight,
+    SeatHold,
+    Ticket,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def holds_url(flight_id: int):
+    return reverse_lazy("airport:flight-holds", args=[flight_id])
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self) -> None:
+        airplane_type = AirplaneType.objects.create(airplane_type="test type")
+        airplane = Airplane.objects.create(
+            airplane_name="Test", type=airplane_type, rows=2, seats_in_row=2
+        )
+        airport1 = Airport.objects.create(name="Test", closest_big_city="Kyiv")
+        airport2 = Airport.objects.create(
+            name="Test2", closest_big_city="Test2"
+        )
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=1000
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-19T19:30:46+03:00",
+            arrival_time="2023-07-19T21:30:00+03:00",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test1@test.com", "Test1234")
+        )
+        self.other_client = APIClient()
+        self.other_client.force_authenticate(
+            get_user_model().objects.create_user("test2@test.com", "Test1234")
+        )
+
+    def hold(self, client, *seats):
+        return client.post(
+            holds_url(self.flight.id),
+            {"seats": [{"row": row, "seat": seat} for row, seat in seats]},
+            format="json",
+        )
+
+    def order(self, client, *seats):
+        return client.post(
+            ORDER_URL,
+            {
+                "tickets": [
+                    {"flight": self.flight.id, "row": row, "seat": seat}
+                    for row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_hold_seats(self) -> None:
+        response = self.hold(self.client, (1, 1), (1, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["seats"],
+            [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        )
+        self.assertEqual(SeatHold.objects.count(), 2)
+
+    def test_held_seat_conflict(self) -> None:
+        self.hold(self.client, (1, 1))
+
+        response = self.hold(self.other_client, (1, 1), (2, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["seats"], [{"row": 1, "seat": 1}])
+        self.assertFalse(SeatHold.objects.filter(row=2, seat=2).exists())
+
+    def test_sold_seat_conflict(self) -> None:
+        self.order(self.client, (2, 1))
+
+        response = self.hold(self.other_client, (2, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    @override_settings(SEAT_HOLD_MAX_SEATS=2)
+    def test_held_seats_capped_per_user(self) -> None:
+        self.hold(self.client, (1, 1), (1, 2))
+
+        rejected = self.hold(self.client, (2, 1))
+        renewed = self.hold(self.client, (1, 2))
+        other = self.hold(self.other_client, (2, 1), (2, 2))
+
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(renewed.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(other.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.count(), 4)
+
+    def test_seat_out_of_airplane(self) -> None:
+        response = self.hold(self.client, (3, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_converts_own_holds(self) -> None:
+        self.hold(self.client, (1, 1))
+
+        response = self.order(self.client, (1, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertTrue(Ticket.objects.filter(flight=self.flight).exists())
+
+    def test_order_of_seat_held_by_other_rejected(self) -> None:
+        self.hold(self.client, (1, 1))
+
+        response = self.order(self.other_client, (1, 2), (1, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"][1]["non_field_errors"][0].code, "held"
+        )
+
+    def test_expired_holds_are_replaced_and_swept(self) -> None:
+        self.hold(self.client, (1, 1), (1, 2))
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(1))
+
+        response = self.hold(self.other_client, (1, 1))
+        call_command("sweep_seat_holds", stdout=StringIO())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(SeatHold.objects.values_list("row", "seat")), [(1, 1)]
+        )
+
+    def test_release_holds(self) -> None:
+        self.hold(self.client, (1, 1), (1, 2))
+
+        response = self.client.delete(holds_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    @override_settings(SEAT_HOLD_STORE="airport_service.holds.CacheHoldStore")
+    def test_cache_store(self) -> None:
+        cache.clear()
+        self.hold(self.client, (1, 1))
+
+        conflict = self.hold(self.other_client, (1, 1))
+        rejected = self.order(self.other_client, (1, 1))
+        self.client.delete(holds_url(self.flight.id))
+        released = self.hold(self.other_client, (1, 1))
+
+        self.assertEqual(conflict.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(released.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from airport_service.models import (
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Flight,
+    Order,
+    Ticket,
+)
+
+
+class SeatInventoryTests(TestCase):
+    def setUp(self) -> None:
+        airplane_type = AirplaneType.objects.create(airplane_type="big")
+        airplane = Airplane.objects.create(
+            airplane_name="test", type=airplane_type, rows=3, seats_in_row=4
+        )
+        airport1 = Airport.objects.create(
+            name="test1", closest_big_city="test city1"
+        )
+        airport2 = Airport.objects.create(
+            name="test2", closest_big_city="test city2"
+        )
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=100
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-19T18:30:00+03:00",
+            arrival_time="2023-07-20T18:30:00+03:00",
+        )
+        self.user = get_user_model().objects.create_user(
+            "test123@test.com", "Test1234"
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def test_ticket_create_and_delete_update_counter(self) -> None:
+        ticket = Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=2
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2)
+
+        ticket.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
+
+    def test_order_delete_releases_seats(self) -> None:
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=2, seat=3
+        )
+
+        self.order.delete()
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 0)
+
+    def test_rebuild_command_fixes_stale_counter(self) -> None:
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        Flight.objects.filter(pk=self.flight.pk).update(seats_sold=5)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "rebuild_seat_inventory", "--check", stdout=StringIO()
+            )
+
+        call_command("rebuild_seat_inventory", stdout=StringIO())
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
+        call_command("rebuild_seat_inventory", "--check", stdout=StringIO())
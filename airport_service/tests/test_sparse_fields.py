@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_service.models import Crew, Order, Ticket
+from airport_service.tests.test_order_api import test_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+ROUTE_URL = reverse("airport:route-list")
+AIRPLANE_URL = reverse("airport:airplane-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+def detail_url(flight_id: int) -> str:
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+@override_settings(FLIGHT_SEARCH_CACHE_TIMEOUT=0)
+class SparseFieldsApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "Test1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = test_flight()
+        self.flight.crew.add(
+            Crew.objects.create(first_name="Olena", last_name="Pchilka")
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+
+    def get(self, url: str, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, " ".join(query["sql"] for query in queries)
+
+    def test_flight_list_fields(self) -> None:
+        response, sql = self.get(
+            FLIGHT_URL,
+            date="2023-07-19",
+            fields="id,departure_time,tickets_available",
+        )
+
+        flight = response.data["results"][0]
+        self.assertEqual(
+            list(flight), ["id", "departure_time", "tickets_available"]
+        )
+        self.assertEqual(flight["tickets_available"], 8)
+        self.assertNotIn("airport_service_route", sql)
+
+        response, sql = self.get(FLIGHT_URL, fields="id")
+        self.assertNotIn("airport_service_airplane", sql)
+
+    def test_flight_list_collapsed_relations(self) -> None:
+        response, sql = self.get(FLIGHT_URL, date="2023-07-19", expand="")
+
+        flight = response.data["results"][0]
+        self.assertEqual(flight["route"], self.flight.route_id)
+        self.assertEqual(flight["airplane"], self.flight.airplane_id)
+        self.assertNotIn("airport_service_airport", sql)
+
+    def test_flight_detail(self) -> None:
+        response, sql = self.get(
+            detail_url(self.flight.id), fields="id,route", expand=""
+        )
+        self.assertEqual(
+            response.data,
+            {"id": self.flight.id, "route": self.flight.route_id},
+        )
+        self.assertNotIn("crew", sql)
+        self.assertNotIn("airport_service_airplane", sql)
+
+        response, _ = self.get(detail_url(self.flight.id), expand="crew")
+        self.assertEqual(response.data["crew"], ["Olena Pchilka"])
+        self.assertEqual(response.data["airplane"], self.flight.airplane_id)
+        self.assertEqual(response.data["taken_seats"], [{"row": 1, "seat": 1}])
+
+    def test_fast_path_parity(self) -> None:
+        for url, params in (
+            (FLIGHT_URL, {"fields": "route,arrival_time", "expand": "route"}),
+            (FLIGHT_URL, {"expand": "airplane"}),
+            (ROUTE_URL, {"fields": "source,distance", "expand": ""}),
+            (ORDER_URL, {"fields": "created_at"}),
+            (ORDER_URL, {"fields": "tickets"}),
+        ):
+            with override_settings(FAST_LIST_SERIALIZERS=True):
+                fast, _ = self.get(url, **params)
+            with override_settings(
+                FAST_LIST_SERIALIZERS=False, QUERY_BUDGET={"SAMPLE_RATE": 0}
+            ):
+                regular, _ = self.get(url, **params)
+            self.assertEqual(fast.content, regular.content, (url, params))
+
+    def test_cursor_pagination_with_fields(self) -> None:
+        response, _ = self.get(FLIGHT_URL, fields="id", limit=1)
+        next_page = self.client.get(response.data["next"])
+
+        self.assertEqual(list(response.data["results"][0]), ["id"])
+        self.assertEqual(len(next_page.data["results"]), 1)
+        self.assertNotEqual(
+            next_page.data["results"][0], response.data["results"][0]
+        )
+
+    def test_airplane_list_collapsed_type(self) -> None:
+        response, sql = self.get(AIRPLANE_URL, name="Test", expand="")
+
+        airplane = response.data["results"][0]
+        self.assertEqual(airplane["type"], self.flight.airplane.type_id)
+        self.assertNotIn("airport_service_airplanetype", sql)
+
+    def test_unknown_fields_rejected(self) -> None:
+        response = self.client.get(
+            FLIGHT_URL, {"fields": "id,price", "expand": "crew"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("price", response.data["fields"])
+        self.assertIn("crew", response.data["expand"])
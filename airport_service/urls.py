@@ -8,6 +8,7 @@ from airport_service.views import (
     AirplaneTypeViewSet,
     AirplaneViewSet,
     FlightViewSet,
+    LoadFactorReportViewSet,
     OrderViewSet,
 )
 
@@ -19,6 +20,11 @@ router.register("airports", AirportViewSet)
 router.register("routes", RouteViewSet)
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
+router.register(
+    "reports/load-factor",
+    LoadFactorReportViewSet,
+    basename="load-factor-report",
+)
 
 urlpatterns = [
     path("", include(router.urls)),
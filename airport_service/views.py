@@ -1,57 +1,173 @@
-from datetime import datetime
-
-from django.db.models import F, Count
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+)
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
-
+from rest_framework.response import Response
+
+from airport_service import (
+    availability,
+    holds,
+    inventory,
+    local_dates,
+    manifest,
+    reporting,
+    roster,
+    scheduling,
+)
+from airport_service.batch import (
+    IDS_PARAMETER,
+    BatchRetrieveMixin,
+    BulkWriteMixin,
+)
+from airport_service.caching import (
+    flight_list_cache,
+    route_calendar_cache,
+)
+from airport_service.itineraries import flight_index
+from airport_service.metrics import SerializerMetricsMixin
 from airport_service.models import (
     AirplaneType,
     Airplane,
     Airport,
     Crew,
+    DailyRollup,
     Flight,
+    FlightCrew,
     Order,
     Route,
+    Ticket,
+)
+from airport_service.pagination import (
+    FlightCursorPagination,
+    OrderCursorPagination,
+    ordering_columns,
 )
 from airport_service.permissions import IsAdminOrReadOnly
+from airport_service.search import text_search
+from airport_service.sparse import (
+    SPARSE_PARAMETERS,
+    SparseFieldsViewMixin,
+    select_related,
+)
 from airport_service.serializers import (
     AirplaneTypeSerializer,
     AirplaneSerializer,
     AirplaneListSerializer,
+    AirplaneTimelineSerializer,
+    AirplaneTimelineSearchSerializer,
     AirportSerializer,
+    CalendarDaySerializer,
+    CrewAssignmentSerializer,
+    CrewDutySerializer,
+    CrewRosterSearchSerializer,
     CrewSerializer,
+    DayManifestSearchSerializer,
     FlightSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
+    FlightSeatMapSerializer,
+    ItinerarySerializer,
+    ItinerarySearchSerializer,
+    LoadFactorSearchSerializer,
+    LoadFactorSerializer,
+    ManifestSearchSerializer,
+    SeatHoldSerializer,
     OrderSerializer,
     OrderListSerializer,
+    RouteCalendarPairSearchSerializer,
+    RouteCalendarSearchSerializer,
     RouteSerializer,
     RouteListSerializer,
 )
 
+# Query budgets include the user lookup done by JWT authentication.
+REFERENCE_QUERY_BUDGET = {"list": 3, "retrieve": 2}
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=SPARSE_PARAMETERS),
+    retrieve=extend_schema(parameters=SPARSE_PARAMETERS),
+)
+class AirportServiceViewSet(
+    SparseFieldsViewMixin, SerializerMetricsMixin, viewsets.ModelViewSet
+):
+    pass
+
 
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(BulkWriteMixin, AirportServiceViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = (IsAdminUser,)
+    query_budget = {**REFERENCE_QUERY_BUDGET, "roster": 4}
+
+    def get_serializer_class(self):
+        if self.action == "roster":
+            return CrewDutySerializer
+        return CrewSerializer
+
+    @extend_schema(
+        parameters=[CrewRosterSearchSerializer],
+        responses=CrewDutySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=True, pagination_class=None)
+    def roster(self, request, pk=None):
+        """Flights of the crew member during a time window"""
+        search = CrewRosterSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        crew = self.get_object()
+        duties = roster.roster(
+            crew.id,
+            search.validated_data["from"],
+            search.validated_data["to"],
+            queryset=FlightCrew.objects.select_related(
+                "flight__route__source",
+                "flight__route__destination",
+                "flight__airplane",
+            ),
+        )
+        serializer = self.get_serializer(duties, many=True)
+        return Response(serializer.data)
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(BulkWriteMixin, AirportServiceViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminUser,)
+    query_budget = REFERENCE_QUERY_BUDGET
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
-    queryset = Airplane.objects.select_related("type")
+@extend_schema_view(
+    list=extend_schema(parameters=[*SPARSE_PARAMETERS, IDS_PARAMETER])
+)
+class AirplaneViewSet(
+    BulkWriteMixin, BatchRetrieveMixin, AirportServiceViewSet
+):
+    queryset = Airplane.objects.all()
     serializer_class = AirplaneSerializer
     permission_classes = (IsAdminUser,)
+    query_budget = {**REFERENCE_QUERY_BUDGET, "timeline": 4}
 
     def get_serializer_class(self):
         if self.action == "list":
             return AirplaneListSerializer
+        if self.action == "timeline":
+            return AirplaneTimelineSerializer
         return AirplaneSerializer
 
     def get_queryset(self):
@@ -62,10 +178,22 @@ class AirplaneViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(airplane_name__icontains=name)
 
         if type:
-            queryset = queryset.filter(type__airplane_type__icontains=type)
+            queryset = queryset.filter(
+                type__in=text_search(AirplaneType, "airplane_type", type)
+            )
+        if self.action == "list" and self.expands("type"):
+            queryset = queryset.select_related("type")
 
         return queryset
 
+    def bulk_saved(self, instances: list, created: bool) -> None:
+        super().bulk_saved(instances, created)
+        # The seat map layout depends on the airplane's rows and seats.
+        if not created:
+            flights = Flight.objects.filter(airplane__in=instances)
+            inventory.rebuild(flights)
+            reporting.flights_changed(flights)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -83,39 +211,128 @@ class AirplaneViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[AirplaneTimelineSearchSerializer],
+        responses=AirplaneTimelineSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=True, pagination_class=None)
+    def timeline(self, request, pk=None):
+        """Flights of the airplane in the air during a time window"""
+        search = AirplaneTimelineSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        airplane = self.get_object()
+        flights = scheduling.overlapping(
+            airplane.id,
+            search.validated_data["start"],
+            search.validated_data["end"],
+            queryset=Flight.objects.select_related(
+                "route__source", "route__destination"
+            ),
+        )
+        serializer = self.get_serializer(flights, many=True)
+        return Response(serializer.data)
+
 
-class AirportViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[*SPARSE_PARAMETERS, IDS_PARAMETER])
+)
+class AirportViewSet(
+    BulkWriteMixin, BatchRetrieveMixin, AirportServiceViewSet
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = (IsAdminUser,)
+    query_budget = REFERENCE_QUERY_BUDGET
+
+    def bulk_saved(self, instances: list, created: bool) -> None:
+        super().bulk_saved(instances, created)
+        if not created:
+            moved = self.bulk_changed(instances, "timezone")
+            if moved:
+                local_dates.sync(
+                    Flight.objects.filter(route__source__in=moved)
+                )
 
 
-class RouteViewSet(viewsets.ModelViewSet):
-    queryset = Route.objects.select_related("source", "destination")
+@extend_schema_view(
+    list=extend_schema(parameters=[*SPARSE_PARAMETERS, IDS_PARAMETER])
+)
+class RouteViewSet(
+    BulkWriteMixin, BatchRetrieveMixin, AirportServiceViewSet
+):
+    queryset = Route.objects.all()
     serializer_class = RouteSerializer
     permission_classes = (IsAdminUser,)
+    query_budget = {
+        **REFERENCE_QUERY_BUDGET,
+        "calendar": 3,
+        "pair_calendar": 3,
+    }
 
     def get_serializer_class(self):
         if self.action == "list":
             return RouteListSerializer
+        if self.action in ("calendar", "pair_calendar"):
+            return CalendarDaySerializer
         return RouteSerializer
 
+    def get_permissions(self):
+        if self.action in ("calendar", "pair_calendar"):
+            return [IsAdminOrReadOnly()]
+
+        return super().get_permissions()
+
     def get_queryset(self):
         queryset = self.queryset
+        if self.action in ("calendar", "pair_calendar"):
+            return queryset
         source = self.request.query_params.get("source")
         destination = self.request.query_params.get("destination")
         if source:
             queryset = queryset.filter(
-                source__closest_big_city__icontains=source
+                source__in=text_search(Airport, "closest_big_city", source)
             )
 
         if destination:
             queryset = queryset.filter(
-                destination__closest_big_city__icontains=destination
+                destination__in=text_search(
+                    Airport, "closest_big_city", destination
+                )
+            )
+        if self.action == "list" and settings.FAST_LIST_SERIALIZERS:
+            queryset = self.get_serializer().rows(queryset)
+        elif self.action == "list":
+            queryset = select_related(
+                queryset,
+                (
+                    field
+                    for field in ("source", "destination")
+                    if self.expands(field)
+                ),
             )
 
         return queryset
 
+    def bulk_saved(self, instances: list, created: bool) -> None:
+        super().bulk_saved(instances, created)
+        if not created:
+            moved = self.bulk_changed(instances, "source")
+            if moved:
+                local_dates.sync(Flight.objects.filter(route__in=moved))
+            route_ids = [
+                route.id
+                for route in self.bulk_changed(
+                    instances, "source", "destination", "distance"
+                )
+            ]
+
+            def update_index() -> None:
+                for route_id in route_ids:
+                    flight_index.update_route(route_id)
+
+            if route_ids:
+                transaction.on_commit(update_index)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -133,48 +350,162 @@ class RouteViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    def calendar_response(self, request, route_id: int, month: date):
+        etag = route_calendar_cache.etag(route_id, month.isoformat())
+        headers = {"ETag": quote_etag(etag)}
+        if headers["ETag"] in parse_etags(
+            request.headers.get("If-None-Match", "")
+        ):
+            response = Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        else:
+            data = route_calendar_cache.get(etag)
+            if data is None:
+                data = self.get_serializer(
+                    availability.route_calendar(route_id, month), many=True
+                ).data
+                route_calendar_cache.store(etag, data)
+            response = Response(data, headers=headers)
+        # Cacheable, but revalidated: the ETag changes with every sale.
+        patch_cache_control(response, no_cache=True)
+        return response
 
-class FlightViewSet(viewsets.ModelViewSet):
-    queryset = Flight.objects.select_related(
-        "airplane", "route__source", "route__destination"
+    @extend_schema(
+        parameters=[RouteCalendarSearchSerializer],
+        responses=CalendarDaySerializer(many=True),
     )
+    @action(methods=["GET"], detail=True, pagination_class=None)
+    def calendar(self, request, pk=None):
+        """Flights and seats available per day of a month"""
+        route = self.get_object()
+        search = RouteCalendarSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        return self.calendar_response(
+            request, route.id, search.validated_data["month"]
+        )
+
+    @extend_schema(
+        parameters=[RouteCalendarPairSearchSerializer],
+        responses=CalendarDaySerializer(many=True),
+        operation_id="airport_routes_pair_calendar",
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="calendar",
+        url_name="pair-calendar",
+        pagination_class=None,
+    )
+    def pair_calendar(self, request):
+        """Flights and seats available per day of a month between airports"""
+        search = RouteCalendarPairSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+        route = get_object_or_404(
+            self.get_queryset(),
+            source_id=params["source"],
+            destination_id=params["destination"],
+        )
+        return self.calendar_response(request, route.id, params["month"])
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=[*SPARSE_PARAMETERS, IDS_PARAMETER])
+)
+class FlightViewSet(BatchRetrieveMixin, AirportServiceViewSet):
+    queryset = Flight.objects.all()
     serializer_class = FlightSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = FlightCursorPagination
+    # Lists and details count reference cache misses of routes and airplanes.
+    query_budget = {
+        "list": 5,
+        "retrieve": 4,
+        "seat_map": 2,
+        "itineraries": 3,
+        "manifest": 3,
+        "day_manifest": 2,
+    }
 
     def get_serializer_class(self):
         if self.action == "list":
             return FlightListSerializer
         if self.action == "retrieve":
             return FlightDetailSerializer
+        if self.action == "seat_map":
+            return FlightSeatMapSerializer
+        if self.action == "itineraries":
+            return ItinerarySerializer
+        if self.action == "holds":
+            return SeatHoldSerializer
+        if self.action == "crew_assignments":
+            return CrewAssignmentSerializer
         return FlightSerializer
 
+    def get_permissions(self):
+        if self.action == "holds":
+            return [IsAuthenticated()]
+        if self.action in ("manifest", "day_manifest"):
+            return [IsAdminUser()]
+
+        return super().get_permissions()
+
     def get_queryset(self):
         queryset = self.queryset
+        if self.action == "day_manifest":
+            return queryset
         date = self.request.query_params.get("date")
         source = self.request.query_params.get("source")
         destination = self.request.query_params.get("destination")
         if date:
             date = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__date=date)
+            queryset = queryset.filter(departure_local_date=date)
         if source:
             queryset = queryset.filter(
-                route__source__name__icontains=source
+                route__source__in=text_search(Airport, "name", source)
             )
         if destination:
             queryset = queryset.filter(
-                route__destination__name__icontains=destination
+                route__destination__in=text_search(
+                    Airport, "name", destination
+                )
             )
         if self.action == "list":
-            queryset = queryset.annotate(
-                tickets_available=(
-                        F("airplane__rows") * F("airplane__seats_in_row")
-                        - Count("tickets")
+            if self.wants("tickets_available"):
+                queryset = self.annotate_tickets_available(queryset)
+            if settings.FAST_LIST_SERIALIZERS:
+                return self.get_serializer().rows(
+                    queryset, ordering_columns(self.pagination_class)
                 )
-            )
+            return select_related(queryset, self.route_and_airplane())
         if self.action == "retrieve":
-            queryset = queryset.prefetch_related("crew")
-
-        return queryset
+            # Routes and airplanes are attached from the reference cache by
+            # FlightDetailSerializer.
+            if self.wants("crew"):
+                queryset = queryset.prefetch_related("crew")
+            return queryset
+
+        return queryset.select_related(
+            "airplane", "route__source", "route__destination"
+        )
+
+    def route_and_airplane(self) -> list[str]:
+        related = []
+        if self.expands("route"):
+            related.extend(("route__source", "route__destination"))
+        if self.expands("airplane"):
+            related.append("airplane")
+        return related
+
+    @staticmethod
+    def annotate_tickets_available(queryset):
+        return queryset.annotate(
+            tickets_available=(
+                    F("airplane__rows") * F("airplane__seats_in_row")
+                    - F("seats_sold")
+            )
+        )
 
     @extend_schema(
         parameters=[
@@ -191,22 +522,261 @@ class FlightViewSet(viewsets.ModelViewSet):
             OpenApiParameter(
                 "date",
                 type=OpenApiTypes.DATE,
-                description="Filter by departure_time(ex. ?date=2022-10-23)"
+                description=(
+                    "Filter by departure date, local to the source airport"
+                    "(ex. ?date=2022-10-23)"
+                ),
             ),
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        if self.batch:
+            return self.batch_retrieve(request)
+        key, data = flight_list_cache.lookup(request)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        flight_list_cache.store(
+            key,
+            response.data,
+            [
+                row["id"] if isinstance(row, dict) else row.id
+                for row in self.paginator.page
+            ],
+        )
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                type=OpenApiTypes.STR,
+                enum=FlightSeatMapSerializer.ENCODINGS,
+                description=(
+                    "Seat map encoding: row-major bitset in base64 "
+                    "or [taken, length] runs (ex. ?encoding=rle)"
+                ),
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """Compact occupancy grid of the flight"""
+        encoding = request.query_params.get("encoding", "base64")
+        if encoding not in FlightSeatMapSerializer.ENCODINGS:
+            raise ValidationError(
+                {
+                    "encoding": "Should be one of: "
+                    + ", ".join(FlightSeatMapSerializer.ENCODINGS)
+                }
+            )
+        serializer = self.get_serializer(self.get_object())
+        serializer.context["encoding"] = encoding
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=[ItinerarySearchSerializer],
+        responses=ItinerarySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False)
+    def itineraries(self, request):
+        """Direct and connecting flights between two airports on a date"""
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+        start = timezone.make_aware(datetime.combine(params["date"], time()))
+        end = timezone.make_aware(
+            datetime.combine(params["date"] + timedelta(days=1), time())
+        )
+
+        found = flight_index.search(
+            params["source"],
+            params["destination"],
+            start,
+            end,
+            max_stops=params["max_stops"],
+            min_connection=timedelta(minutes=params["min_connection"]),
+            max_connection=timedelta(minutes=params["max_connection"]),
+            sort=params["sort"],
+            limit=params["limit"],
+        )
+        flight_ids = {
+            leg.flight_id for itinerary in found for leg in itinerary.legs
+        }
+        flights = self.annotate_tickets_available(
+            Flight.objects.select_related(
+                "airplane", "route__source", "route__destination"
+            )
+        ).in_bulk(flight_ids)
+
+        itineraries = [
+            {
+                "stops": itinerary.stops,
+                "departure_time": itinerary.departure_time,
+                "arrival_time": itinerary.arrival_time,
+                "distance": itinerary.distance,
+                "flights": [flights[leg.flight_id] for leg in itinerary.legs],
+            }
+            for itinerary in found
+            if all(leg.flight_id in flights for leg in itinerary.legs)
+        ]
+        serializer = self.get_serializer(itineraries, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(
+        request=CrewAssignmentSerializer(many=True),
+        responses=CrewAssignmentSerializer(many=True),
+    )
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="crew-assignments",
+        pagination_class=None,
+    )
+    def crew_assignments(self, request):
+        """Replace the crews of many flights, checking crew availability"""
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data)
+
+    @staticmethod
+    def manifest_response(
+        tickets, export: str, filename: str
+    ) -> StreamingHttpResponse:
+        response = StreamingHttpResponse(
+            manifest.RENDERERS[export](manifest.manifest_rows(tickets)),
+            content_type=manifest.CONTENT_TYPES[export],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export}"'
+        )
+        return response
 
+    @extend_schema(
+        parameters=[ManifestSearchSerializer],
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    )
+    @action(methods=["GET"], detail=True, pagination_class=None)
+    def manifest(self, request, pk=None):
+        """Passengers of the flight, streamed as CSV or JSON lines"""
+        params = ManifestSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        flight = self.get_object()
+        return self.manifest_response(
+            Ticket.objects.filter(flight=flight),
+            params.validated_data["export"],
+            f"manifest-{flight.id}",
+        )
 
-class OrderViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        operation_id="airport_flights_day_manifest",
+        parameters=[DayManifestSearchSerializer],
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="manifest",
+        url_name="day-manifest",
+        pagination_class=None,
+    )
+    def day_manifest(self, request):
+        """Passengers of the flights departing on a date"""
+        params = DayManifestSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        date = params.validated_data["date"]
+        return self.manifest_response(
+            Ticket.objects.filter(flight__departure_local_date=date),
+            params.validated_data["export"],
+            f"manifest-{date}",
+        )
+
+    @action(methods=["POST", "DELETE"], detail=True)
+    def holds(self, request, pk=None):
+        """Hold seats for a limited time before ordering, or release them"""
+        flight = self.get_object()
+        store = holds.get_store()
+        serializer = self.get_serializer(data=request.data)
+
+        if request.method == "DELETE":
+            seats = None
+            if request.data:
+                serializer.is_valid(raise_exception=True)
+                seats = [
+                    (seat["row"], seat["seat"])
+                    for seat in serializer.validated_data["seats"]
+                ]
+            store.release(flight.id, request.user.id, seats)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer.is_valid(raise_exception=True)
+        seats = sorted(
+            {
+                (seat["row"], seat["seat"])
+                for seat in serializer.validated_data["seats"]
+            }
+        )
+        seat_map = flight.get_seat_map()
+        try:
+            sold = [seat for seat in seats if seat_map.is_taken(*seat)]
+        except IndexError as error:
+            raise ValidationError({"seats": [str(error)]})
+        limit = holds.max_seats()
+        if limit and (
+            len(store.held(flight.id, request.user.id) | set(seats)) > limit
+        ):
+            raise ValidationError(
+                {"seats": [f"At most {limit} seats can be held per flight."]}
+            )
+        try:
+            if sold:
+                raise holds.SeatConflict(sold)
+            expires_at = store.hold(
+                flight.id, request.user.id, seats, holds.hold_minutes()
+            )
+        except holds.SeatConflict as conflict:
+            return Response(
+                {
+                    "detail": "Some of the seats are not available.",
+                    "seats": [
+                        {"row": row, "seat": seat}
+                        for row, seat in conflict.seats
+                    ],
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        serializer = self.get_serializer(
+            {
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+                "expires_at": expires_at,
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class OrderViewSet(AirportServiceViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = OrderCursorPagination
+    query_budget = {"list": 5, "retrieve": 3, "create": 18}
 
     def get_queryset(self):
         queryset = self.queryset.filter(user=self.request.user)
-        if self.action == "list":
+        if self.action == "list" and settings.FAST_LIST_SERIALIZERS:
+            queryset = self.get_serializer().rows(
+                queryset, ordering_columns(self.pagination_class)
+            )
+        elif self.action == "list" and self.wants("tickets"):
             queryset = queryset.prefetch_related(
                 "tickets__flight__airplane",
                 "tickets__flight__route__source",
@@ -228,3 +798,30 @@ class OrderViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]
 
         return super().get_permissions()
+
+
+class LoadFactorReportViewSet(
+    SerializerMetricsMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    queryset = DailyRollup.objects.all()
+    serializer_class = LoadFactorSerializer
+    permission_classes = (IsAdminUser,)
+    pagination_class = None
+    query_budget = {"list": 2}
+
+    @extend_schema(parameters=[LoadFactorSearchSerializer])
+    def list(self, request, *args, **kwargs):
+        """Flights, capacity, seats sold and load factor of a date range"""
+        search = LoadFactorSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+        rollups = self.get_queryset().filter(
+            day__gte=params["start"], day__lte=params["end"]
+        )
+        if "route" in params:
+            rollups = rollups.filter(route_id=params["route"])
+        if "airplane_type" in params:
+            rollups = rollups.filter(airplane_type_id=params["airplane_type"])
+
+        rows = reporting.report(rollups, params["group_by"])
+        return Response(self.get_serializer(rows, many=True).data)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -59,6 +60,8 @@ AUTH_USER_MODEL = "user.User"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "airport_service.metrics.MetricsMiddleware",
+    "airport_service.querybudget.QueryBudgetMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -100,6 +103,80 @@ DATABASES = {
 }
 
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        # Room for the cached searches and calendars plus the per-flight
+        # and per-route version tokens they are checked against.
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+# Upper bound (seconds) on how stale a cached flight search can get;
+# 0 disables the cache. Use a shared backend in CACHES to invalidate
+# precisely across worker processes.
+FLIGHT_SEARCH_CACHE_TIMEOUT = int(
+    os.environ.get("FLIGHT_SEARCH_CACHE_TIMEOUT", 30)
+)
+
+# Seconds a route calendar stays cached; entries are keyed on the route's
+# ticket sales, so this only bounds memory and writes bypassing signals.
+ROUTE_CALENDAR_CACHE_TIMEOUT = int(
+    os.environ.get("ROUTE_CALENDAR_CACHE_TIMEOUT", 300)
+)
+
+# Upper bound (seconds) on how stale the itinerary search index of a worker
+# process gets when CACHES isn't shared between workers.
+FLIGHT_INDEX_MAX_AGE = int(os.environ.get("FLIGHT_INDEX_MAX_AGE", 60))
+
+# Airports, airplane types, airplanes and routes kept in memory per worker
+# process and model (see airport_service.reference); 0 disables the cache.
+REFERENCE_CACHE_SIZE = int(os.environ.get("REFERENCE_CACHE_SIZE", 20000))
+
+
+# Where seat holds live: airport_service.holds.DatabaseHoldStore or
+# airport_service.holds.CacheHoldStore (needs a shared cache backend).
+SEAT_HOLD_STORE = os.environ.get(
+    "SEAT_HOLD_STORE", "airport_service.holds.DatabaseHoldStore"
+)
+SEAT_HOLD_MINUTES = int(os.environ.get("SEAT_HOLD_MINUTES", 10))
+# Seats a user may hold on one flight at a time; 0 disables the cap.
+SEAT_HOLD_MAX_SEATS = int(os.environ.get("SEAT_HOLD_MAX_SEATS", 10))
+
+
+# Minimum time between a crew member's landing and next departure.
+CREW_MIN_REST_MINUTES = int(os.environ.get("CREW_MIN_REST_MINUTES", 600))
+
+
+# Rows fetched per round trip by the streamed passenger manifests.
+MANIFEST_CHUNK_SIZE = int(os.environ.get("MANIFEST_CHUNK_SIZE", 2000))
+
+
+# Route, flight and order lists are rendered straight from .values() rows
+# (see FastListSerializer); False falls back to the model serializers.
+FAST_LIST_SERIALIZERS = os.environ.get("FAST_LIST_SERIALIZERS") != "False"
+
+
+# Share of requests checked against the per-view `query_budget` and for
+# N+1 patterns; see airport_service.querybudget.DEFAULTS.
+QUERY_BUDGET = {
+    "SAMPLE_RATE": float(
+        os.environ.get("QUERY_BUDGET_SAMPLE_RATE", 1.0 if DEBUG else 0.01)
+    ),
+    "RAISE": os.environ.get("QUERY_BUDGET_RAISE", "") == "True",
+    "HEADERS": DEBUG,
+}
+
+
+# Exposed at /metrics to "Authorization: Bearer <METRICS_TOKEN>", denied
+# while no token is set. With several worker processes point METRICS_DIR
+# at a directory of the host they share: each dumps its metrics there
+# every METRICS_FLUSH_INTERVAL seconds and /metrics merges them.
+METRICS_DIR = os.environ.get("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -145,9 +222,22 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": (
+        "airport_service.pagination.OptionalCountLimitOffsetPagination"
+    ),
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # ORJSONRenderer falls back to the stdlib encoder without orjson;
+    # MessagePack (Accept: application/msgpack) needs msgpack installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "airport_service.renderers.ORJSONRenderer",
+        *(
+            ["airport_service.renderers.MessagePackRenderer"]
+            if find_spec("msgpack")
+            else []
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {